@@ -4,13 +4,23 @@ import numpy as np
 import joblib
 import cloudpickle
 import pickle
-from sklearn.preprocessing import LabelEncoder
 import os
 from pathlib import Path
 
 # Import our custom modules
 from config import *
 from utils import SecurityUtils, DatabaseUtils, log_user_action, validate_input, logger
+from scoring.admission import LoginAdmission, LoginThrottled
+from scoring.artifact import ArtifactError, file_digest, load_artifact
+from scoring.cache import PredictionCache
+from scoring.timing import Profiler
+from scoring.compiled import SizeRoutedModel, compile_verified
+from scoring.parallel import parallelize
+from scoring.pipeline import InferencePipeline, get_inference_pipeline, load_preprocessing_spec
+from scoring.decisions import (
+    DECISION_LABELS, decision_engine_arrays, decision_logic, estimate_loan_amount,
+    generate_message, map_probability_to_score
+)
 
 # ------------------ DATABASE ------------------
 def create_user_table():
@@ -70,21 +80,41 @@ def add_user(username, password, role):
         logger.error(f"Error adding user {username}: {e}")
         return False, "Username already exists or database error"
 
+@st.cache_resource
+def get_login_admission():
+    return LoginAdmission(LOGIN_USER_RATE, LOGIN_USER_BURST, LOGIN_IP_RATE, LOGIN_IP_BURST, LOGIN_MAX_CONCURRENT)
+
+def client_address():
+    """Remote address of the current Streamlit session, when the server exposes it"""
+    try:
+        return st.context.ip_address
+    except AttributeError:
+        return None
+
 def login_user(username, password):
-    """Authenticate user with hashed password"""
+    """Authenticate user with hashed password; raises LoginThrottled when the attempt is shed"""
     try:
-        user = DatabaseUtils.execute_query(
-            "SELECT password, role FROM users WHERE username = ?",
-            (username,),
-            fetch_one=True
-        )
+        with get_login_admission().admit(username, client_address()):
+            user = DatabaseUtils.execute_query(
+                "SELECT password, role FROM users WHERE username = ?",
+                (username,),
+                fetch_one=True
+            )
+            verified = user and SecurityUtils.verify_password(password, user['password'])
         
-        if user and SecurityUtils.verify_password(password, user['password']):
+        if verified:
             # Update last login
             DatabaseUtils.execute_query(
                 "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?",
                 (username,)
             )
+            # Move hashes made for other hardware to this host's cost while the password is at hand
+            if SecurityUtils.needs_rehash(user['password']):
+                DatabaseUtils.execute_query(
+                    "UPDATE users SET password = ? WHERE username = ?",
+                    (SecurityUtils.hash_password(password), username)
+                )
+                logger.info(f"Rehashed password for user {username} at cost {SecurityUtils.rounds()}")
             
             log_user_action(username, 'LOGIN_SUCCESS', "User logged in")
             return user['role']
@@ -92,6 +122,9 @@ def login_user(username, password):
         log_user_action(username, 'LOGIN_FAILED', "Invalid credentials")
         return None
         
+    except LoginThrottled as e:
+        logger.warning(f"Login for user {username} refused: {e}")
+        raise
     except Exception as e:
         logger.error(f"Login error for user {username}: {e}")
         return None
@@ -130,102 +163,110 @@ def delete_user(username):
         return False, "Database error occurred"
 
 # ------------------ MODEL ------------------
-@st.cache_resource
+def model_files_version():
+    """(mtime, size) of the model files; changes whenever either is replaced"""
+    version = []
+    for path in (MODEL_ARTIFACT_PATH, MODEL_PATH):
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
 def load_model():
+    # Keyed on the files' version so a regenerated artifact is picked up without a restart
+    return _load_model(model_files_version())
+
+def _load_native_model():
+    """Pickled model, wrapped to evaluate its base learners concurrently on large batches"""
+    return parallelize(joblib.load(MODEL_PATH), SCORING_WORKERS, SCORING_EXECUTOR)
+
+@st.cache_resource(max_entries=1)
+def _load_model(files_version):
+    """Fused preprocessing + model pipeline, loaded once per version of the model files"""
     try:
-        return joblib.load("credit_scoring_stacked_model.pkl")
+        model, preprocessing, expected_version = None, None, None
+        # Prefer the memory-mapped artifact: no boosting libraries to import, shared across workers
+        if os.path.exists(MODEL_ARTIFACT_PATH):
+            try:
+                expected_version = file_digest(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+                artifact = load_artifact(MODEL_ARTIFACT_PATH, expected_version=expected_version)
+                model, preprocessing = artifact.model, artifact.preprocessing
+            except ArtifactError as e:
+                logger.warning(f"Ignoring model artifact {MODEL_ARTIFACT_PATH}: {e}")
+        # Small batches use the compiled evaluator; the pickled model is faster on large ones
+        if model is not None and expected_version is not None:
+            # The artifact matched the pickle's digest; load the pickle on the first large batch
+            model = SizeRoutedModel(model, load_native=_load_native_model)
+        elif model is not None:
+            # No pickle to route to: large batches evaluate the compiled learners concurrently
+            model = parallelize(model, SCORING_WORKERS, SCORING_EXECUTOR)
+        else:
+            model = joblib.load(MODEL_PATH)
+            native = parallelize(model, SCORING_WORKERS, SCORING_EXECUTOR)
+            # Unless the compiled evaluator disagrees with the pickled model
+            try:
+                model = SizeRoutedModel(compile_verified(model), native)
+            except (ValueError, AttributeError, KeyError) as e:
+                logger.warning(f"Scoring with the pickled model, compilation failed: {e}")
+                model = native
+        # Artifacts converted without the pipeline, and the pickle path, read the pipeline pickle.
+        # An unreadable or misaligned pipeline fails the load instead of scoring without it
+        if preprocessing is None and os.path.exists(PIPELINE_PATH):
+            preprocessing = load_preprocessing_spec(PIPELINE_PATH)
+        # Raises PipelineError if the pipeline's features do not line up with the model's
+        return InferencePipeline(model, preprocessing)
     except FileNotFoundError:
-        st.error("Model file not found. Please ensure 'credit_scoring_stacked_model.pkl' is in the app directory.")
+        st.error(f"Model file not found. Please ensure '{MODEL_PATH}' is in the app directory.")
         return None
     except Exception as e:
+        logger.error(f"Error loading model: {e}")
         st.error(f"Error loading model: {e}")
         return None
 
-# ------------------ DECISION ENGINE ------------------
-def map_probability_to_score(prob, min_score=300, max_score=800):
-    return int(min_score + prob * (max_score - min_score))
-
-def decision_logic(prob, income, repayment_history, has_collateral, missing_docs=False):
-    credit_score = map_probability_to_score(prob)
-
-    if credit_score >= 700 and repayment_history == 'good':
-        decision = 'Approved'
-    elif credit_score >= 600 and repayment_history in ['good', 'average'] and has_collateral:
-        decision = 'Approved'
-    elif 500 <= credit_score < 600 or repayment_history == 'average':
-        decision = 'Review'
-    else:
-        decision = 'Rejected'
-
-    if missing_docs:
-        decision = 'Review'
-
-    return credit_score, decision
-
-def estimate_loan_amount(income, credit_score):
-    if credit_score >= 750:
-        multiplier = 3.0
-    elif credit_score >= 700:
-        multiplier = 2.5
-    elif credit_score >= 650:
-        multiplier = 2.0
-    elif credit_score >= 600:
-        multiplier = 1.5
-    else:
-        multiplier = 1.0
-
-    return round(income * multiplier, -3)
+@st.cache_resource
+def get_profiler():
+    return Profiler(TIMING_ENABLED, TIMING_TRACE_FILE, TIMING_TRACE_SAMPLE_RATE)
 
-def generate_message(decision, credit_score, amount=None):
-    if decision == 'Approved':
-        return f"✅ Congratulations! Your loan has been approved with a credit score of {credit_score}. The approved loan amount is **KES {amount:,.0f}**."
-    elif decision == 'Review':
-        return f"📋 Your loan application is under review. A loan officer will contact you shortly. (Credit score: {credit_score})"
-    else:
-        return f"❌ We're sorry, your loan application was not approved at this time. (Credit score: {credit_score})"
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_MAX_MB * 2**20, PREDICTION_CACHE_TTL)
 
+# ------------------ DECISION ENGINE ------------------
 def run_decision_engine(model, input_df):
     if model is None:
         return None
 
-    # Exact feature list and order from model's error message
-    feature_names = [
-        'Age', 'Years_In_Current_Job', 'Mobile_Money_Account_Age_Months', 'Savings_to_Income_Ratio',
-        'Sacco_Membership_Years', 'Past_Loan_Default', 'Requested_Loan_Amount_KES', 'Employment_Status_Informal',
-        'Years_With_Bank_Account', 'Debt_to_Income_Ratio', 'Monthly_Income_KES', 'Disposable_Income_KES',
-        'Mobile_Money_Score', 'Monthly_Savings_KES', 'Sacco_Shares_Value_KES', 'Current_Debt_KES',
-        'Active_Loan_Count', 'Monthly_Mobile_Money_Transactions', 'Sacco_Contribution_Rate',
-        'Monthly_Mobile_Money_Volume_KES', 'Credit_History_Length_Years', 'Loan_to_Income_Ratio',
-        'Debt_Service_Ratio', 'Monthly_Sacco_Contribution_KES', 'Household_Size', 'Asset_Ownership_Score',
-        'Dependents', 'Previous_Sacco_Loans', 'Region_Type_Semi-Urban', 'Previous_Loans_Count'
-    ]
-
-    # Set default values: 0 for numeric, False for bool
-    row = {col: 0 for col in feature_names}
-    # Set bool columns to False (if any)
-    bool_cols = [col for col in feature_names if "Region_Type_" in col or "Employment_Status_" in col]
-    for col in bool_cols:
-        row[col] = False
-
-    # Fill in values from the form (input_df)
-    for col in input_df.columns:
-        if col in row:
-            row[col] = input_df[col].values[0]
-
-    # Build DataFrame
-    full_input_df = pd.DataFrame([row], columns=feature_names)
-
-    # Predict probability
-    try:
-        prob = model.predict_proba(full_input_df)[0][1]
-    except Exception as e:
-        st.error(f"Prediction error: {e}")
-        return None
+    trace = get_profiler().trace('run_decision_engine')
+    pipeline = get_inference_pipeline(model)
+
+    # Encode the form values straight into the model's feature row
+    if isinstance(input_df, pd.DataFrame):
+        input_values = dict(zip(input_df.columns, input_df.to_numpy()[0]))
+    else:
+        input_values = input_df
+    features = pipeline.transform_row(input_values)
+    trace.mark('features')
+
+    # Predict probability; repeat submissions of the same applicant hit the cache
+    cache = get_prediction_cache()
+    cache_key = cache.key(features)
+    prob = cache.get(pipeline, cache_key)
+    trace.mark('cache_lookup')
+    if prob is None:
+        try:
+            prob = pipeline.predict_proba(features)[0]
+        except Exception as e:
+            st.error(f"Prediction error: {e}")
+            return None
+        cache.put(pipeline, cache_key, prob)
+        trace.mark('predict_proba')
 
     # Use original (non-transformed) values for logic decisions
-    income = row.get('Monthly_Income_KES', 0)
+    income = pipeline.raw_column(features, 'Monthly_Income_KES')[0]
     repayment_history = None
-    has_collateral = row.get('Has_Collateral', None)
+    has_collateral = None  # Has_Collateral is not a model feature
     missing_docs = False
 
     credit_score, decision = decision_logic(prob, income, repayment_history, has_collateral, missing_docs)
@@ -233,8 +274,11 @@ def run_decision_engine(model, input_df):
     approved_loan_amount = None
     if decision == 'Approved':
         approved_loan_amount = estimate_loan_amount(income, credit_score)
+    trace.mark('decision_logic')
 
     message = generate_message(decision, credit_score, approved_loan_amount)
+    trace.mark('message')
+    trace.finish()
 
     return {
         'credit_score': credit_score,
@@ -244,6 +288,52 @@ def run_decision_engine(model, input_df):
         'message': message
     }
 
+def run_batch_decision_engine(model, input_df, chunk_size=BATCH_CHUNK_SIZE):
+    """Score every row of input_df with one predict_proba call per chunk"""
+    if model is None or input_df is None or input_df.empty:
+        return None
+
+    trace = get_profiler().trace('run_batch_decision_engine')
+    pipeline = get_inference_pipeline(model)
+    features = pipeline.transform(input_df)
+    trace.mark('features')
+
+    # Predict probabilities chunk by chunk to bound peak memory
+    probabilities = np.empty(len(features), dtype=float)
+    try:
+        for start in range(0, len(features), chunk_size):
+            chunk = features[start:start + chunk_size]
+            probabilities[start:start + chunk_size] = pipeline.predict_proba(chunk)
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        st.error(f"Prediction error: {e}")
+        return None
+    trace.mark('predict_proba')
+
+    # Same decision rules as the single-applicant engine, applied to all rows at once
+    incomes = pipeline.raw_column(features, 'Monthly_Income_KES')
+    credit_scores, codes, loan_amounts = decision_engine_arrays(probabilities, incomes)
+    trace.mark('decision_logic')
+
+    results_df = input_df.reset_index(drop=True).copy()
+    results_df['credit_score'] = credit_scores
+    results_df['decision'] = DECISION_LABELS[codes]
+    results_df['loan_amount'] = loan_amounts
+    results_df['probability'] = np.round(probabilities, 4)
+    trace.mark('results')
+    trace.finish()
+    return results_df
+
+def read_batch_file(uploaded_file):
+    """Read an uploaded CSV or Parquet file into a DataFrame"""
+    file_name = uploaded_file.name.lower()
+    if file_name.endswith('.parquet'):
+        try:
+            return pd.read_parquet(uploaded_file)
+        except ImportError as e:
+            raise ValueError("Parquet support not installed (pip install pyarrow)") from e
+    return pd.read_csv(uploaded_file)
+
 # ------------------ UI FUNCTIONS ------------------
 def login_page():
     st.title("🏦 Credit Scoring System Login")
@@ -256,7 +346,11 @@ def login_page():
         
         if login_submitted:
             if username and password:
-                role = login_user(username, password)
+                try:
+                    role = login_user(username, password)
+                except LoginThrottled as e:
+                    st.error(f"Too many login attempts. Please try again in {e.retry_after} seconds.")
+                    return
                 if role:
                     st.session_state.logged_in = True
                     st.session_state.username = username
@@ -297,7 +391,7 @@ def loan_application():
         submitted = st.form_submit_button("Submit Application")
 
     if submitted:
-        # Prepare input data as DataFrame
+        # Prepare input data for the feature schema
         input_data = {
             "Age": age,
             "Employment_Status_Informal": 1 if employment_status == "Informal" else 0,
@@ -314,12 +408,11 @@ def loan_application():
             "Active_Loan_Count": active_loans,
             "Household_Size": household_size
         }
-        input_df = pd.DataFrame([input_data])
         model = load_model()
         if model is None:
             st.error("Model not available.")
             return
-        results = run_decision_engine(model, input_df)
+        results = run_decision_engine(model, input_data)
         if results:
             st.markdown("---")
             st.subheader("\U0001F4CB Decision Result")
@@ -328,10 +421,61 @@ def loan_application():
         else:
             st.error("Unable to process application.")
 
+def batch_scoring():
+    st.header("\U0001F4C2 Batch Scoring")
+    st.markdown("Upload a CSV or Parquet file with one applicant per row. Columns should use the model's feature names.")
+
+    uploaded_file = st.file_uploader("Applicants file", type=["csv", "parquet"])
+    if uploaded_file is None:
+        return
+
+    try:
+        input_df = read_batch_file(uploaded_file)
+    except Exception as e:
+        logger.error(f"Error reading batch file {uploaded_file.name}: {e}")
+        st.error(f"Could not read file: {e}")
+        return
+
+    st.write(f"Loaded **{len(input_df):,}** applicants from `{uploaded_file.name}`")
+
+    if st.button("Score Applicants"):
+        model = load_model()
+        if model is None:
+            st.error("Model not available.")
+            return
+        with st.spinner("Scoring applicants..."):
+            results_df = run_batch_decision_engine(model, input_df)
+        if results_df is None:
+            st.error("Unable to process batch.")
+            return
+
+        log_user_action(st.session_state.get('username', 'system'), 'BATCH_SCORED',
+                        f"Scored {len(results_df)} rows from {uploaded_file.name}")
+
+        st.markdown("---")
+        st.subheader("\U0001F4CB Batch Results")
+        st.write(results_df['decision'].value_counts())
+        st.dataframe(results_df[['credit_score', 'decision', 'loan_amount', 'probability']].head(100))
+        st.download_button(
+            "⬇️ Download Results (CSV)",
+            data=results_df.to_csv(index=False).encode('utf-8'),
+            file_name=f"scored_{Path(uploaded_file.name).stem}.csv",
+            mime="text/csv"
+        )
+
+def officer_dashboard():
+    tab1, tab2 = st.tabs(["💼 Loan Application", "📂 Batch Scoring"])
+
+    with tab1:
+        loan_application()
+
+    with tab2:
+        batch_scoring()
+
 def admin_dashboard():
     st.title("👨‍💼 Admin Dashboard")
-    
-    tab1, tab2 = st.tabs(["👥 User Management", "💼 Loan Application"])
+
+    tab1, tab2, tab3, tab4 = st.tabs(["👥 User Management", "💼 Loan Application", "📂 Batch Scoring", "⚙️ System"])
     
     with tab1:
         st.subheader("Add New User")
@@ -382,6 +526,74 @@ def admin_dashboard():
     with tab2:
         loan_application()
 
+    with tab3:
+        batch_scoring()
+
+    with tab4:
+        system_status()
+
+def system_status():
+    st.subheader("Login Admission")
+    login_stats = get_login_admission().stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Admitted", f"{login_stats['admitted']:,}")
+    col2.metric("Shed", f"{login_stats['rejected']:,}")
+    col3.metric("CPU Shed", f"{login_stats['shed_cpu_seconds']:.1f} s")
+    col4.metric("In Flight", f"{login_stats['in_flight']} / {login_stats['max_concurrent']}")
+    st.caption(
+        f"Refused by user limit: {login_stats['rejected_user']:,}, address limit: {login_stats['rejected_ip']:,}, "
+        f"concurrency cap: {login_stats['rejected_busy']:,} - "
+        f"verification p50 {login_stats['verify_time']['p50_ms']:.0f} ms"
+    )
+
+    st.markdown("---")
+    st.subheader("Database Connections")
+    pool_stats = DatabaseUtils.pool_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Open", f"{pool_stats['open']} / {pool_stats['max_size']}")
+    col2.metric("In Use", pool_stats['in_use'])
+    col3.metric("Reuse Rate", f"{pool_stats['reuse_rate']:.1%}")
+    col4.metric("Waits", f"{pool_stats['waits']:,}")
+    st.caption(
+        f"{pool_stats['checkouts']:,} checkouts, {pool_stats['opened']:,} connections opened, "
+        f"{pool_stats['discarded']:,} discarded - wait p99 {pool_stats['wait_time']['p99_ms']:.1f} ms"
+    )
+
+    st.markdown("---")
+    st.subheader("Prediction Cache")
+    stats = get_prediction_cache().stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit Rate", f"{stats['hit_rate']:.1%}")
+    col2.metric("Hits", f"{stats['hits']:,}")
+    col3.metric("Misses", f"{stats['misses']:,}")
+    col4.metric("Entries", f"{stats['entries']:,}")
+    st.caption(
+        f"{stats['bytes'] / 2**20:.2f} MB used - {stats['evictions']:,} evictions, "
+        f"{stats['expirations']:,} expirations, {stats['invalidations']:,} model reloads"
+    )
+    if st.button("Clear Prediction Cache"):
+        get_prediction_cache().clear()
+        st.rerun()
+
+    st.markdown("---")
+    st.subheader("Scoring Stage Timings")
+    profiler = get_profiler()
+    enabled = st.toggle("Record stage timings", value=profiler.enabled)
+    if enabled != profiler.enabled:
+        profiler.enabled = enabled
+        log_user_action(st.session_state.get('username', 'system'), 'TIMING_TOGGLED', f"Enabled: {enabled}")
+    summary = profiler.summary()
+    if not summary:
+        st.info("No timings recorded yet" if profiler.enabled else "Stage timing is off")
+    for function, stages in summary.items():
+        st.markdown(f"**{function}**")
+        st.dataframe(pd.DataFrame.from_dict(stages, orient='index').round(3), use_container_width=True)
+    if profiler.trace_file:
+        st.caption(f"Sampling {profiler.sample_rate:.1%} of traces to `{profiler.trace_file}`")
+    if st.button("Reset Timings"):
+        profiler.reset()
+        st.rerun()
+
 # ------------------ MAIN ------------------
 def main():
     # Initialize database
@@ -409,7 +621,7 @@ def main():
         if st.session_state.role == "admin":
             admin_dashboard()
         elif st.session_state.role == "officer":
-            loan_application()
+            officer_dashboard()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,98 @@
+"""Backend CRUD benchmarks; run by benchmarks.run from the backend directory.
+
+Kept as a standalone script because the backend package is also named
+`app`, which would clash with the Streamlit app.py in one interpreter.
+Prints one JSON object on stdout.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.getcwd()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, ROOT]
+
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from benchmarks.run import peak_memory_mb, summarize  # noqa: E402
+from benchmarks.synthetic import synthetic_loan_applications  # noqa: E402
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.crud import loan_application as loan_crud  # noqa: E402
+from app.schemas.loan_application import LoanApplicationCreate  # noqa: E402
+
+
+def bench_calculate_credit_score(payloads):
+    samples = []
+    for payload in payloads:
+        start = time.perf_counter()
+        loan_crud.calculate_credit_score(payload)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_create_loan_application(payloads):
+    """One committed insert per call, as the API does; retries count application-number collisions"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    samples, retries = [], 0
+    try:
+        for payload in payloads:
+            application = LoanApplicationCreate(**payload)
+            start = time.perf_counter()
+            while True:
+                try:
+                    loan_crud.create_loan_application(db, application)
+                    break
+                except IntegrityError:
+                    db.rollback()
+                    retries += 1
+            samples.append(time.perf_counter() - start)
+    finally:
+        db.close()
+    return dict(summarize(samples), number_collisions=retries)
+
+
+def bench_create_loan_applications_bulk(payloads, batch_size):
+    """One transaction per batch of batch_size applications, as the bulk intake endpoint does"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    samples = []
+    try:
+        applications = [LoanApplicationCreate(**payload) for payload in payloads]
+        for start in range(0, len(applications), batch_size):
+            batch = applications[start:start + batch_size]
+            began = time.perf_counter()
+            loan_crud.create_loan_applications(db, batch)
+            samples.append(time.perf_counter() - began)
+    finally:
+        db.close()
+    return dict(summarize(samples), batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, required=True)
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--inserts', type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    score_payloads = synthetic_loan_applications(args.calls, args.seed)
+    insert_payloads = synthetic_loan_applications(args.inserts, args.seed + 1)
+
+    results = {
+        'calculate_credit_score': bench_calculate_credit_score(score_payloads),
+        'create_loan_application': bench_create_loan_application(insert_payloads),
+        'create_loan_applications_bulk': bench_create_loan_applications_bulk(
+            synthetic_loan_applications(args.inserts, args.seed + 2), 100),
+    }
+    results['calculate_credit_score']['peak_memory_mb'] = peak_memory_mb(
+        bench_calculate_credit_score, score_payloads[:100])
+    print(json.dumps(results))
+
+
+if __name__ == '__main__':
+    main()
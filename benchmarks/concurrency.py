@@ -0,0 +1,244 @@
+"""Backend throughput under concurrent clients; run by benchmarks.run from the backend directory.
+
+Seeds a throwaway SQLite database, starts uvicorn on it in a subprocess
+and drives it with --clients concurrent HTTP clients cycling through the
+officer read endpoints (list, detail, stats). /health is probed alongside
+to show whether database work stalls the event loop. Prints one JSON
+object on stdout.
+
+With --baseline REF the backend at that git ref is extracted to a
+temporary directory and measured the same way first, so the output has
+`before` and `after` results side by side (and a table on stderr):
+
+    python ../../benchmarks/concurrency.py --seed 1 --baseline fa35ac1~1
+
+A baseline that stalls under the load is cut off after --deadline
+seconds; its unfinished requests count as errors.
+"""
+import argparse
+import asyncio
+import json
+import os
+import io
+import socket
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.getcwd()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, ROOT]
+
+import httpx  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from benchmarks.run import summarize  # noqa: E402
+from benchmarks.synthetic import synthetic_loan_applications  # noqa: E402
+
+OFFICER_EMAIL = 'bench.officer@esubusacco.co.ke'
+BACKEND_PATH = 'esubu-sacco-app/backend'
+
+
+def seed_database(database_url, applications, seed):
+    """Tables, one officer and `applications` loan applications; returns the application ids"""
+    os.environ['DATABASE_URL'] = database_url
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models import User
+    from app.crud import loan_application as loan_crud
+    from app.schemas.loan_application import LoanApplicationCreate
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        officer = User(email=OFFICER_EMAIL, hashed_password='!', full_name='Bench Officer', role='officer')
+        db.add(officer)
+        db.commit()
+        ids = []
+        for payload in synthetic_loan_applications(applications, seed):
+            application = LoanApplicationCreate(**payload)
+            while True:
+                try:
+                    ids.append(loan_crud.create_loan_application(db, application, officer.id).id)
+                    break
+                except IntegrityError:
+                    # Application-number collision; draw another
+                    db.rollback()
+    finally:
+        db.close()
+    engine.dispose()
+    return ids
+
+
+def officer_token():
+    from jose import jwt
+    from app.core.config import settings
+
+    claims = {'sub': OFFICER_EMAIL, 'exp': datetime.utcnow() + timedelta(hours=1)}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url, port):
+    env = dict(os.environ, DATABASE_URL=database_url, BCRYPT_ROUNDS='4', SCORING_ROOT=ROOT, PYTHONPATH=BACKEND_DIR)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/health', timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('uvicorn did not start')
+
+
+async def drive(base_url, token, ids, clients, requests, deadline):
+    """requests officer reads spread over `clients` concurrent connections, plus a /health probe"""
+    headers = {'Authorization': f'Bearer {token}'}
+    paths = ['/api/v1/loans/?limit=20', '/api/v1/loans/stats'] + [f'/api/v1/loans/{i}' for i in ids[:50]]
+    latencies, errors, health = [], 0, []
+    remaining = iter(range(requests))
+    done = asyncio.Event()
+
+    async def client(http):
+        nonlocal errors
+        for n in remaining:
+            start = time.perf_counter()
+            try:
+                response = await http.get(paths[n % len(paths)], headers=headers)
+                errors += response.status_code != 200
+            except httpx.HTTPError:
+                # Dropped connections and timeouts count as failures, not as a crashed benchmark
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def probe(http):
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                await http.get('/health')
+            except httpx.HTTPError:
+                pass
+            finally:
+                # A probe still hanging when the run is cut off counts for as long as it waited
+                health.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=deadline) as http:
+        prober = asyncio.create_task(probe(http))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(client(http) for _ in range(clients))), deadline)
+            timed_out = False
+        except asyncio.TimeoutError:
+            timed_out = True
+        elapsed = time.perf_counter() - start
+        done.set()
+        if timed_out:
+            prober.cancel()
+        await asyncio.gather(prober, return_exceptions=True)
+
+    completed = len(latencies)
+    errors += requests - completed
+    return {
+        'clients': clients,
+        'requests': requests,
+        'completed': completed,
+        'errors': errors,
+        'timed_out': timed_out,
+        'seconds': elapsed,
+        'throughput_rps': (requests - errors) / elapsed,
+        'latency': summarize(latencies or [elapsed]),
+        'health_latency': summarize(health or [elapsed]),
+    }
+
+
+def measure(args):
+    """drive() against the backend in the working directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        ids = seed_database(database_url, args.applications, args.seed)
+        port = _free_port()
+        server = start_server(database_url, port)
+        try:
+            return asyncio.run(drive(
+                f'http://127.0.0.1:{port}', officer_token(), ids, args.clients, args.requests, args.deadline
+            ))
+        finally:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                # A stalled server does not finish its graceful shutdown
+                server.kill()
+                server.wait()
+
+
+def measure_ref(ref, args):
+    """measure() in a fresh interpreter against the backend as of git ref"""
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', ref, BACKEND_PATH], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tmp, filter='data')
+        command = [
+            sys.executable, os.path.abspath(__file__), '--seed', str(args.seed), '--clients', str(args.clients),
+            '--requests', str(args.requests), '--applications', str(args.applications),
+            '--deadline', str(args.deadline),
+        ]
+        result = subprocess.run(
+            command, cwd=os.path.join(tmp, BACKEND_PATH), capture_output=True, text=True, check=True
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def print_table(ref, before, after):
+    rows = [
+        ('completed', '{:d}', lambda r: r['completed']),
+        ('errors', '{:d}', lambda r: r['errors']),
+        ('throughput rps', '{:.1f}', lambda r: r['throughput_rps']),
+        ('latency p50 ms', '{:.0f}', lambda r: r['latency']['p50_ms']),
+        ('latency p99 ms', '{:.0f}', lambda r: r['latency']['p99_ms']),
+        ('/health p50 ms', '{:.0f}', lambda r: r['health_latency']['p50_ms']),
+        ('/health max ms', '{:.0f}', lambda r: r['health_latency']['max_ms']),
+    ]
+    print(f"{after['clients']} clients, {after['requests']} requests", file=sys.stderr)
+    print(f"{'':<16}{'before (' + ref + ')':>24}{'after':>12}", file=sys.stderr)
+    for label, fmt, value in rows:
+        print(f"{label:<16}{fmt.format(value(before)):>24}{fmt.format(value(after)):>12}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, required=True)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--applications', type=int, default=500)
+    parser.add_argument('--deadline', type=float, default=120.0, help='seconds before a stalled run is cut off')
+    parser.add_argument('--baseline', help='git ref of the backend to measure as `before`')
+    args = parser.parse_args()
+
+    if args.baseline is None:
+        print(json.dumps(measure(args)))
+        return
+    before = measure_ref(args.baseline, args)
+    after = measure(args)
+    print_table(args.baseline, before, after)
+    print(json.dumps({'baseline': args.baseline, 'before': before, 'after': after}))
+
+
+if __name__ == '__main__':
+    main()
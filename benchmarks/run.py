@@ -0,0 +1,258 @@
+"""Inference and decision-engine benchmark suite.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.25
+
+Reports cold/warm load_model time, run_decision_engine latency
+percentiles at batch sizes 1, 100 and 10k, the backend's
+calculate_credit_score, create_loan_application and bulk intake, backend throughput
+at 50 concurrent clients, and peak memory.
+Inputs come from benchmarks.synthetic with a fixed seed. Results are a
+JSON document; --compare exits non-zero when any timing or memory metric
+regresses past the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, 'esubu-sacco-app', 'backend')
+BATCH_SIZES = (1, 100, 10000)
+# Metrics below this many ms (or MB) are too noisy to flag as regressions
+NOISE_FLOOR = 0.05
+
+_COLD_LOAD_PROBE = r"""
+import json, resource, time, warnings
+warnings.simplefilter('ignore')
+start = time.perf_counter()
+import app
+model = app.load_model()
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({'seconds': elapsed, 'peak_rss_mb': peak, 'loaded': model is not None}))
+"""
+
+
+def summarize(samples):
+    """Latency percentiles in milliseconds for a list of durations in seconds"""
+    ms = np.asarray(samples) * 1000.0
+    return {
+        'n': int(ms.size),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'min_ms': float(ms.min()),
+        'max_ms': float(ms.max()),
+    }
+
+
+def peak_memory_mb(fn, *args):
+    """Peak Python-visible allocation (NumPy included) while fn runs once, in MB"""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _run_json_subprocess(args, cwd, env=None):
+    result = subprocess.run(
+        args, cwd=cwd, capture_output=True, text=True, check=True, env=dict(os.environ, **(env or {}))
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# ------------------ BENCHMARKS ------------------
+def bench_load_model(app, repeats):
+    """Cold load in a fresh interpreter (imports included), warm reload in-process, and a cache hit"""
+    cold = [_run_json_subprocess([sys.executable, '-c', _COLD_LOAD_PROBE], ROOT) for _ in range(repeats)]
+
+    app.load_model()
+    warm = []
+    for _ in range(repeats):
+        app._load_model.clear()
+        start = time.perf_counter()
+        app.load_model()
+        warm.append(time.perf_counter() - start)
+
+    cached = []
+    for _ in range(max(repeats, 100)):
+        start = time.perf_counter()
+        app.load_model()
+        cached.append(time.perf_counter() - start)
+
+    return {
+        'cold': summarize([run['seconds'] for run in cold]),
+        'cold_peak_rss_mb': max(run['peak_rss_mb'] for run in cold),
+        'warm': summarize(warm),
+        'cached': summarize(cached),
+    }
+
+
+def bench_decision_engine(app, model, sizes, seed, single_calls, batch_repeats):
+    from benchmarks.synthetic import synthetic_applicants
+
+    results = {}
+    for size in sizes:
+        if size == 1:
+            # Distinct applicants so every call misses the prediction cache
+            applicants = synthetic_applicants(single_calls, seed).to_dict('records')
+            app.get_prediction_cache().clear()
+            samples = []
+            for applicant in applicants:
+                start = time.perf_counter()
+                app.run_decision_engine(model, applicant)
+                samples.append(time.perf_counter() - start)
+
+            repeat = applicants[0]
+            app.run_decision_engine(model, repeat)
+            cached = []
+            for _ in range(single_calls):
+                start = time.perf_counter()
+                app.run_decision_engine(model, repeat)
+                cached.append(time.perf_counter() - start)
+
+            results['1'] = dict(summarize(samples), peak_memory_mb=peak_memory_mb(
+                app.run_decision_engine, model, applicants[-1]))
+            results['1_cached'] = summarize(cached)
+            continue
+
+        batch = synthetic_applicants(size, seed)
+        app.run_batch_decision_engine(model, batch)
+        samples = []
+        for _ in range(batch_repeats):
+            start = time.perf_counter()
+            app.run_batch_decision_engine(model, batch)
+            samples.append(time.perf_counter() - start)
+        stats = summarize(samples)
+        stats['rows_per_second'] = size / (stats['p50_ms'] / 1000.0)
+        stats['peak_memory_mb'] = peak_memory_mb(app.run_batch_decision_engine, model, batch)
+        results[str(size)] = stats
+    return results
+
+
+def bench_backend(seed, calls, inserts):
+    """Backend CRUD benchmarks, run in their own interpreter (the backend package is also named app)"""
+    script = os.path.join(ROOT, 'benchmarks', 'backend.py')
+    return _run_json_subprocess(
+        [sys.executable, script, '--seed', str(seed), '--calls', str(calls), '--inserts', str(inserts)],
+        BACKEND_DIR, env={'DATABASE_URL': 'sqlite://'},
+    )
+
+
+def bench_backend_concurrency(seed, clients, requests):
+    """Officer read endpoints under concurrent HTTP clients against a live uvicorn server"""
+    script = os.path.join(ROOT, 'benchmarks', 'concurrency.py')
+    return _run_json_subprocess(
+        [sys.executable, script, '--seed', str(seed), '--clients', str(clients), '--requests', str(requests)],
+        BACKEND_DIR,
+    )
+
+
+# ------------------ REPORTING ------------------
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=''):
+    """{'a': {'p50_ms': 1}} -> {'a.p50_ms': 1} for every numeric lower-is-better metric"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and key.endswith(('_ms', '_mb')):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current, baseline, tolerance):
+    """Metrics more than tolerance (relative) worse than baseline"""
+    now, before = flatten(current['results']), flatten(baseline['results'])
+    regressions = []
+    for name, value in sorted(now.items()):
+        reference = before.get(name)
+        if reference is None or value - reference < NOISE_FLOOR:
+            continue
+        if value > reference * (1.0 + tolerance):
+            regressions.append({'metric': name, 'baseline': reference, 'current': value,
+                                'change': value / reference - 1.0 if reference else float('inf')})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    parser.add_argument('--compare', help='baseline results JSON to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown (default 0.25)')
+    parser.add_argument('--seed', type=int, default=None, help='synthetic data seed')
+    parser.add_argument('--quick', action='store_true', help='fewer repeats, for smoke runs')
+    parser.add_argument('--skip-backend', action='store_true')
+    args = parser.parse_args(argv)
+
+    from benchmarks.synthetic import DEFAULT_SEED
+    seed = DEFAULT_SEED if args.seed is None else args.seed
+    load_repeats, single_calls, batch_repeats = (1, 50, 2) if args.quick else (3, 500, 5)
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import app
+
+    results = {'load_model': bench_load_model(app, load_repeats)}
+    model = app.load_model()
+    results['decision_engine'] = bench_decision_engine(app, model, BATCH_SIZES, seed, single_calls, batch_repeats)
+    if not args.skip_backend:
+        results['backend'] = bench_backend(seed, single_calls * 10, single_calls)
+        results['backend']['concurrency'] = bench_backend_concurrency(seed, 50, single_calls * 4)
+
+    # ru_maxrss is in KB on Linux
+    results['process_peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': seed,
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['metric']}: {regression['baseline']:.3f} -> "
+                  f"{regression['current']:.3f} ({regression['change']:+.0%})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
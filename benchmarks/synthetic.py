@@ -0,0 +1,84 @@
+"""Seeded synthetic applicants, so benchmark runs are comparable over time."""
+import numpy as np
+import pandas as pd
+
+from scoring.schema import FEATURE_NAMES
+
+DEFAULT_SEED = 20240724
+
+# (low, high) ranges roughly matching the training data; 'int' columns are whole numbers
+_NUMERIC_RANGES = {
+    'Age': (18, 65, 'int'),
+    'Years_In_Current_Job': (0, 30, 'int'),
+    'Mobile_Money_Account_Age_Months': (0, 180, 'int'),
+    'Savings_to_Income_Ratio': (0.0, 0.6, 'float'),
+    'Sacco_Membership_Years': (0, 25, 'int'),
+    'Requested_Loan_Amount_KES': (5000, 1000000, 'float'),
+    'Years_With_Bank_Account': (0, 30, 'int'),
+    'Debt_to_Income_Ratio': (0.0, 1.5, 'float'),
+    'Monthly_Income_KES': (2000, 180000, 'float'),
+    'Disposable_Income_KES': (0, 120000, 'float'),
+    'Mobile_Money_Score': (300, 850, 'int'),
+    'Monthly_Savings_KES': (0, 50000, 'float'),
+    'Sacco_Shares_Value_KES': (0, 500000, 'float'),
+    'Current_Debt_KES': (0, 800000, 'float'),
+    'Active_Loan_Count': (0, 6, 'int'),
+    'Monthly_Mobile_Money_Transactions': (0, 300, 'int'),
+    'Sacco_Contribution_Rate': (0.0, 0.3, 'float'),
+    'Monthly_Mobile_Money_Volume_KES': (0, 400000, 'float'),
+    'Credit_History_Length_Years': (0, 30, 'int'),
+    'Loan_to_Income_Ratio': (0.0, 10.0, 'float'),
+    'Debt_Service_Ratio': (0.0, 1.0, 'float'),
+    'Monthly_Sacco_Contribution_KES': (0, 30000, 'float'),
+    'Household_Size': (1, 12, 'int'),
+    'Asset_Ownership_Score': (0, 10, 'int'),
+    'Dependents': (0, 8, 'int'),
+    'Previous_Sacco_Loans': (0, 10, 'int'),
+    'Previous_Loans_Count': (0, 15, 'int'),
+}
+_BINARY = {'Past_Loan_Default': 0.15, 'Employment_Status_Informal': 0.4, 'Region_Type_Semi-Urban': 0.3}
+
+
+def synthetic_applicants(n_rows, seed=DEFAULT_SEED):
+    """DataFrame of n_rows applicants with the model's feature columns"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name in FEATURE_NAMES:
+        if name in _BINARY:
+            values = (rng.random(n_rows) < _BINARY[name]).astype(np.int64)
+        else:
+            low, high, kind = _NUMERIC_RANGES[name]
+            if kind == 'int':
+                values = rng.integers(low, high + 1, n_rows)
+            else:
+                values = np.round(rng.uniform(low, high, n_rows), 2)
+        columns[name] = values
+    return pd.DataFrame(columns, columns=FEATURE_NAMES)
+
+
+def synthetic_loan_applications(n_rows, seed=DEFAULT_SEED):
+    """Backend LoanApplicationCreate payloads as dicts"""
+    rng = np.random.default_rng(seed)
+    statuses = ['Employed', 'Self-employed', 'Student', 'Unemployed']
+    payloads = []
+    for i in range(n_rows):
+        income = float(np.round(rng.uniform(5000, 250000), 2))
+        payloads.append({
+            'full_name': f'Applicant {i}',
+            'id_number': f'{30000000 + i}',
+            'phone_number': f'+2547{i:08d}',
+            'email': f'applicant{i}@example.com',
+            'date_of_birth': '1990-01-01',
+            'gender': 'Female' if i % 2 else 'Male',
+            'marital_status': 'Single',
+            'employment_status': statuses[int(rng.integers(len(statuses)))],
+            'monthly_income': income,
+            'loan_amount': float(np.round(income * rng.uniform(0.5, 12), 2)),
+            'loan_purpose': 'Business',
+            'loan_term_months': int(rng.choice([6, 12, 24, 36])),
+            'residential_address': 'Bungoma',
+            'county': 'Bungoma',
+            'has_existing_loans': bool(rng.random() < 0.3),
+            'monthly_expenses': float(np.round(income * rng.uniform(0.2, 1.0), 2)),
+        })
+    return payloads
@@ -4,10 +4,23 @@ from pathlib import Path
 # Database configuration
 DB_FILE = os.getenv('DB_FILE', 'users.db')
 DB_PATH = Path(DB_FILE)
+# Pooled SQLite connections (WAL mode); writers wait up to DB_BUSY_TIMEOUT_MS for the lock
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '4'))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
 
 # Security configuration
 SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
-BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# bcrypt cost; 0 calibrates it on first use so one verification takes about BCRYPT_TARGET_MS on this host
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '0'))
+BCRYPT_TARGET_MS = float(os.getenv('BCRYPT_TARGET_MS', '250'))
+
+# Login admission control: attempts per minute and burst size per username and per client address
+LOGIN_USER_RATE = float(os.getenv('LOGIN_USER_RATE', '5'))
+LOGIN_USER_BURST = int(os.getenv('LOGIN_USER_BURST', '5'))
+LOGIN_IP_RATE = float(os.getenv('LOGIN_IP_RATE', '30'))
+LOGIN_IP_BURST = int(os.getenv('LOGIN_IP_BURST', '20'))
+# Password verifications allowed at once; further attempts are refused immediately
+LOGIN_MAX_CONCURRENT = int(os.getenv('LOGIN_MAX_CONCURRENT', '4'))
 
 # Default admin credentials (change in production)
 DEFAULT_ADMIN_USERNAME = os.getenv('DEFAULT_ADMIN_USERNAME', 'admin')
@@ -16,6 +29,26 @@ DEFAULT_ADMIN_PASSWORD = os.getenv('DEFAULT_ADMIN_PASSWORD', 'admin123')
 # Model paths
 MODEL_PATH = os.getenv('MODEL_PATH', 'credit_scoring_stacked_model.pkl')
 PIPELINE_PATH = os.getenv('PIPELINE_PATH', 'preprocessing_pipeline (3).pkl')
+# Memory-mapped export of MODEL_PATH (python -m scoring.artifact); used when present and current
+MODEL_ARTIFACT_PATH = os.getenv('MODEL_ARTIFACT_PATH', 'credit_scoring_stacked_model.esb')
+
+# Batch scoring
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '5000'))
+# Workers for parallel base-learner execution (0 = one per CPU, 1 = serial)
+SCORING_WORKERS = int(os.getenv('SCORING_WORKERS', '0'))
+# 'thread', 'process', or 'auto' (threads when every base learner releases the GIL)
+SCORING_EXECUTOR = os.getenv('SCORING_EXECUTOR', 'auto')
+
+# Prediction cache for single-applicant scoring
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', '10000'))
+PREDICTION_CACHE_MAX_MB = float(os.getenv('PREDICTION_CACHE_MAX_MB', '16'))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', '3600'))
+
+# Per-stage timing of the scoring hot path (can also be toggled by admins at runtime)
+TIMING_ENABLED = os.getenv('TIMING_ENABLED', 'False').lower() == 'true'
+# Chrome trace-event file for offline flame charts; empty disables sampling
+TIMING_TRACE_FILE = os.getenv('TIMING_TRACE_FILE', '')
+TIMING_TRACE_SAMPLE_RATE = float(os.getenv('TIMING_TRACE_SAMPLE_RATE', '0.01'))
 
 # Application settings
 APP_TITLE = os.getenv('APP_TITLE', '🏦 Esubu AI Credit Scoring System')
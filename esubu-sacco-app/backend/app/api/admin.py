@@ -1,19 +1,28 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Response
+from datetime import date, datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, run_db
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.schemas.loan_application import LoanApplicationUpdate
+from app.schemas.system_log import SystemLogPage
 from app.crud import user as user_crud
 from app.crud import loan_application as loan_crud
-from app.core.security import get_current_admin_user
-import pandas as pd
-from io import StringIO
+from app.crud import system_log as system_log_crud
+from app.core.security import (
+    get_current_admin_user, login_admission, password_hasher, principal_cache,
+    PasswordHasherBusy, hasher_busy_exception
+)
+from app.core.audit import audit, audit_stats
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.timing import profiler
+from app.services import reports
 
 router = APIRouter()
 
 @router.get("/dashboard")
-async def get_admin_dashboard(
+def get_admin_dashboard(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
@@ -25,7 +34,7 @@ async def get_admin_dashboard(
     total_admins = len(user_crud.get_admins(db))
     
     # Get recent applications
-    recent_applications = loan_crud.get_loan_applications(db, skip=0, limit=10)
+    recent_applications = loan_crud.get_loan_applications(db, limit=10)
     
     return {
         "application_stats": stats,
@@ -49,13 +58,19 @@ async def create_user(
     current_user = Depends(get_current_admin_user)
 ):
     """Create a new user (officer or admin)"""
-    db_user = user_crud.get_user_by_email(db, email=user.email)
+    db_user = await run_db(user_crud.get_user_by_email, db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.create_user(db=db, user=user)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
+    db_user = await run_db(user_crud.create_user, db=db, user=user, hashed_password=hashed_password)
+    audit("USER_CREATED", current_user.id, f"Created {db_user.role} {db_user.email} (id {db_user.id})")
+    return db_user
 
 @router.get("/users/", response_model=List[User])
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -65,7 +80,7 @@ async def get_users(
     return user_crud.get_users(db, skip=skip, limit=limit)
 
 @router.get("/users/{user_id}", response_model=User)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user)
@@ -77,7 +92,7 @@ async def get_user(
     return db_user
 
 @router.put("/users/{user_id}", response_model=User)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -87,10 +102,12 @@ async def update_user(
     db_user = user_crud.update_user(db, user_id=user_id, user_update=user_update)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    changed = ", ".join(sorted(user_update.dict(exclude_unset=True)))
+    audit("USER_UPDATED", current_user.id, f"Updated user {user_id}: {changed}")
     return db_user
 
 @router.delete("/users/{user_id}")
-async def deactivate_user(
+def deactivate_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user)
@@ -102,11 +119,12 @@ async def deactivate_user(
     db_user = user_crud.deactivate_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    audit("USER_DEACTIVATED", current_user.id, f"Deactivated user {user_id}")
     return {"message": "User deactivated successfully"}
 
 # Application Management
 @router.put("/applications/{application_id}/override")
-async def override_application_decision(
+def override_application_decision(
     application_id: int,
     decision: str,
     reason: str,
@@ -127,53 +145,121 @@ async def override_application_decision(
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    audit("DECISION_OVERRIDDEN", current_user.id, f"Application {application_id} set to {decision}: {reason}")
     return application
 
 # Reports
 @router.get("/reports/applications/csv")
-async def export_applications_csv(
-    db: Session = Depends(get_db),
+def export_applications_csv(
+    created_from: Optional[date] = Query(None, description="First creation date to include"),
+    created_to: Optional[date] = Query(None, description="Last creation date to include"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    gzip: bool = Query(False, description="Send the CSV gzip-compressed"),
     current_user = Depends(get_current_admin_user)
 ):
-    """Export all applications as CSV"""
-    applications = loan_crud.get_loan_applications(db, skip=0, limit=10000)
-    
-    # Convert to DataFrame
-    data = []
-    for app in applications:
-        data.append({
-            "Application Number": app.application_number,
-            "Full Name": app.full_name,
-            "ID Number": app.id_number,
-            "Phone": app.phone_number,
-            "Email": app.email,
-            "Loan Amount": app.loan_amount,
-            "Loan Purpose": app.loan_purpose,
-            "Monthly Income": app.monthly_income,
-            "Credit Score": app.credit_score,
-            "System Decision": app.system_decision,
-            "Status": app.status,
-            "Created At": app.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
-    
-    df = pd.DataFrame(data)
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False)
-    csv_content = csv_buffer.getvalue()
+    """Export applications as CSV, newest first, streamed as it is read"""
+    query = reports.application_export_query(created_from, created_to, status)
+    content = reports.iter_csv(query)
+    filename = "loan_applications.csv"
+    media_type = "text/csv"
+    if gzip:
+        content = reports.gzip_stream(content)
+        filename += ".gz"
+        media_type = "application/gzip"
     
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=loan_applications.csv"}
+    audit("APPLICATIONS_EXPORTED", current_user.id,
+          f"from={created_from} to={created_to} status={status}")
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
-@router.get("/system/logs")
-async def get_system_logs(
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/reports/applications/analytics")
+def export_applications_analytics(
+    format: Literal["parquet", "arrow"] = Query("parquet", description="Parquet file or Arrow IPC stream"),
+    since: Optional[datetime] = Query(None, description="X-Export-Watermark of the previous pull; omit for the whole table"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
-    """Get system activity logs"""
-    # Placeholder for system logs - would implement actual logging
-    return {"message": "System logs feature coming soon"}
+    """Export applications with typed columns for analytics, optionally only those changed since a watermark"""
+    # Rows changed while the export streams belong to the next pull
+    watermark = reports.changes_watermark(db) or since
+    query = reports.application_changes_query(since, watermark)
+    if format == "parquet":
+        content, media_type, filename = reports.iter_parquet(query), "application/vnd.apache.parquet", "loan_applications.parquet"
+    else:
+        content, media_type, filename = reports.iter_arrow(query), "application/vnd.apache.arrow.stream", "loan_applications.arrows"
+    
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if watermark is not None:
+        headers["X-Export-Watermark"] = watermark.isoformat()
+    audit("APPLICATIONS_EXPORTED", current_user.id, f"format={format} since={since} until={watermark}")
+    return StreamingResponse(content, media_type=media_type, headers=headers)
+
+@router.get("/system/logs", response_model=SystemLogPage)
+def get_system_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    action: Optional[str] = Query(None, description="Filter by action, e.g. LOGIN_FAILED"),
+    user_id: Optional[int] = Query(None, description="Filter by acting user"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """Get system activity logs, newest first"""
+    before = decode_cursor(cursor) if cursor else None
+    logs = system_log_crud.get_system_logs(db, limit=limit, before=before, action=action, user_id=user_id)
+    next_cursor = encode_cursor(logs[-1].timestamp, logs[-1].id) if len(logs) == limit else None
+    return {"items": logs, "next_cursor": next_cursor}
+
+@router.post("/system/application-counters/rebuild")
+def rebuild_application_counters(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """Recount dashboard statistics from loan_applications, e.g. after rows were changed outside the API"""
+    loan_crud.rebuild_application_counters(db)
+    audit("APPLICATION_COUNTERS_REBUILT", current_user.id)
+    return loan_crud.get_application_stats(db)
+
+@router.get("/system/audit")
+async def get_audit_stats(current_user = Depends(get_current_admin_user)):
+    """Audit writer throughput: events written, queued and dropped, and bulk insert latency"""
+    return audit_stats()
+
+@router.get("/system/timings")
+async def get_stage_timings(current_user = Depends(get_current_admin_user)):
+    """Per-stage latency histograms for the scoring hot path"""
+    return {
+        "enabled": profiler.enabled,
+        "trace_file": profiler.trace_file,
+        "sample_rate": profiler.sample_rate,
+        "timings": profiler.summary()
+    }
+
+@router.put("/system/timings")
+async def set_stage_timings(
+    enabled: bool,
+    reset: bool = False,
+    current_user = Depends(get_current_admin_user)
+):
+    """Switch stage timing on or off at runtime, optionally clearing recorded histograms"""
+    profiler.enabled = enabled
+    if reset:
+        profiler.reset()
+    return {"enabled": profiler.enabled}
+
+@router.get("/system/password-hashing")
+async def get_password_hashing_stats(current_user = Depends(get_current_admin_user)):
+    """Password hashing pool: in-flight and queued requests, completions, failures, rejections, queue-wait and hash latency"""
+    return password_hasher.stats()
+
+@router.get("/system/principal-cache")
+async def get_principal_cache_stats(current_user = Depends(get_current_admin_user)):
+    """Authenticated-principal cache: entries, hit rate and invalidations"""
+    return principal_cache.stats()
+
+@router.get("/system/login-admission")
+async def get_login_admission_stats(current_user = Depends(get_current_admin_user)):
+    """Login attempts admitted and shed, and the bcrypt time shedding saved"""
+    return login_admission.stats()
@@ -1,19 +1,33 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.schemas.user import User, UserLogin, Token
 from app.crud import user as user_crud
-from app.core.security import create_access_token, get_current_user
+from app.core.security import (
+    create_access_token, get_current_user, login_admission, login_throttled_exception,
+    LoginThrottled, PasswordHasherBusy
+)
 from app.core.config import settings
+from app.core.audit import audit
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = user_crud.authenticate_user(db, user_credentials.email, user_credentials.password)
+async def login(user_credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
+    client = request.client.host if request.client else None
+    try:
+        # Refuse over-limit attempts before any bcrypt work is queued
+        with login_admission.admit(user_credentials.email, client):
+            user = await user_crud.authenticate_user_async(db, user_credentials.email, user_credentials.password)
+    except LoginThrottled as e:
+        audit("LOGIN_THROTTLED", details=f"{user_credentials.email}: {e.reason} limit", ip_address=client)
+        raise login_throttled_exception(e.retry_after)
+    except PasswordHasherBusy:
+        raise login_throttled_exception()
     if not user:
+        audit("LOGIN_FAILED", details=user_credentials.email, ip_address=client)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -25,6 +39,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Inactive user"
         )
     
+    audit("LOGIN_SUCCESS", user.id, ip_address=client)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
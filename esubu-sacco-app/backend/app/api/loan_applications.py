@@ -1,5 +1,6 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.schemas.loan_application import (
@@ -7,54 +8,103 @@ from app.schemas.loan_application import (
     LoanApplicationCreate, 
     LoanApplicationUpdate,
     LoanApplicationWithRemarks,
+    LoanApplicationPage,
+    BulkApplicationIntake,
+    BulkApplicationResponse,
     ApplicationRemarkCreate,
     ApplicationRemark
 )
 from app.crud import loan_application as loan_crud
 from app.core.security import get_current_user, get_current_officer_user
+from app.core.audit import audit
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=LoanApplication)
-async def create_loan_application(
+def create_loan_application(
     application: LoanApplicationCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
 ):
     """Create a new loan application"""
-    return loan_crud.create_loan_application(db, application, current_user.id)
+    db_application = loan_crud.create_loan_application(db, application, current_user.id)
+    audit("APPLICATION_CREATED", current_user.id, f"{db_application.application_number}: {db_application.system_decision}")
+    return db_application
 
-@router.get("/", response_model=List[LoanApplication])
-async def get_loan_applications(
-    skip: int = 0,
-    limit: int = 100,
+@router.post("/bulk", response_model=BulkApplicationResponse)
+def create_loan_applications_bulk(
+    intake: BulkApplicationIntake,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_officer_user)
+):
+    """Create a batch of loan applications in one transaction, reporting each record's outcome"""
+    records = intake.applications
+    if len(records) > settings.BULK_INTAKE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_INTAKE_MAX_ROWS} applications per request")
+    
+    results, valid, positions = [None] * len(records), [], []
+    for index, record in enumerate(records):
+        try:
+            valid.append(LoanApplicationCreate(**record))
+            positions.append(index)
+        except ValidationError as e:
+            errors = [{"field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]} for error in e.errors()]
+            results[index] = {"index": index, "errors": errors}
+    
+    if valid:
+        created = loan_crud.create_loan_applications(db, valid, current_user.id)
+        for index, application in zip(positions, created):
+            results[index] = dict(application, index=index)
+        audit("APPLICATIONS_BULK_CREATED", current_user.id, f"{len(valid)} created, {len(records) - len(valid)} rejected")
+    
+    return {"created": len(valid), "failed": len(records) - len(valid), "results": results}
+
+@router.get("/", response_model=LoanApplicationPage)
+def get_loan_applications(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     status: Optional[str] = Query(None, description="Filter by status"),
     decision: Optional[str] = Query(None, description="Filter by system decision"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
 ):
-    """Get all loan applications with optional filters"""
-    return loan_crud.get_loan_applications(db, skip=skip, limit=limit, status=status, decision=decision)
+    """Get loan applications newest first, with optional filters"""
+    before = decode_cursor(cursor) if cursor else None
+    applications = loan_crud.get_loan_applications(db, limit=limit, before=before, status=status, decision=decision)
+    last = applications[-1] if len(applications) == limit else None
+    next_cursor = encode_cursor(last.created_at, last.id) if last else None
+    return {"items": applications, "next_cursor": next_cursor}
 
 @router.get("/stats")
-async def get_application_stats(
+def get_application_stats(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
 ):
     """Get application statistics for dashboard"""
     return loan_crud.get_application_stats(db)
 
-@router.get("/search")
-async def search_applications(
+@router.get("/search", response_model=List[LoanApplication])
+def search_applications(
+    response: Response,
     q: str = Query(..., description="Search term"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
 ):
-    """Search applications by name, ID, or application number"""
-    return loan_crud.search_applications(db, q)
+    """Search applications by name, ID, or application number, best matches first.
+    
+    X-Search-Truncated is "true" when the name matched more applicants than
+    are ranked; only the newest matches were considered, so refine the search.
+    """
+    applications, truncated = loan_crud.search_applications(db, q, skip=skip, limit=limit)
+    response.headers["X-Search-Truncated"] = "true" if truncated else "false"
+    return applications
 
 @router.get("/{application_id}", response_model=LoanApplicationWithRemarks)
-async def get_loan_application(
+def get_loan_application(
     application_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
@@ -66,7 +116,7 @@ async def get_loan_application(
     return application
 
 @router.put("/{application_id}", response_model=LoanApplication)
-async def update_loan_application(
+def update_loan_application(
     application_id: int,
     application_update: LoanApplicationUpdate,
     db: Session = Depends(get_db),
@@ -76,10 +126,12 @@ async def update_loan_application(
     application = loan_crud.update_loan_application(db, application_id, application_update)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    changed = ", ".join(sorted(application_update.dict(exclude_unset=True)))
+    audit("APPLICATION_UPDATED", current_user.id, f"{application.application_number}: {changed}")
     return application
 
 @router.post("/{application_id}/remarks", response_model=ApplicationRemark)
-async def add_application_remark(
+def add_application_remark(
     application_id: int,
     remark_text: str,
     db: Session = Depends(get_db),
@@ -9,7 +9,7 @@ from app.core.security import get_current_officer_user
 router = APIRouter()
 
 @router.get("/dashboard")
-async def get_officer_dashboard(
+def get_officer_dashboard(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_officer_user)
 ):
@@ -20,7 +20,7 @@ async def get_officer_dashboard(
     
     # Get recent applications
     from app.crud.loan_application import get_loan_applications
-    recent_applications = get_loan_applications(db, skip=0, limit=5)
+    recent_applications = get_loan_applications(db, limit=5)
     
     return {
         "stats": stats,
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.schemas.scoring import ScoreRequest, ScoreResponse
+from app.services.scoring import batcher, get_pipeline
+from app.core.security import get_current_officer_user
+
+router = APIRouter()
+
+@router.post("/", response_model=ScoreResponse)
+async def score_applicant(
+    request: ScoreRequest,
+    current_user = Depends(get_current_officer_user)
+):
+    """Score one applicant with the ML model; concurrent requests share batched model calls"""
+    pipeline = get_pipeline()
+    unknown = sorted(set(request.features) - pipeline.input_names)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown features: {', '.join(unknown)}")
+    # Checked here so one bad value cannot fail the whole micro-batch it would join
+    mistyped = sorted(
+        name for name, value in request.features.items()
+        if isinstance(value, str) == (name in pipeline.numeric)
+    )
+    if mistyped:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Numeric features need numbers and categorical features need strings: {', '.join(mistyped)}"
+        )
+    return await batcher.score(request.features)
+
+@router.get("/stats")
+async def get_scoring_stats(current_user = Depends(get_current_officer_user)):
+    """Micro-batching counters: batches run, rows scored, mean batch size, queue depth"""
+    return batcher.stats()
@@ -0,0 +1,187 @@
+"""Non-blocking audit trail stored in the system_logs table.
+
+Request handlers call audit(), which only puts a LogRecord on a bounded
+queue through a logging QueueHandler. A background writer drains the
+queue and bulk-inserts the events into system_logs once AUDIT_BATCH_SIZE
+are waiting or AUDIT_FLUSH_INTERVAL_MS after the first of them arrived.
+If the queue is full, or the writer has been stopped for shutdown, events
+are dropped and counted. They never block a request.
+"""
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import Optional
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import SystemLog
+from scoring.timing import Histogram
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class AuditQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) events instead of blocking or raising when full"""
+
+    def __init__(self, event_queue: queue.Queue):
+        super().__init__(event_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Rows are built from the record's attributes, so skip QueueHandler's message formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class SystemLogWriter:
+    """Background thread that flushes queued audit records to system_logs in bulk inserts"""
+
+    def __init__(self, event_queue: queue.Queue, batch_size: int, flush_interval_ms: float):
+        self.queue = event_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.flush_time = Histogram()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start_thread(self):
+        if not self.running:
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def start(self):
+        """Start the writer thread, re-arming a writer that was stopped"""
+        with self._lock:
+            self._stopped = False
+            self._start_thread()
+
+    def ensure_running(self) -> bool:
+        """Start the writer if needed; False once it has been stopped, when events should be dropped"""
+        if self.running and not self._stopped:
+            return True
+        with self._lock:
+            if self._stopped:
+                return False
+            self._start_thread()
+            return True
+
+    def stop(self, timeout: float = 5.0):
+        """Flush whatever is queued and stop the writer thread"""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        # Cleared only after the join, so nothing can start a second writer while this one drains
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            record = self.queue.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            self._flush(batch)
+
+        # Drain what arrived before the stop request
+        batch = []
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _STOP:
+                batch.append(record)
+        if batch:
+            self._flush(batch)
+
+    @staticmethod
+    def _row(record) -> dict:
+        return {
+            "user_id": getattr(record, "user_id", None),
+            "action": record.msg,
+            "details": getattr(record, "details", None),
+            "ip_address": getattr(record, "ip_address", None),
+            # Stored as naive UTC, like the column's server default
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None),
+        }
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(insert(SystemLog), [self._row(record) for record in batch])
+            db.commit()
+            self.written += len(batch)
+        except Exception:
+            db.rollback()
+            self.failed += len(batch)
+            logger.exception(f"Failed to write {len(batch)} audit events")
+        finally:
+            db.close()
+            self.batches += 1
+            self.flush_time.record(time.perf_counter() - started)
+
+audit_queue = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+audit_handler = AuditQueueHandler(audit_queue)
+audit_writer = SystemLogWriter(audit_queue, settings.AUDIT_BATCH_SIZE, settings.AUDIT_FLUSH_INTERVAL_MS)
+
+audit_logger = logging.getLogger("esubu.audit")
+audit_logger.setLevel(logging.INFO)
+audit_logger.addHandler(audit_handler)
+audit_logger.propagate = False
+
+def audit(action: str, user_id: Optional[int] = None, details: Optional[str] = None, ip_address: Optional[str] = None):
+    """Record an audit event; returns immediately, the row is written by the background writer"""
+    if not audit_writer.ensure_running():
+        # Shutting down: no writer is left to store the event
+        audit_handler.dropped += 1
+        return
+    audit_logger.info(action, extra={"user_id": user_id, "details": details, "ip_address": ip_address})
+
+def audit_stats() -> dict:
+    return {
+        "queued": audit_queue.qsize(),
+        "queue_size": audit_queue.maxsize,
+        "written": audit_writer.written,
+        "failed": audit_writer.failed,
+        "dropped": audit_handler.dropped,
+        "batches": audit_writer.batches,
+        "flush_time": audit_writer.flush_time.summary()
+    }
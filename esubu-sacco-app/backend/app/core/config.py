@@ -1,9 +1,18 @@
+import sys
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from typing import Optional
 
+# Repository root, home of the shared `scoring` package and the model artifact
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./esubu_sacco.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20  # Open request sessions are capped at pool_size + max_overflow - 1
+    WORKER_THREADS: int = 40  # Threadpool running sync routes and DB work (FastAPI's default is 40)
+    DB_BUSY_TIMEOUT_MS: int = 5000  # SQLite writers wait this long for the lock
     
     # Security
     SECRET_KEY: str = "esubu-sacco-secret-key-change-in-production"
@@ -24,7 +33,61 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str = "admin@esubusacco.co.ke"
     ADMIN_PASSWORD: str = "admin123"  # Change in production
     
+    # ML Scoring
+    SCORING_ROOT: str = str(PROJECT_ROOT)
+    MODEL_ARTIFACT_PATH: str = str(PROJECT_ROOT / "credit_scoring_stacked_model.esb")
+    SCORE_BATCH_MAX_ROWS: int = 64  # Flush a micro-batch at this many rows...
+    SCORE_BATCH_MAX_WAIT_MS: float = 5.0  # ...or this long after its first request
+    
+    # Per-stage timing (admins can also toggle it at runtime)
+    TIMING_ENABLED: bool = False
+    TIMING_TRACE_FILE: str = ""  # Chrome trace-event file for flame charts; empty disables
+    TIMING_TRACE_SAMPLE_RATE: float = 0.01
+    
+    # bcrypt cost; 0 calibrates it on first use so a verification takes about BCRYPT_TARGET_MS
+    BCRYPT_ROUNDS: int = 0
+    BCRYPT_TARGET_MS: float = 250.0
+    
+    # Password hashing pool (bcrypt runs here, never on the event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Hash requests waiting beyond this are refused with 503
+    
+    # Login admission control: attempts per minute and burst per email and per client address
+    LOGIN_USER_RATE: float = 5.0
+    LOGIN_USER_BURST: int = 5
+    LOGIN_IP_RATE: float = 30.0
+    LOGIN_IP_BURST: int = 20
+    LOGIN_MAX_CONCURRENT: int = 8  # Verifications admitted at once; more are refused with 429
+    
+    # Audit trail: events are queued and bulk-inserted into system_logs by a background writer
+    AUDIT_QUEUE_SIZE: int = 10000  # Events beyond this are dropped rather than blocking requests
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_MS: float = 500.0
+    
+    # Bulk intake: records accepted per POST /loans/bulk
+    BULK_INTAKE_MAX_ROWS: int = 1000
+    
+    # Application numbers are reserved from the database this many at a time per process
+    APPLICATION_NUMBER_BLOCK_SIZE: int = 50
+    
+    # Applicant search: officers can page through at most this many best matches
+    SEARCH_MAX_RESULTS: int = 200
+    SEARCH_RANK_WINDOW: int = 2000  # Newest name matches ranked by relevance; more set X-Search-Truncated
+    
+    # Report exports are read and written this many rows at a time
+    EXPORT_CHUNK_ROWS: int = 1000
+    EXPORT_ROW_GROUP_ROWS: int = 50000  # Parquet row group / Arrow record batch size of analytics exports
+    EXPORT_WATERMARK_OVERLAP_SECONDS: int = 60  # Incremental exports re-send rows changed this long before `since`
+    
+    # Authenticated-principal cache (role changes on other workers apply within the TTL)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    
     class Config:
         env_file = ".env"
 
 settings = Settings()
+
+# The scoring package lives at the repository root, shared with the Streamlit app
+if settings.SCORING_ROOT not in sys.path:
+    sys.path.append(settings.SCORING_ROOT)
@@ -1,3 +1,9 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -8,15 +14,129 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.db.database import get_db
 from app.crud import user as user_crud
+from scoring.admission import LoginAdmission, LoginThrottled
+from scoring.passwords import needs_rehash, resolve_rounds
+from scoring.timing import Histogram
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+@functools.lru_cache(maxsize=None)
+def bcrypt_rounds() -> int:
+    """bcrypt cost for new hashes: BCRYPT_ROUNDS, or calibrated once per process on first use"""
+    return resolve_rounds(settings.BCRYPT_ROUNDS, settings.BCRYPT_TARGET_MS)
+
+@functools.lru_cache(maxsize=None)
+def _pwd_context() -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=bcrypt_rounds())
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return needs_rehash(hashed_password, bcrypt_rounds())
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool so slow hashes never block the event loop.
+    
+    bcrypt releases the GIL, so workers hash in parallel with request handling.
+    Requests beyond max_queue waiting hashes are refused instead of piling up.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait = Histogram()
+        self.hash_time = Histogram()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Requests submitted but not yet picked up by a worker"""
+        return max(0, self.in_flight - self.workers)
+    
+    def _run(self, fn, args, submitted):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.queue_wait.record(started - submitted)
+                self.hash_time.record(finished - started)
+    
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.in_flight += 1
+        succeeded = False
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, self._run, fn, args, time.perf_counter())
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                # A wrong password is a completed verify; an exception or cancellation is a failure
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+    
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queue_wait": self.queue_wait.summary(),
+                "hash_time": self.hash_time.summary()
+            }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+def hasher_busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+login_admission = LoginAdmission(
+    settings.LOGIN_USER_RATE, settings.LOGIN_USER_BURST,
+    settings.LOGIN_IP_RATE, settings.LOGIN_IP_BURST,
+    settings.LOGIN_MAX_CONCURRENT
+)
+
+def login_throttled_exception(retry_after: int = 1):
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, please retry later",
+        headers={"Retry-After": str(retry_after)},
+    )
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -46,18 +166,101 @@ def verify_token(token: str):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+class Principal:
+    """Detached snapshot of a User row, safe to share across requests and sessions"""
+    
+    __slots__ = ("id", "email", "full_name", "role", "is_active", "created_at", "last_login")
+    
+    def __init__(self, user):
+        for field in self.__slots__:
+            setattr(self, field, getattr(user, field))
+
+class PrincipalCache:
+    """Bounded LRU of token subject -> Principal with a TTL.
+    
+    update_user and deactivate_user invalidate entries in this process;
+    the TTL bounds how long other worker processes may serve a stale role.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, subject: str, principal: Principal):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, *subjects: str):
+        with self._lock:
+            for subject in subjects:
+                if self._entries.pop(subject, None) is not None:
+                    self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations
+            }
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     username = verify_token(credentials.credentials)
-    user = user_crud.get_user_by_email(db, email=username)
-    if user is None:
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = user_crud.get_user_by_email(db, email=username)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        principal = Principal(user)
+        # End the read so the connection goes back to the pool while the route waits for a worker thread
+        db.rollback()
+        if principal.is_active:
+            principal_cache.put(username, principal)
+    
+    # Tokens issued before deactivation stay valid until they expire; the account must not
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+            detail="Inactive user"
         )
-    return user
+    return principal
 
 def get_current_admin_user(current_user = Depends(get_current_user)):
     if current_user.role != "admin":
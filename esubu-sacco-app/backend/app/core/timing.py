@@ -0,0 +1,5 @@
+from scoring.timing import Profiler
+from app.core.config import settings
+
+# Process-wide stage timings; summaries are served from /api/v1/admin/system/timings
+profiler = Profiler(settings.TIMING_ENABLED, settings.TIMING_TRACE_FILE, settings.TIMING_TRACE_SAMPLE_RATE)
@@ -0,0 +1,60 @@
+"""Sequence-based application numbers: ESB + YYYYMMDD + a six-digit daily sequence.
+
+Each process reserves a block of APPLICATION_NUMBER_BLOCK_SIZE numbers for
+the day from application_number_sequences in one short transaction, then
+hands them out from memory. Numbers never collide, so inserts need no
+retries. Within a day they increase per process, but interleave across
+processes, and numbers left in a block at shutdown or at midnight are
+skipped.
+"""
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.db.database import engine
+from app.db.models import ApplicationNumberSequence
+
+PREFIX = "ESB"
+SEQUENCE_DIGITS = 6
+
+class ApplicationNumberAllocator:
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._owner = None  # (pid, day) the current block was reserved for
+        self._next = self._end = 0
+        self.blocks_reserved = 0
+    
+    def _reserve_block(self, day: str) -> int:
+        """First number of a freshly reserved block for `day`"""
+        table = ApplicationNumberSequence.__table__
+        advance = update(table).where(table.c.day == day).values(next_value=table.c.next_value + self.block_size)
+        # Its own transaction, committed at once: a caller's rollback must not hand the block out again
+        with engine.begin() as connection:
+            if not connection.execute(advance).rowcount:
+                # First block of the day; another process may create the row first
+                try:
+                    with connection.begin_nested():
+                        connection.execute(insert(table).values(day=day, next_value=1 + self.block_size))
+                except IntegrityError:
+                    connection.execute(advance)
+            end = connection.execute(select(table.c.next_value).where(table.c.day == day)).scalar_one()
+        self.blocks_reserved += 1
+        return end - self.block_size
+    
+    def allocate(self) -> str:
+        day = datetime.now().strftime("%Y%m%d")
+        with self._lock:
+            # A forked worker must not reuse its parent's block
+            owner = (os.getpid(), day)
+            if owner != self._owner or self._next >= self._end:
+                self._next = self._reserve_block(day)
+                self._end = self._next + self.block_size
+                self._owner = owner
+            number = self._next
+            self._next += 1
+        return f"{PREFIX}{day}{number:0{SEQUENCE_DIGITS}d}"
+
+application_numbers = ApplicationNumberAllocator(settings.APPLICATION_NUMBER_BLOCK_SIZE)
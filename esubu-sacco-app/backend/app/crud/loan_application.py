@@ -1,18 +1,27 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_, func
-from app.db.models import LoanApplication, ApplicationRemark
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import desc, and_, func, insert, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from app.db.models import LoanApplication, ApplicationRemark, ApplicationCounter
 from app.schemas.loan_application import LoanApplicationCreate, LoanApplicationUpdate, ApplicationRemarkCreate
-from typing import Optional, List
-import random
-import string
+from app.core.config import settings
+from app.core.timing import profiler
+from app.crud.application_number import PREFIX as APPLICATION_NUMBER_PREFIX, application_numbers
+from app.db import search_index
+from typing import Optional, List, Tuple
+import numpy as np
+import re
+from collections import Counter
 from datetime import datetime
 
+TOTAL_COUNTER = "total"
+
+# Words of a search term; each becomes a quoted FTS5 term, so no query syntax gets through
+_SEARCH_TOKEN = re.compile(r"\w+")
+_MAX_SEARCH_TOKENS = 6
+
 def generate_application_number():
-    """Generate unique application number"""
-    prefix = "ESB"
-    timestamp = datetime.now().strftime("%Y%m%d")
-    random_suffix = ''.join(random.choices(string.digits, k=4))
-    return f"{prefix}{timestamp}{random_suffix}"
+    """Next application number from this process's reserved block"""
+    return application_numbers.allocate()
 
 def calculate_credit_score(application_data: dict) -> float:
     """Simple credit scoring algorithm"""
@@ -60,6 +69,33 @@ def calculate_credit_score(application_data: dict) -> float:
     
     return max(300, min(850, score))  # Keep score between 300-850
 
+def calculate_credit_scores(applications: List[dict]) -> np.ndarray:
+    """calculate_credit_score for many applications in one vectorized pass"""
+    def column(name, default=0.0):
+        return np.array([a.get(name, default) for a in applications], dtype=float)
+    
+    monthly_income = column('monthly_income')
+    loan_amount = column('loan_amount')
+    monthly_expenses = column('monthly_expenses')
+    employment_status = np.array([a.get('employment_status', '') for a in applications], dtype=object)
+    has_existing_loans = np.array([bool(a.get('has_existing_loans', False)) for a in applications])
+    
+    score = np.full(len(applications), 600.0)
+    score += np.select([monthly_income > 100000, monthly_income > 50000, monthly_income > 30000], [100, 50, 25], 0)
+    score += np.select(
+        [np.isin(employment_status, ['Employed', 'Self-employed']), employment_status == 'Student'], [50, 10], 0
+    )
+    
+    has_income = monthly_income > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = loan_amount / (monthly_income * 12)
+        expense_ratio = monthly_expenses / monthly_income
+    score += np.where(has_income, np.select([ratio < 0.3, ratio < 0.5, ratio > 0.8], [50, 25, -50], 0), 0)
+    score -= np.where(has_existing_loans, 30, 0)
+    score += np.where(has_income, np.select([expense_ratio < 0.5, expense_ratio > 0.8], [30, -40], 0), 0)
+    
+    return np.clip(score, 300, 850)
+
 def get_system_decision(credit_score: float) -> tuple:
     """Determine system decision based on credit score"""
     if credit_score >= 700:
@@ -70,18 +106,23 @@ def get_system_decision(credit_score: float) -> tuple:
         return "rejected", "Credit score below minimum threshold"
 
 def create_loan_application(db: Session, application: LoanApplicationCreate, user_id: Optional[int] = None):
+    trace = profiler.trace("create_loan_application")
+    
     # Generate application number
     application_number = generate_application_number()
+    trace.mark("application_number")
     
     # Calculate credit score
     application_dict = application.dict()
     credit_score = calculate_credit_score(application_dict)
+    trace.mark("credit_score")
     
     # Get system decision
     system_decision, decision_reason = get_system_decision(credit_score)
+    trace.mark("decision")
     
     db_application = LoanApplication(
-        **application.dict(),
+        **application_dict,
         application_number=application_number,
         credit_score=credit_score,
         system_decision=system_decision,
@@ -90,10 +131,59 @@ def create_loan_application(db: Session, application: LoanApplicationCreate, use
     )
     
     db.add(db_application)
+    db.flush()  # Applies the column defaults the counters key on
+    _bump_counters(db, Counter(_counter_keys(db_application.status, db_application.system_decision)))
     db.commit()
+    trace.mark("insert")
     db.refresh(db_application)
+    trace.mark("refresh")
+    trace.finish()
     return db_application
 
+def create_loan_applications(db: Session, applications: List[LoanApplicationCreate], user_id: Optional[int] = None):
+    """Score and insert many applications in one transaction
+    
+    Returns id, application_number, credit_score and system_decision for each application, in order.
+    """
+    trace = profiler.trace("create_loan_applications")
+    
+    application_dicts = [application.dict() for application in applications]
+    credit_scores = calculate_credit_scores(application_dicts)
+    trace.mark("credit_score")
+    
+    rows = []
+    for application_dict, credit_score in zip(application_dicts, credit_scores.tolist()):
+        system_decision, decision_reason = get_system_decision(credit_score)
+        rows.append(dict(
+            application_dict,
+            application_number=generate_application_number(),
+            credit_score=credit_score,
+            system_decision=system_decision,
+            decision_reason=decision_reason,
+            status="pending",
+            created_by=user_id
+        ))
+    trace.mark("decision")
+    
+    inserted = db.execute(
+        insert(LoanApplication).returning(LoanApplication.id, LoanApplication.application_number), rows
+    ).all()
+    ids = {application_number: application_id for application_id, application_number in inserted}
+    _bump_counters(db, Counter(key for row in rows for key in _counter_keys(row["status"], row["system_decision"])))
+    db.commit()
+    trace.mark("insert")
+    trace.finish()
+    
+    return [
+        {
+            "id": ids[row["application_number"]],
+            "application_number": row["application_number"],
+            "credit_score": row["credit_score"],
+            "system_decision": row["system_decision"]
+        }
+        for row in rows
+    ]
+
 def get_loan_application(db: Session, application_id: int):
     return db.query(LoanApplication).options(
         joinedload(LoanApplication.remarks)
@@ -101,29 +191,38 @@ def get_loan_application(db: Session, application_id: int):
 
 def get_loan_applications(
     db: Session, 
-    skip: int = 0, 
     limit: int = 100,
+    before: Optional[Tuple[datetime, int]] = None,
     status: Optional[str] = None,
     decision: Optional[str] = None
 ):
+    """Newest-first page of applications strictly older than the (created_at, id) position `before`"""
+    # Remarks come from one batched IN select, so the limit applies to applications, not joined rows
     query = db.query(LoanApplication).options(
-        joinedload(LoanApplication.remarks)
+        selectinload(LoanApplication.remarks)
     )
     
+    if before is not None:
+        # A row-value comparison lets the index seek straight to the position
+        query = query.filter(tuple_(LoanApplication.created_at, LoanApplication.id) < tuple(before))
     if status:
         query = query.filter(LoanApplication.status == status)
     if decision:
         query = query.filter(LoanApplication.system_decision == decision)
     
-    return query.order_by(desc(LoanApplication.created_at)).offset(skip).limit(limit).all()
+    return query.order_by(LoanApplication.created_at.desc(), LoanApplication.id.desc()).limit(limit).all()
 
 def update_loan_application(db: Session, application_id: int, application_update: LoanApplicationUpdate):
     db_application = db.query(LoanApplication).filter(LoanApplication.id == application_id).first()
     if db_application:
+        before = Counter(_counter_keys(db_application.status, db_application.system_decision))
         update_data = application_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_application, field, value)
         db_application.updated_at = datetime.utcnow()
+        after = Counter(_counter_keys(db_application.status, db_application.system_decision))
+        after.subtract(before)
+        _bump_counters(db, after)
         db.commit()
         db.refresh(db_application)
     return db_application
@@ -139,26 +238,137 @@ def add_remark(db: Session, remark: ApplicationRemarkCreate, user_id: int):
     db.refresh(db_remark)
     return db_remark
 
+def _counter_keys(status: Optional[str], decision: Optional[str]) -> List[str]:
+    keys = [TOTAL_COUNTER]
+    if status is not None:
+        keys.append(f"status:{status}")
+    if decision is not None:
+        keys.append(f"decision:{decision}")
+    return keys
+
+def _bump_counters(db: Session, deltas: Counter):
+    """Apply counter deltas inside the caller's transaction"""
+    # Sorted so concurrent writers lock counter rows in the same order
+    for key, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        increment = {ApplicationCounter.value: ApplicationCounter.value + delta}
+        counter = db.query(ApplicationCounter).filter(ApplicationCounter.key == key)
+        if counter.update(increment, synchronize_session=False):
+            continue
+        # First application with this status or decision; another writer may create the row first
+        try:
+            with db.begin_nested():
+                db.add(ApplicationCounter(key=key, value=delta))
+        except IntegrityError:
+            counter.update(increment, synchronize_session=False)
+
+def count_applications(db: Session) -> Counter:
+    """Counter values recomputed from loan_applications in one grouped pass"""
+    rows = db.query(
+        LoanApplication.status, LoanApplication.system_decision, func.count(LoanApplication.id)
+    ).group_by(LoanApplication.status, LoanApplication.system_decision).all()
+    
+    counts = Counter({TOTAL_COUNTER: 0})
+    for status, decision, n in rows:
+        for key in _counter_keys(status, decision):
+            counts[key] += n
+    return counts
+
+def rebuild_application_counters(db: Session):
+    """Replace the maintained counters with a fresh count"""
+    db.query(ApplicationCounter).delete(synchronize_session=False)
+    db.add_all(ApplicationCounter(key=key, value=value) for key, value in count_applications(db).items())
+    db.commit()
+
+def ensure_application_counters(db: Session):
+    """Backfill the counters for databases created before they were maintained"""
+    if db.get(ApplicationCounter, TOTAL_COUNTER) is None:
+        try:
+            rebuild_application_counters(db)
+        except IntegrityError:
+            # Another worker backfilled first
+            db.rollback()
+
 def get_application_stats(db: Session):
-    """Get application statistics"""
-    total = db.query(LoanApplication).count()
-    pending = db.query(LoanApplication).filter(LoanApplication.status == "pending").count()
-    approved = db.query(LoanApplication).filter(LoanApplication.system_decision == "approved").count()
-    rejected = db.query(LoanApplication).filter(LoanApplication.system_decision == "rejected").count()
-    under_review = db.query(LoanApplication).filter(LoanApplication.status == "under_review").count()
+    """Get application statistics from the maintained counters"""
+    counters = dict(db.query(ApplicationCounter.key, ApplicationCounter.value).all())
     
     return {
-        "total": total,
-        "pending": pending,
-        "approved": approved,
-        "rejected": rejected,
-        "under_review": under_review
+        "total": counters.get(TOTAL_COUNTER, 0),
+        "pending": counters.get("status:pending", 0),
+        "approved": counters.get("decision:approved", 0),
+        "rejected": counters.get("decision:rejected", 0),
+        "under_review": counters.get("status:under_review", 0)
     }
 
-def search_applications(db: Session, search_term: str):
-    """Search applications by name, ID number, or application number"""
+def _search_numbers(db: Session, term: str, skip: int, limit: int):
+    """Applications whose application or national ID number starts with `term`, application numbers first"""
+    found = []
+    for column, prefix in (
+        (LoanApplication.application_number, term.upper()),
+        (LoanApplication.id_number, term)
+    ):
+        # A half-open range walks the column's B-tree index in order; LIKE 'x%' would scan the table
+        found += db.query(LoanApplication).filter(
+            column >= prefix, column < prefix + "\uffff"
+        ).order_by(column).limit(skip + limit).all()
+    unique = list({application.id: application for application in found}.values())
+    return unique[skip:skip + limit]
+
+def _search_names(db: Session, tokens: List[str], skip: int, limit: int):
+    """Applicants whose names contain every token, best matches first, and whether ranking was truncated"""
+    # Single letters match whole words only; expanding them would touch most of the index
+    match = " ".join(f'"{token}"*' if len(token) > 1 else f'"{token}"' for token in tokens)
+    # Ranking is confined to the newest SEARCH_RANK_WINDOW matches so a common name costs no more than a rare one
+    fts = search_index.FTS_TABLE
+    params = {"match": match, "window": settings.SEARCH_RANK_WINDOW, "limit": limit, "skip": skip}
+    ranked_ids = db.execute(text(
+        f"SELECT rowid FROM ("
+        f"SELECT rowid, bm25({fts}) AS score FROM {fts} WHERE {fts} MATCH :match "
+        f"ORDER BY rowid DESC LIMIT :window"
+        f") ORDER BY score, rowid DESC LIMIT :limit OFFSET :skip"
+    ), params).scalars().all()
+    if not ranked_ids:
+        return [], False
+    # Older matches beyond the window were never ranked; the caller tells the officer to narrow the search
+    truncated = db.execute(text(
+        f"SELECT 1 FROM {fts} WHERE {fts} MATCH :match ORDER BY rowid DESC LIMIT 1 OFFSET :window"
+    ), params).first() is not None
+    
+    applications = {a.id: a for a in db.query(LoanApplication).filter(LoanApplication.id.in_(ranked_ids))}
+    return [applications[i] for i in ranked_ids if i in applications], truncated
+
+def search_applications(db: Session, search_term: str, skip: int = 0, limit: int = 20):
+    """Search applications by name, ID number, or application number
+    
+    A single word containing a digit is looked up as an application or ID
+    number prefix (exact numbers come first), as is one starting with the
+    application number prefix unless no number matches; anything else is a
+    name search ranked by relevance. Paging stops at SEARCH_MAX_RESULTS matches.
+    
+    Returns (applications, truncated). truncated is True when a name matched
+    more than SEARCH_RANK_WINDOW applications, so only the newest of them
+    were ranked.
+    """
+    term = search_term.strip()
+    limit = min(limit, settings.SEARCH_MAX_RESULTS - skip)
+    if not term or limit <= 0:
+        return [], False
+    
+    tokens = _SEARCH_TOKEN.findall(term)[:_MAX_SEARCH_TOKENS]
+    if len(term.split()) == 1 and any(c.isdigit() for c in term):
+        return _search_numbers(db, term, skip, limit), False
+    if len(term.split()) == 1 and term.upper().startswith(APPLICATION_NUMBER_PREFIX):
+        # "ESB" starts every application number, but "Esbon" may still be a name
+        found = _search_numbers(db, term, skip, limit)
+        if found:
+            return found, False
+    if not tokens:
+        return [], False
+    if search_index.enabled:
+        return _search_names(db, tokens, skip, limit)
+    
     return db.query(LoanApplication).filter(
-        (LoanApplication.full_name.contains(search_term)) |
-        (LoanApplication.id_number.contains(search_term)) |
-        (LoanApplication.application_number.contains(search_term))
-    ).order_by(desc(LoanApplication.created_at)).all()
+        LoanApplication.full_name.contains(term)
+    ).order_by(desc(LoanApplication.created_at)).offset(skip).limit(limit).all(), False
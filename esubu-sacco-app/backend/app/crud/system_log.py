@@ -0,0 +1,23 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
+from app.db.models import SystemLog
+from datetime import datetime
+from typing import Optional, Tuple
+
+def get_system_logs(
+    db: Session,
+    limit: int = 100,
+    before: Optional[Tuple[datetime, int]] = None,
+    action: Optional[str] = None,
+    user_id: Optional[int] = None
+):
+    """Newest-first page of audit events strictly older than the (timestamp, id) position `before`"""
+    query = db.query(SystemLog)
+    if before is not None:
+        # Compared as a row value so ix_system_logs_timestamp_id can seek to it
+        query = query.filter(tuple_(SystemLog.timestamp, SystemLog.id) < tuple(before))
+    if action:
+        query = query.filter(SystemLog.action == action)
+    if user_id is not None:
+        query = query.filter(SystemLog.user_id == user_id)
+    return query.order_by(SystemLog.timestamp.desc(), SystemLog.id.desc()).limit(limit).all()
@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.db.database import run_db
 from app.db.models import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash, verify_password, password_needs_rehash, password_hasher, principal_cache,
+    PasswordHasherBusy
+)
 from typing import Optional
 
 def get_user(db: Session, user_id: int):
@@ -14,8 +18,10 @@ def get_user_by_email(db: Session, email: str):
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    # Async callers hash on the password pool first and pass the result in
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -30,19 +36,48 @@ def create_user(db: Session, user: UserCreate):
 def update_user(db: Session, user_id: int, user_update: UserUpdate):
     db_user = db.query(User).filter(User.id == user_id).first()
     if db_user:
+        previous_email = db_user.email
         update_data = user_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_user, field, value)
         db.commit()
         db.refresh(db_user)
+        # Role and status changes must not be served from a cached principal
+        principal_cache.invalidate(previous_email, db_user.email)
     return db_user
 
+def _store_rehashed_password(db: Session, user: User, hashed_password: str):
+    """Replace a hash made at another bcrypt cost; best effort, the login succeeds either way"""
+    try:
+        user.hashed_password = hashed_password
+        db.commit()
+        db.refresh(user)
+    except Exception:
+        db.rollback()
+
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user_by_email(db, email)
     if not user:
         return False
     if not verify_password(password, user.hashed_password):
         return False
+    if password_needs_rehash(user.hashed_password):
+        _store_rehashed_password(db, user, get_password_hash(password))
+    return user
+
+async def authenticate_user_async(db: Session, email: str, password: str):
+    """authenticate_user with bcrypt on the password hashing pool and queries on the worker threadpool"""
+    user = await run_db(get_user_by_email, db, email)
+    if not user:
+        return False
+    if not await password_hasher.verify(password, user.hashed_password):
+        return False
+    if password_needs_rehash(user.hashed_password):
+        try:
+            await run_db(_store_rehashed_password, db, user, await password_hasher.hash(password))
+        except PasswordHasherBusy:
+            # Retried on a later login
+            pass
     return user
 
 def deactivate_user(db: Session, user_id: int):
@@ -51,6 +86,7 @@ def deactivate_user(db: Session, user_id: int):
         db_user.is_active = False
         db.commit()
         db.refresh(db_user)
+        principal_cache.invalidate(db_user.email)
     return db_user
 
 def get_officers(db: Session):
@@ -1,20 +1,84 @@
-from sqlalchemy import create_engine
+import asyncio
+import weakref
+from contextlib import nullcontext
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Only for SQLite
-)
+def _engine_options(url: str) -> dict:
+    options = {}
+    database = make_url(url)
+    if database.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}  # Sessions move between worker threads
+        if database.database in (None, "", ":memory:"):
+            # In-memory databases use a per-thread singleton pool without overflow
+            return options
+    # Routes run their database work on the worker threadpool; get_db caps open sessions at this size
+    options["pool_size"] = settings.DB_POOL_SIZE
+    options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    options["pool_pre_ping"] = database.get_backend_name() != "sqlite"
+    return options
+
+_options = _engine_options(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **_options)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # WAL lets readers run alongside a writer; writers queue on the lock instead of failing
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}")
+        cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class SessionLimiter:
+    """Caps open request sessions at what the connection pool can serve.
+    
+    A session keeps its connection from its first query until it is closed,
+    including while the request waits for a worker thread. Waiting here,
+    on the event loop, instead of inside the pool means a worker thread
+    never blocks on a connection checkout, whatever WORKER_THREADS is.
+    """
+    
+    def __init__(self, slots):
+        self.slots = slots
+        # asyncio semaphores belong to one event loop; tests and tools may run several
+        self._semaphores = weakref.WeakKeyDictionary()
+    
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.slots)
+        return semaphore
+
+# One connection stays free for the audit writer and other background sessions
+session_limiter = (
+    SessionLimiter(max(1, _options["pool_size"] + _options["max_overflow"] - 1))
+    if "pool_size" in _options else None
+)
+
+async def get_db():
+    # Opened and closed on the event loop: handing the connection back must never wait for a worker thread
+    async with session_limiter.semaphore() if session_limiter else nullcontext():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+async def run_db(fn, *args, **kwargs):
+    """Run blocking CRUD work from an async route on the worker threadpool, keeping the event loop free.
+
+    Routes that only touch the database are plain `def` and FastAPI already runs
+    them there; this is for async routes that also await other work.
+    """
+    return await run_in_threadpool(fn, *args, **kwargs)
@@ -1,8 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# SQLite's CURRENT_TIMESTAMP has whole seconds; binding the same format keeps
+# comparisons against server-set values exact (the default adds .000000)
+ServerTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -62,13 +70,24 @@ class LoanApplication(Base):
     
     # Tracking
     status = Column(String, default="pending")  # pending, under_review, approved, rejected
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
     
     # Relationships
     created_by_user = relationship("User", back_populates="loan_applications_created")
     remarks = relationship("ApplicationRemark", back_populates="application")
+    
+    # Keyset pagination walks (created_at, id) newest first, optionally within one status or decision
+    __table_args__ = (
+        Index("ix_loan_applications_created_at_id", "created_at", "id"),
+        Index("ix_loan_applications_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_loan_applications_decision_created_at_id", "system_decision", "created_at", "id"),
+        # Exact national ID lookups in search
+        Index("ix_loan_applications_id_number", "id_number"),
+        # Incremental analytics exports: rows updated since a watermark, or never updated and created since it
+        Index("ix_loan_applications_updated_at_created_at", "updated_at", "created_at"),
+    )
 
 class ApplicationRemark(Base):
     __tablename__ = "application_remarks"
@@ -92,3 +111,20 @@ class SystemLog(Base):
     details = Column(Text)
     ip_address = Column(String)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Keyset pagination walks (timestamp, id) newest first
+    __table_args__ = (Index("ix_system_logs_timestamp_id", "timestamp", "id"),)
+
+class ApplicationCounter(Base):
+    __tablename__ = "application_counters"
+    
+    # "total", "status:<status>" or "decision:<system_decision>"
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class ApplicationNumberSequence(Base):
+    __tablename__ = "application_number_sequences"
+    
+    # One row per day (YYYYMMDD); next_value is the first number not yet handed out in a block
+    day = Column(String, primary_key=True)
+    next_value = Column(Integer, nullable=False)
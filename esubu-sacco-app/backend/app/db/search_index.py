@@ -0,0 +1,63 @@
+"""Full-text index over applicant names.
+
+On SQLite this is an FTS5 table with external content: it stores only the
+index and reads rows back from loan_applications. Triggers keep it in step
+with every insert, update and delete, including writes made outside the
+API. ID and application numbers are not indexed here; each is one unique
+token, so prefix queries over them are served from their B-tree indexes
+instead. Other databases, and SQLite builds without FTS5, fall back to
+substring matching in the CRUD layer.
+"""
+import logging
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "loan_applications_fts"
+
+_DDL = [
+    # Prefix indexes make the two- and three-letter prefixes officers type cheap to expand
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        full_name, content='loan_applications', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON loan_applications BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, full_name)
+        VALUES (new.id, new.full_name);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON loan_applications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, full_name)
+        VALUES ('delete', old.id, old.full_name);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF full_name ON loan_applications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, full_name)
+        VALUES ('delete', old.id, old.full_name);
+        INSERT INTO {FTS_TABLE}(rowid, full_name)
+        VALUES (new.id, new.full_name);
+    END""",
+]
+
+# Set once ensure_search_index has confirmed the index exists in this process
+enabled = False
+
+def ensure_search_index(engine) -> bool:
+    """Create the index and its triggers if missing, indexing existing rows on first creation"""
+    global enabled
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}
+            ).first()
+            for statement in _DDL:
+                connection.execute(text(statement))
+            if not exists:
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, falling back to prefix matching: {e}")
+        return False
+    enabled = True
+    return True
@@ -1,16 +1,28 @@
+import anyio
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.db.database import get_db, engine
+from app.db.database import get_db, engine, SessionLocal
 from app.db import models
-from app.api import auth, loan_applications, admin, officers
+from app.db.search_index import ensure_search_index
+from app.api import auth, loan_applications, admin, officers, scoring
+from app.crud import loan_application as loan_crud
+from app.services.scoring import batcher
+from app.core.audit import audit_writer
 from app.core.security import get_current_user
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+# create_all leaves tables that already exist alone, including any indexes added to them since
+for table in models.Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+with SessionLocal() as db:
+    loan_crud.ensure_application_counters(db)
+ensure_search_index(engine)
 
 app = FastAPI(
     title="Esubu SACCO Management System",
@@ -36,6 +48,24 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(loan_applications.router, prefix="/api/v1/loans", tags=["Loan Applications"])
 app.include_router(officers.router, prefix="/api/v1/officers", tags=["Officers"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+app.include_router(scoring.router, prefix="/api/v1/score", tags=["Scoring"])
+
+@app.on_event("startup")
+async def size_worker_threadpool():
+    # Sync routes and run_db calls share this limiter
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.WORKER_THREADS
+
+@app.on_event("shutdown")
+async def stop_scoring_batcher():
+    await batcher.close()
+
+@app.on_event("startup")
+def start_audit_writer():
+    audit_writer.start()
+
+@app.on_event("shutdown")
+def flush_audit_log():
+    audit_writer.stop()
 
 @app.get("/")
 async def root():
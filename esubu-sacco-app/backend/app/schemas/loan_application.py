@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 class LoanApplicationBase(BaseModel):
@@ -73,3 +73,29 @@ class ApplicationRemark(ApplicationRemarkBase):
 
 class LoanApplicationWithRemarks(LoanApplication):
     remarks: List[ApplicationRemark] = []
+
+class LoanApplicationPage(BaseModel):
+    items: List[LoanApplication]
+    # Pass back as `cursor` for the next (older) page; null on the last page
+    next_cursor: Optional[str] = None
+
+class BulkApplicationIntake(BaseModel):
+    # Validated record by record, so one bad record does not reject the batch
+    applications: List[Dict[str, Any]]
+
+class BulkApplicationError(BaseModel):
+    field: str
+    message: str
+
+class BulkApplicationResult(BaseModel):
+    index: int  # Position in the submitted batch
+    id: Optional[int] = None
+    application_number: Optional[str] = None
+    credit_score: Optional[float] = None
+    system_decision: Optional[str] = None
+    errors: List[BulkApplicationError] = []
+
+class BulkApplicationResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkApplicationResult]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Dict, Optional, Union
+
+class ScoreRequest(BaseModel):
+    # Raw column or model feature name -> value; omitted features default to 0
+    features: Dict[str, Union[float, str]]
+
+class ScoreResponse(BaseModel):
+    probability: float
+    credit_score: int
+    decision: str
+    loan_amount: Optional[float] = None
+    message: str
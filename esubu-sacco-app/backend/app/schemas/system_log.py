@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class SystemLog(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    details: Optional[str] = None
+    ip_address: Optional[str] = None
+    timestamp: datetime
+
+    class Config:
+        from_attributes = True
+
+class SystemLogPage(BaseModel):
+    items: List[SystemLog]
+    # Pass back as `cursor` for the next (older) page; null on the last page
+    next_cursor: Optional[str] = None
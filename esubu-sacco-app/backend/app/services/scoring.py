@@ -0,0 +1,141 @@
+"""In-process ML scoring with asyncio micro-batching.
+
+Concurrent score requests are queued and flushed as one matrix once
+SCORE_BATCH_MAX_ROWS rows are waiting or SCORE_BATCH_MAX_WAIT_MS has
+passed since the first of them; a single predict_proba call runs in a
+worker thread and each caller's future receives its own row.
+"""
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.timing import profiler
+from scoring import DECISION_LABELS, FEATURE_NAMES, InferencePipeline, decision_engine_arrays, generate_messages
+from scoring.artifact import load_artifact
+
+_pipelines = weakref.WeakKeyDictionary()
+
+
+def get_pipeline() -> InferencePipeline:
+    """Fused preprocessing + model pipeline over the artifact, rebuilt when the artifact changes"""
+    artifact = load_artifact(settings.MODEL_ARTIFACT_PATH, expected_features=FEATURE_NAMES)
+    pipeline = _pipelines.get(artifact)
+    if pipeline is None:
+        pipeline = _pipelines[artifact] = InferencePipeline(artifact.model, artifact.preprocessing)
+    return pipeline
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row score requests into batched model calls"""
+
+    def __init__(self, max_rows: int, max_wait_ms: float):
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # One model call at a time; the batch itself is the unit of parallelism
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batches = 0
+        self.rows = 0
+
+    def _ensure_started(self):
+        # Restart on a new event loop too (e.g. a server reload or a test client)
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def score(self, features: Dict[str, Union[float, str]]) -> dict:
+        """Score one applicant; resolves when the batch containing it has been scored"""
+        self._ensure_started()
+        pipeline = get_pipeline()
+        row = pipeline.transform_row(features)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, pipeline.raw_column(row, "Monthly_Income_KES")[0], future))
+        return await future
+
+    async def _collect(self):
+        """Wait for a first request, then gather more until the batch is full or the wait expires"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            rows, incomes, futures = zip(*batch)
+            trace = profiler.trace("score_batch")
+            try:
+                pipeline = get_pipeline()
+                X = np.vstack(rows)
+                trace.mark("assemble")
+                probs = await loop.run_in_executor(self._executor, pipeline.predict_proba, X)
+                trace.mark("predict_proba")
+                results = score_results(probs, np.asarray(incomes))
+                trace.mark("decision_logic")
+            except Exception as exc:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            for future, result in zip(futures, results):
+                # A caller that disconnected has cancelled its future
+                if not future.done():
+                    future.set_result(result)
+            trace.mark("respond")
+            trace.finish()
+
+    async def close(self):
+        if self._worker is not None and self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+def score_results(probs, incomes) -> list:
+    """Per-row decision payloads for a batch of probabilities, using the shared decision engine"""
+    scores, codes, amounts = decision_engine_arrays(probs, incomes)
+    messages = generate_messages(codes, scores, amounts)
+    return [
+        {
+            "probability": round(float(prob), 4),
+            "credit_score": int(score),
+            "decision": DECISION_LABELS[code],
+            "loan_amount": None if np.isnan(amount) else float(amount),
+            "message": message,
+        }
+        for prob, score, code, amount, message in zip(probs, scores, codes, amounts, messages)
+    ]
+
+
+batcher = MicroBatcher(settings.SCORE_BATCH_MAX_ROWS, settings.SCORE_BATCH_MAX_WAIT_MS)
@@ -0,0 +1,59 @@
+"""Backend test setup: a throwaway SQLite database and an admin caller.
+
+The backend package is named `app`, like the Streamlit app.py at the
+repository root, so the backend directory goes first on sys.path and the
+database URL is set before anything imports it. main.py mounts static/
+and templates/ relative to the working directory, hence the chdir.
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='esubu-tests-'), 'test.db')}"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.crud.user  # noqa: E402,F401  (before app.core.security, which imports it)
+from app.core.security import Principal, get_current_user  # noqa: E402
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.db.models import User  # noqa: E402
+from app.main import app as api  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def admin(db):
+    user = User(email="admin@example.com", hashed_password="-", full_name="Test Admin", role="admin")
+    db.add(user)
+    db.commit()
+    return Principal(user)
+
+
+@pytest.fixture
+def client(admin):
+    api.dependency_overrides[get_current_user] = lambda: admin
+    try:
+        with TestClient(api) as test_client:
+            yield test_client
+    finally:
+        api.dependency_overrides.pop(get_current_user, None)
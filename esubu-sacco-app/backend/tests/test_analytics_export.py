@@ -0,0 +1,109 @@
+import io
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import update
+
+from app.crud import loan_application as loan_crud
+from app.db.database import engine
+from app.db.models import LoanApplication
+from app.schemas.loan_application import LoanApplicationCreate
+from app.services import reports
+from benchmarks.synthetic import synthetic_loan_applications
+
+CREATED = datetime(2024, 3, 1, 8, 0, 0)
+
+
+@pytest.fixture
+def applications(db):
+    """Ten applications created an hour apart, none updated since"""
+    applications = []
+    for position, payload in enumerate(synthetic_loan_applications(10)):
+        application = loan_crud.create_loan_application(db, LoanApplicationCreate(**payload))
+        # updated_at named explicitly, or onupdate would stamp the backdating itself as a change
+        db.execute(update(LoanApplication.__table__).where(LoanApplication.id == application.id).values(
+            created_at=CREATED + timedelta(hours=position), updated_at=None
+        ))
+        applications.append(application)
+    db.commit()
+    db.expire_all()
+    return applications
+
+
+def pull(client, format="parquet", since=None):
+    params = {"format": format}
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/v1/admin/reports/applications/analytics", params=params)
+    assert response.status_code == 200
+    if format == "parquet":
+        table = pq.read_table(io.BytesIO(response.content))
+    else:
+        table = pa.ipc.open_stream(response.content).read_all()
+    return table, response.headers.get("X-Export-Watermark")
+
+
+def test_parquet_export_has_typed_columns(client, applications):
+    table, watermark = pull(client)
+    assert table.num_rows == 10
+    assert table.schema.equals(reports.ANALYTICS_SCHEMA)
+    assert table.schema.field("credit_score").type == pa.float64()
+    assert table.schema.field("loan_amount").type == pa.float64()
+    assert table.schema.field("loan_term_months").type == pa.int64()
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert watermark == (CREATED + timedelta(hours=9)).isoformat()
+
+    rows = {row["id"]: row for row in table.to_pylist()}
+    for application in applications:
+        row = rows[application.id]
+        assert row["application_number"] == application.application_number
+        assert row["credit_score"] == application.credit_score
+        assert row["created_at"].replace(tzinfo=None) == application.created_at
+
+
+def test_arrow_export_matches_parquet(client, applications):
+    parquet, _ = pull(client, "parquet")
+    arrow, _ = pull(client, "arrow")
+    assert arrow.sort_by("id").equals(parquet.sort_by("id"))
+
+
+def test_incremental_pull_returns_rows_changed_in_the_watermark_second(client, db, applications):
+    _, watermark = pull(client)
+    # Changed after the pull, but stored with the watermark's own second
+    applications[2].status = "approved"
+    db.commit()
+    applications[2].updated_at = datetime.fromisoformat(watermark)
+    db.commit()
+
+    table, _ = pull(client, since=watermark)
+    ids = table.column("id").to_pylist()
+    assert applications[2].id in ids
+    # Unchanged rows older than the overlap window are not sent again
+    assert applications[0].id not in ids
+
+
+def test_incremental_pull_returns_late_commits_within_the_overlap(client, db, applications):
+    _, watermark = pull(client)
+    # A transaction that stamped its row before the watermark was read but committed after
+    applications[0].updated_at = datetime.fromisoformat(watermark) - timedelta(seconds=30)
+    db.commit()
+
+    table, _ = pull(client, since=watermark)
+    assert applications[0].id in table.column("id").to_pylist()
+
+
+def test_changes_query_bounds(db, applications):
+    since = CREATED + timedelta(hours=4)
+    until = CREATED + timedelta(hours=7)
+    with engine.connect() as connection:
+        rows = connection.execute(reports.application_changes_query(since, until)).all()
+    # Created at hours 4-7 inclusive; hour 3 is outside the one-minute overlap
+    assert [row.id for row in rows] == [application.id for application in applications[4:8]]
+
+    applications[9].updated_at = CREATED + timedelta(hours=5)
+    db.commit()
+    with engine.connect() as connection:
+        rows = connection.execute(reports.application_changes_query(since, until)).all()
+    assert applications[9].id in [row.id for row in rows]
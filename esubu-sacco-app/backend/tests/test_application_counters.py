@@ -0,0 +1,62 @@
+import pytest
+
+from app.crud import loan_application as loan_crud
+from app.db.models import ApplicationCounter
+from app.schemas.loan_application import LoanApplicationCreate
+from benchmarks.synthetic import synthetic_loan_applications
+
+
+def maintained_counters(db):
+    return {key: value for key, value in db.query(ApplicationCounter.key, ApplicationCounter.value) if value}
+
+
+def recounted(db):
+    return {key: value for key, value in loan_crud.count_applications(db).items() if value}
+
+
+@pytest.fixture
+def applications(db):
+    return [
+        loan_crud.create_loan_application(db, LoanApplicationCreate(**payload))
+        for payload in synthetic_loan_applications(10)
+    ]
+
+
+def test_counters_follow_creates(db, applications):
+    assert maintained_counters(db) == recounted(db)
+    assert maintained_counters(db)[loan_crud.TOTAL_COUNTER] == 10
+
+
+def test_counters_follow_overrides(client, db, applications):
+    for application, decision in zip(applications, ["approved", "rejected", "pending", "approved"]):
+        response = client.put(
+            f"/api/v1/admin/applications/{application.id}/override",
+            params={"decision": decision, "reason": "test"}
+        )
+        assert response.status_code == 200
+    db.expire_all()
+    assert maintained_counters(db) == recounted(db)
+
+    stats = client.get("/api/v1/loans/stats").json()
+    counts = loan_crud.count_applications(db)
+    assert stats["total"] == 10
+    assert stats["approved"] == counts["decision:approved"]
+    assert stats["pending"] == counts["status:pending"]
+    assert stats["under_review"] == counts["status:under_review"] == 1
+
+
+def test_rebuild_matches_recount(db, applications):
+    db.query(ApplicationCounter).delete()
+    db.commit()
+    loan_crud.rebuild_application_counters(db)
+    assert maintained_counters(db) == recounted(db)
+
+
+def test_rebuild_endpoint_repairs_drift(client, db, applications):
+    db.query(ApplicationCounter).filter(ApplicationCounter.key == loan_crud.TOTAL_COUNTER).update(
+        {ApplicationCounter.value: 999}
+    )
+    db.commit()
+    assert client.post("/api/v1/admin/system/application-counters/rebuild").status_code == 200
+    db.expire_all()
+    assert maintained_counters(db) == recounted(db)
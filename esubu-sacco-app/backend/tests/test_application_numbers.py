@@ -0,0 +1,56 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.crud import application_number
+from app.crud import loan_application as loan_crud
+from app.crud.application_number import ApplicationNumberAllocator
+from app.db.database import SessionLocal
+from app.schemas.loan_application import LoanApplicationCreate
+from benchmarks.synthetic import synthetic_loan_applications
+
+NUMBER_FORMAT = re.compile(r"^ESB\d{8}\d{6}$")
+
+
+def test_allocators_sharing_the_sequence_never_collide():
+    # One allocator per simulated worker process, all reserving small blocks at once
+    allocators = [ApplicationNumberAllocator(block_size=7) for _ in range(4)]
+    start = threading.Barrier(len(allocators) * 2)
+
+    def allocate(allocator):
+        start.wait()
+        return [allocator.allocate() for _ in range(50)]
+
+    with ThreadPoolExecutor(len(allocators) * 2) as pool:
+        batches = list(pool.map(allocate, allocators * 2))
+
+    numbers = [number for batch in batches for number in batch]
+    assert len(set(numbers)) == len(numbers) == 400
+    assert all(NUMBER_FORMAT.match(number) for number in numbers)
+
+
+def test_concurrent_sessions_create_distinct_numbers():
+    records = [LoanApplicationCreate(**payload) for payload in synthetic_loan_applications(40)]
+
+    def create(chunk):
+        db = SessionLocal()
+        try:
+            return [loan_crud.create_loan_application(db, record).application_number for record in chunk]
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(4) as pool:
+        batches = list(pool.map(create, [records[i::4] for i in range(4)]))
+
+    numbers = [number for batch in batches for number in batch]
+    assert len(set(numbers)) == len(numbers) == 40
+
+
+def test_forked_worker_reserves_its_own_block(monkeypatch):
+    allocator = ApplicationNumberAllocator(block_size=100)
+    parent = [allocator.allocate() for _ in range(3)]
+    # A child process inherits the parent's in-memory block but has another pid
+    monkeypatch.setattr(application_number.os, "getpid", lambda: -1)
+    child = [allocator.allocate() for _ in range(3)]
+    assert allocator.blocks_reserved == 2
+    assert not set(parent) & set(child)
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud import loan_application as loan_crud
+from app.db.models import LoanApplication
+from app.schemas.loan_application import LoanApplicationCreate
+from benchmarks.synthetic import synthetic_loan_applications
+
+
+@pytest.fixture
+def tied_applications(db):
+    """30 applications sharing three created_at values, so page boundaries fall inside ties"""
+    start = datetime(2024, 5, 1, 9, 0, 0)
+    for position, payload in enumerate(synthetic_loan_applications(30)):
+        application = loan_crud.create_loan_application(db, LoanApplicationCreate(**payload))
+        application.created_at = start + timedelta(seconds=position % 3)
+    db.commit()
+    rows = db.query(LoanApplication.id, LoanApplication.created_at).all()
+    return sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)
+
+
+def walk_pages(client, limit, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = client.get("/api/v1/loans/", params=dict(params, limit=limit, cursor=cursor)).json()
+        ids += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7, 10, 30, 31])
+def test_pages_neither_overlap_nor_skip_across_ties(client, tied_applications, limit):
+    ids, pages = walk_pages(client, limit)
+    assert ids == [row.id for row in tied_applications]
+    assert pages == len(tied_applications) // limit + 1
+
+
+def test_filtered_pages_cover_the_filtered_rows(client, db, tied_applications):
+    rejected = [row.id for row in tied_applications][::2]
+    db.query(LoanApplication).filter(LoanApplication.id.in_(rejected)).update(
+        {LoanApplication.status: "rejected"}, synchronize_session=False
+    )
+    db.commit()
+    ids, _ = walk_pages(client, 4, status="rejected")
+    assert ids == rejected
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/v1/loans/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,99 @@
+import logging
+import queue
+import threading
+
+import pytest
+
+from app.core import audit as audit_module
+from app.core.audit import AuditQueueHandler, SystemLogWriter
+from app.db.models import SystemLog
+
+
+@pytest.fixture
+def trail():
+    """A private queue, handler, writer and logger, so tests do not share the app's writer"""
+    event_queue = queue.Queue(maxsize=100)
+    handler = AuditQueueHandler(event_queue)
+    writer = SystemLogWriter(event_queue, batch_size=10, flush_interval_ms=20)
+    logger = logging.getLogger(f"esubu.audit.test.{id(writer)}")
+    logger.addHandler(handler)
+    logger.propagate = False
+    yield handler, writer, logger
+    writer.stop()
+    logger.removeHandler(handler)
+
+
+def stored_actions(db):
+    db.expire_all()
+    return [action for (action,) in db.query(SystemLog.action).order_by(SystemLog.id)]
+
+
+def test_events_are_written_in_batches(db, trail):
+    handler, writer, logger = trail
+    writer.start()
+    for n in range(25):
+        logger.info(f"EVENT_{n}", extra={"user_id": None, "details": str(n), "ip_address": "10.0.0.1"})
+    writer.stop()
+
+    assert stored_actions(db) == [f"EVENT_{n}" for n in range(25)]
+    assert writer.written == 25
+    assert 3 <= writer.batches < 25
+    row = db.query(SystemLog).filter(SystemLog.action == "EVENT_7").one()
+    assert (row.details, row.ip_address) == ("7", "10.0.0.1")
+
+
+def test_stop_flushes_events_queued_behind_it(db, trail):
+    handler, writer, logger = trail
+    # Queued before the writer ever runs, then drained by start and stop
+    for n in range(5):
+        logger.info(f"EVENT_{n}")
+    writer.start()
+    writer.stop()
+    assert stored_actions(db) == [f"EVENT_{n}" for n in range(5)]
+
+
+def test_a_full_queue_drops_events_instead_of_blocking(trail):
+    handler, writer, logger = trail
+    for n in range(handler.queue.maxsize + 7):
+        logger.info(f"EVENT_{n}")
+    assert handler.dropped == 7
+
+
+def test_stopped_writer_is_not_restarted_by_racing_callers(trail):
+    handler, writer, logger = trail
+    for _ in range(20):
+        writer.start()
+        racing = threading.Event()
+        done = threading.Event()
+
+        def hammer():
+            while not done.is_set():
+                writer.ensure_running()
+                racing.set()
+
+        thread = threading.Thread(target=hammer)
+        thread.start()
+        racing.wait()
+        writer.stop()
+        # Callers racing the stop may not bring a writer back
+        assert not writer.running
+        assert writer.ensure_running() is False
+        done.set()
+        thread.join()
+        assert not writer.running
+
+    # An explicit start re-arms it
+    writer.start()
+    assert writer.running and writer.ensure_running()
+
+
+def test_audit_drops_events_while_the_app_writer_is_stopped(monkeypatch, trail):
+    handler, writer, logger = trail
+    monkeypatch.setattr(audit_module, "audit_writer", writer)
+    monkeypatch.setattr(audit_module, "audit_handler", handler)
+    writer.start()
+    writer.stop()
+
+    audit_module.audit("LOGIN_SUCCESS", details="after shutdown")
+    assert handler.dropped == 1
+    assert handler.queue.qsize() == 0
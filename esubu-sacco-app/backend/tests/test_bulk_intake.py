@@ -0,0 +1,61 @@
+from app.core.config import settings
+from app.crud import loan_application as loan_crud
+from app.db.models import ApplicationCounter, LoanApplication
+from app.schemas.loan_application import LoanApplicationCreate
+from benchmarks.synthetic import synthetic_loan_applications
+
+
+def test_partial_failures_are_reported_at_their_positions(client, db):
+    records = synthetic_loan_applications(6)
+    del records[1]["monthly_income"]
+    records[4]["email"] = "not-an-email"
+
+    response = client.post("/api/v1/loans/bulk", json={"applications": records})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (4, 2)
+    assert [result["index"] for result in body["results"]] == list(range(6))
+
+    failed = {result["index"]: result for result in body["results"] if result["errors"]}
+    assert set(failed) == {1, 4}
+    assert [error["field"] for error in failed[1]["errors"]] == ["monthly_income"]
+    assert [error["field"] for error in failed[4]["errors"]] == ["email"]
+    assert all(failed[index]["id"] is None for index in failed)
+
+    stored = {application.id: application for application in db.query(LoanApplication)}
+    assert len(stored) == 4
+    for result in body["results"]:
+        if result["index"] in failed:
+            continue
+        application = stored[result["id"]]
+        # Each result describes the record submitted at its own position
+        assert application.id_number == records[result["index"]]["id_number"]
+        assert application.application_number == result["application_number"]
+        assert application.system_decision == result["system_decision"]
+
+
+def test_scores_match_the_single_record_path(client):
+    records = synthetic_loan_applications(20)
+    body = client.post("/api/v1/loans/bulk", json={"applications": records}).json()
+    for record, result in zip(records, body["results"]):
+        assert result["credit_score"] == loan_crud.calculate_credit_score(record)
+
+
+def test_batches_over_the_cap_are_refused(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INTAKE_MAX_ROWS", 3)
+    response = client.post("/api/v1/loans/bulk", json={"applications": synthetic_loan_applications(4)})
+    assert response.status_code == 413
+    assert db.query(LoanApplication).count() == 0
+
+    response = client.post("/api/v1/loans/bulk", json={"applications": synthetic_loan_applications(3)})
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+
+def test_bulk_creates_keep_the_counters_exact(db):
+    loan_crud.create_loan_applications(
+        db, [LoanApplicationCreate(**payload) for payload in synthetic_loan_applications(25)]
+    )
+    maintained = {key: value for key, value in db.query(ApplicationCounter.key, ApplicationCounter.value) if value}
+    assert maintained == {key: value for key, value in loan_crud.count_applications(db).items() if value}
+    assert maintained[loan_crud.TOTAL_COUNTER] == 25
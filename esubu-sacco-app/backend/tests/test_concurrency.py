@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.security import get_current_user
+from app.crud import loan_application as loan_crud
+from app.main import app as api
+
+# How long each stats query holds its worker thread
+QUERY_SECONDS = 0.3
+BUSY_REQUESTS = 10
+
+
+@pytest.fixture
+def slow_stats(monkeypatch):
+    get_application_stats = loan_crud.get_application_stats
+
+    def slow_get_application_stats(db):
+        # Blocking, like a query waiting on the database
+        time.sleep(QUERY_SECONDS)
+        return get_application_stats(db)
+
+    monkeypatch.setattr(loan_crud, "get_application_stats", slow_get_application_stats)
+
+
+async def saturate_and_probe():
+    """BUSY_REQUESTS concurrent stats requests and a /health probe sent while they run.
+
+    Returns the responses, and when /health answered and the last stats
+    request finished, in seconds since the burst started.
+    """
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        start = time.perf_counter()
+        busy = [asyncio.create_task(http.get("/api/v1/loans/stats")) for _ in range(BUSY_REQUESTS)]
+        await asyncio.sleep(0.05)
+        health = await http.get("/health")
+        health_answered = time.perf_counter() - start
+        responses = await asyncio.gather(*busy)
+        return responses, health, health_answered, time.perf_counter() - start
+
+
+def test_health_answers_while_database_routes_are_busy(admin, slow_stats):
+    api.dependency_overrides[get_current_user] = lambda: admin
+    try:
+        responses, health, health_answered, elapsed = asyncio.run(saturate_and_probe())
+    finally:
+        api.dependency_overrides.pop(get_current_user, None)
+
+    assert [response.status_code for response in responses] == [200] * BUSY_REQUESTS
+    assert health.status_code == 200
+    # The event loop is free: /health does not queue behind the blocking queries
+    assert health_answered < QUERY_SECONDS
+    # And the queries overlap on worker threads instead of running one after another
+    assert elapsed < BUSY_REQUESTS * QUERY_SECONDS / 2
@@ -0,0 +1,32 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import auth as auth_api
+from app.main import app as api
+from scoring.admission import LoginAdmission
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    """Two attempts per user, then one a minute"""
+    admission = LoginAdmission(user_rate=1, user_burst=2, ip_rate=60, ip_burst=100, max_concurrent=4)
+    monkeypatch.setattr(auth_api, "login_admission", admission)
+    return admission
+
+
+def login(http, email):
+    return http.post("/api/v1/auth/login", json={"email": email, "password": "guess"})
+
+
+def test_attempts_over_the_limit_get_429_with_retry_after(admission):
+    with TestClient(api) as http:
+        # Unknown accounts are refused without hashing, so no bcrypt backend is needed
+        assert [login(http, "nobody@example.com").status_code for _ in range(2)] == [401, 401]
+        throttled = login(http, "nobody@example.com")
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "60"
+        # Other accounts keep their own budget
+        assert login(http, "someone@example.com").status_code == 401
+
+    stats = admission.stats()
+    assert (stats["admitted"], stats["rejected_user"]) == (3, 1)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.api import admin as admin_api
+from app.core import security
+from app.core.security import PasswordHasher, PasswordHasherBusy, get_current_user
+from app.main import app as api
+
+# Stand-in for a bcrypt hash at production cost
+HASH_SECONDS = 0.2
+
+
+def slow_hash(password):
+    time.sleep(HASH_SECONDS)
+    return f"hashed:{password}"
+
+
+def failing_hash(password):
+    raise ValueError("bad salt")
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    """One worker and no queue, so a second concurrent hash is refused"""
+    hasher = PasswordHasher(workers=1, max_queue=0)
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+    monkeypatch.setattr(admin_api, "password_hasher", hasher)
+    return hasher
+
+
+def new_user(number):
+    return {
+        "email": f"officer{number}@example.com", "full_name": f"Officer {number}",
+        "password": "correct horse", "role": "officer",
+    }
+
+
+async def create_users_concurrently(count):
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        return await asyncio.gather(*(http.post("/api/v1/admin/users/", json=new_user(n)) for n in range(count)))
+
+
+def test_busy_hasher_answers_503_with_retry_after(admin, hasher):
+    api.dependency_overrides[get_current_user] = lambda: admin
+    try:
+        responses = asyncio.run(create_users_concurrently(2))
+    finally:
+        api.dependency_overrides.pop(get_current_user, None)
+
+    assert sorted(response.status_code for response in responses) == [200, 503]
+    refused = next(response for response in responses if response.status_code == 503)
+    assert refused.headers["Retry-After"] == "1"
+    stats = hasher.stats()
+    assert (stats["completed"], stats["failed"], stats["rejected"], stats["in_flight"]) == (1, 0, 1, 0)
+
+
+def test_failed_hashes_are_not_counted_as_completed(monkeypatch, hasher):
+    monkeypatch.setattr(security, "get_password_hash", failing_hash)
+    with pytest.raises(ValueError):
+        asyncio.run(hasher.hash("secret"))
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+    assert asyncio.run(hasher.hash("secret")) == "hashed:secret"
+
+    stats = hasher.stats()
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (1, 1, 0)
+    assert stats["hash_time"]["count"] == 2
+
+
+def test_rejection_leaves_the_running_hash_alone(hasher):
+    async def hash_twice():
+        first = asyncio.create_task(hasher.hash("first"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("second")
+        return await first
+
+    assert asyncio.run(hash_twice()) == "hashed:first"
+    stats = hasher.stats()
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (1, 0, 1)
@@ -0,0 +1,73 @@
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.db.models import User
+from scoring.passwords import hash_cost
+
+
+@pytest.fixture
+def rounds(monkeypatch):
+    """Sets the configured bcrypt cost, dropping the per-process cost and context"""
+    def set_rounds(value):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", value)
+        security.bcrypt_rounds.cache_clear()
+        security._pwd_context.cache_clear()
+
+    yield set_rounds
+    security.bcrypt_rounds.cache_clear()
+    security._pwd_context.cache_clear()
+
+
+@pytest.fixture
+def passlib_bcrypt(rounds):
+    rounds(4)
+    try:
+        security.get_password_hash("probe")
+    except (ValueError, AttributeError) as e:
+        # passlib 1.7.4 cannot drive bcrypt >= 4.1; requirements_simple.txt pins 4.0.1
+        pytest.skip(f"passlib's bcrypt backend is unusable here: {e}")
+
+
+def test_cost_is_calibrated_once_on_first_use(monkeypatch, rounds):
+    calls = []
+
+    def resolve_rounds(configured, target_ms):
+        calls.append((configured, target_ms))
+        return 11
+
+    monkeypatch.setattr(security, "resolve_rounds", resolve_rounds)
+    rounds(0)
+    assert calls == []
+    assert security.password_needs_rehash("$2b$10$" + "a" * 53)
+    assert not security.password_needs_rehash("$2b$11$" + "a" * 53)
+    assert calls == [(0, settings.BCRYPT_TARGET_MS)]
+
+
+def test_login_rehashes_a_password_made_at_another_cost(client, db, rounds, passlib_bcrypt):
+    rounds(5)
+    user = User(email="officer@example.com", hashed_password=security.get_password_hash("correct horse"),
+                full_name="Officer", role="officer")
+    db.add(user)
+    db.commit()
+    rounds(4)
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": "correct horse"})
+    assert response.status_code == 200
+    db.refresh(user)
+    assert hash_cost(user.hashed_password) == 4
+    assert security.verify_password("correct horse", user.hashed_password)
+
+
+def test_failed_login_keeps_the_stored_hash(client, db, rounds, passlib_bcrypt):
+    rounds(5)
+    stored = security.get_password_hash("correct horse")
+    user = User(email="officer@example.com", hashed_password=stored, full_name="Officer", role="officer")
+    db.add(user)
+    db.commit()
+    rounds(4)
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": "wrong"})
+    assert response.status_code == 401
+    db.refresh(user)
+    assert user.hashed_password == stored
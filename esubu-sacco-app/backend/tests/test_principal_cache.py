@@ -0,0 +1,106 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.security import Principal, PrincipalCache, create_access_token, principal_cache
+from app.db.models import User
+from app.main import app as api
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def users(db):
+    """An admin and an officer, each with a bearer token, and an empty principal cache"""
+    principal_cache.clear()
+    admin = User(email="chief@example.com", hashed_password="-", full_name="Chief", role="admin")
+    officer = User(email="officer@example.com", hashed_password="-", full_name="Officer", role="officer")
+    db.add_all([admin, officer])
+    db.commit()
+    yield {
+        user.role: (user, {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"})
+        for user in (admin, officer)
+    }
+    principal_cache.clear()
+
+
+@pytest.fixture
+def http():
+    """Client that authenticates with real tokens rather than the conftest override"""
+    with TestClient(api) as client:
+        yield client
+
+
+def test_principals_are_served_from_the_cache(http, users):
+    _, officer_auth = users["officer"]
+    before = principal_cache.stats()
+    for _ in range(3):
+        assert http.get("/api/v1/auth/me", headers=officer_auth).json()["role"] == "officer"
+    after = principal_cache.stats()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 2)
+
+
+def test_role_changes_take_effect_on_the_next_request(http, users):
+    (officer, officer_auth), (_, admin_auth) = users["officer"], users["admin"]
+    assert http.get("/api/v1/admin/users/", headers=officer_auth).status_code == 403
+
+    response = http.put(f"/api/v1/admin/users/{officer.id}", json={"role": "admin"}, headers=admin_auth)
+    assert response.status_code == 200
+    assert http.get("/api/v1/admin/users/", headers=officer_auth).status_code == 200
+
+
+def test_deactivated_users_are_rejected_at_once(http, users):
+    (officer, officer_auth), (_, admin_auth) = users["officer"], users["admin"]
+    assert http.get("/api/v1/auth/me", headers=officer_auth).status_code == 200
+
+    assert http.delete(f"/api/v1/admin/users/{officer.id}", headers=admin_auth).status_code == 200
+    response = http.get("/api/v1/auth/me", headers=officer_auth)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_inactive_users_are_never_cached(http, db, users):
+    officer, officer_auth = users["officer"]
+    officer.is_active = False
+    db.commit()
+    for _ in range(2):
+        assert http.get("/api/v1/auth/me", headers=officer_auth).status_code == 401
+    assert principal_cache.get(officer.email) is None
+
+
+def test_tokens_for_a_changed_email_stop_working(http, users):
+    (officer, officer_auth), (_, admin_auth) = users["officer"], users["admin"]
+    assert http.get("/api/v1/auth/me", headers=officer_auth).status_code == 200
+
+    http.put(f"/api/v1/admin/users/{officer.id}", json={"email": "renamed@example.com"}, headers=admin_auth)
+    response = http.get("/api/v1/auth/me", headers=officer_auth)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "User not found"
+
+
+def test_entries_expire_and_are_evicted_least_recently_used(monkeypatch, users):
+    clock = Clock()
+    monkeypatch.setattr(security.time, "monotonic", clock)
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    principal = Principal(users["officer"][0])
+
+    for subject in ("a", "b"):
+        cache.put(subject, principal)
+    cache.get("a")
+    cache.put("c", principal)
+    assert cache.get("b") is None
+    assert cache.get("a") is principal
+
+    clock.now += 61
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 1
+
+    disabled = PrincipalCache(max_entries=0, ttl_seconds=60)
+    disabled.put("a", principal)
+    assert disabled.get("a") is None
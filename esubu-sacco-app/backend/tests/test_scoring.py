@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+from app.api import scoring as scoring_api
+from app.core.security import get_current_user
+from app.main import app as api
+from app.services.scoring import MicroBatcher, get_pipeline, score_results
+
+APPLICANT = {
+    "Age": 35, "Monthly_Income_KES": 45000, "Employment_Status": "Informal", "Region_Type": "Semi-Urban",
+    "Mobile_Money_Score": 70, "Past_Loan_Default": 0,
+}
+
+
+def expected(features):
+    pipeline = get_pipeline()
+    row = pipeline.transform_row(features)
+    probs = pipeline.predict_proba(row.reshape(1, -1))
+    return score_results(probs, np.asarray([features["Monthly_Income_KES"]], dtype=np.float64))[0]
+
+
+def score(client, features):
+    return client.post("/api/v1/score/", json={"features": features})
+
+
+def test_scores_one_applicant(client):
+    response = score(client, APPLICANT)
+    assert response.status_code == 200
+    assert response.json() == expected(APPLICANT)
+
+
+@pytest.mark.parametrize("name, value", [("Age", "thirty-five"), ("Region_Type", 2)])
+def test_mistyped_features_are_rejected_with_422(client, name, value):
+    response = score(client, dict(APPLICANT, **{name: value}))
+    assert response.status_code == 422
+    assert name in response.json()["detail"]
+
+
+def test_unknown_features_are_rejected_with_422(client):
+    response = score(client, dict(APPLICANT, Shoe_Size=42))
+    assert response.status_code == 422
+    assert "Shoe_Size" in response.json()["detail"]
+
+
+async def score_concurrently(requests):
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        return await asyncio.gather(*(http.post("/api/v1/score/", json={"features": f}) for f in requests))
+
+
+def test_a_mistyped_request_does_not_fail_the_batch_it_joins(admin, monkeypatch):
+    batcher = MicroBatcher(max_rows=64, max_wait_ms=50)
+    monkeypatch.setattr(scoring_api, "batcher", batcher)
+    applicants = [dict(APPLICANT, Monthly_Income_KES=20000 + 5000 * n, Age=25 + n) for n in range(6)]
+    requests = applicants[:3] + [dict(APPLICANT, Age="old")] + applicants[3:]
+
+    api.dependency_overrides[get_current_user] = lambda: admin
+    try:
+        responses = asyncio.run(score_concurrently(requests))
+    finally:
+        api.dependency_overrides.pop(get_current_user, None)
+
+    assert [response.status_code for response in responses] == [200] * 3 + [422] + [200] * 3
+    scored = [response.json() for response in responses if response.status_code == 200]
+    assert scored == [expected(applicant) for applicant in applicants]
+    # The valid requests shared model calls
+    assert batcher.rows == 6
+    assert batcher.batches < 6
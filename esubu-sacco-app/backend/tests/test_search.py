@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.config import settings
+from app.crud import loan_application as loan_crud
+from app.db import search_index
+from app.db.models import LoanApplication
+from app.schemas.loan_application import LoanApplicationCreate
+from benchmarks.synthetic import synthetic_loan_applications
+
+NAMES = [
+    "Esbon Kiprono", "John Kamau", "Mary Wanjiru", "John Otieno Kamau", "Grace Achieng",
+    "Peter Mwangi", "Jane Kamau", "Johnson Ouma",
+]
+
+
+@pytest.fixture
+def applications(db):
+    assert search_index.enabled
+    created = []
+    for payload, name in zip(synthetic_loan_applications(len(NAMES)), NAMES):
+        payload["full_name"] = name
+        created.append(loan_crud.create_loan_application(db, LoanApplicationCreate(**payload)))
+    return {application.full_name: application for application in created}
+
+
+def search(client, q, **params):
+    response = client.get("/api/v1/loans/search", params=dict(params, q=q))
+    assert response.status_code == 200
+    return [result["full_name"] for result in response.json()], response.headers["X-Search-Truncated"]
+
+
+def test_numbers_are_looked_up_by_prefix(client, applications):
+    application = applications["Mary Wanjiru"]
+    names, _ = search(client, application.application_number)
+    assert names == ["Mary Wanjiru"]
+    assert search(client, application.application_number.lower())[0] == ["Mary Wanjiru"]
+    assert search(client, application.id_number)[0] == ["Mary Wanjiru"]
+    # A shared ID number prefix matches all of them, in number order
+    names, _ = search(client, application.id_number[:-1])
+    assert names == NAMES
+
+
+def test_esb_prefix_finds_application_numbers(client, applications):
+    names, _ = search(client, "ESB", limit=100)
+    assert sorted(names) == sorted(NAMES)
+
+
+def test_esb_prefixed_names_fall_back_to_name_search(client, applications):
+    assert search(client, "Esbon") == (["Esbon Kiprono"], "false")
+    assert search(client, "esbon kip") == (["Esbon Kiprono"], "false")
+
+
+def test_names_match_every_token_best_first(client, applications):
+    names, truncated = search(client, "john kamau")
+    assert names[0] == "John Kamau"
+    assert sorted(names) == ["John Kamau", "John Otieno Kamau"]
+    assert truncated == "false"
+    # Prefixes expand; "john" also matches "Johnson"
+    assert sorted(search(client, "joh")[0]) == ["John Kamau", "John Otieno Kamau", "Johnson Ouma"]
+
+
+def test_search_index_follows_updates_and_deletes(client, db, applications):
+    application = applications["Grace Achieng"]
+    application.full_name = "Grace Njeri"
+    db.commit()
+    assert search(client, "achieng")[0] == []
+    assert search(client, "njeri")[0] == ["Grace Njeri"]
+
+    db.delete(application)
+    db.commit()
+    assert search(client, "grace")[0] == []
+
+
+def test_search_index_sees_writes_outside_the_orm(client, db, applications):
+    db.query(LoanApplication).filter(LoanApplication.full_name == "Peter Mwangi").update(
+        {LoanApplication.full_name: "Peter Wekesa"}, synchronize_session=False
+    )
+    db.commit()
+    assert search(client, "wekesa")[0] == ["Peter Wekesa"]
+    assert search(client, "mwangi")[0] == []
+
+
+def test_ranking_beyond_the_window_is_flagged(client, applications, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_RANK_WINDOW", 2)
+    names, truncated = search(client, "kamau")
+    # Only the newest two of the three Kamaus were ranked
+    assert sorted(names) == ["Jane Kamau", "John Otieno Kamau"]
+    assert truncated == "true"
+    assert search(client, "john kamau") == (["John Kamau", "John Otieno Kamau"], "false")
+
+
+def test_paging_stops_at_the_result_cap(client, applications, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_MAX_RESULTS", 3)
+    assert len(search(client, "ESB", limit=10)[0]) == 3
+    assert search(client, "ESB", skip=3)[0] == []
@@ -0,0 +1,33 @@
+import pytest
+
+from app.core.timing import profiler
+from benchmarks.synthetic import synthetic_loan_applications
+
+
+@pytest.fixture
+def timings(client):
+    """Stage timing switched on and cleared through the admin endpoint, and off again afterwards"""
+    enabled = profiler.enabled
+    assert client.put("/api/v1/admin/system/timings", params={"enabled": True, "reset": True}).json() == {
+        "enabled": True
+    }
+    yield
+    profiler.enabled = enabled
+    profiler.reset()
+
+
+def test_application_stages_are_timed_when_switched_on(client, timings):
+    for payload in synthetic_loan_applications(3):
+        assert client.post("/api/v1/loans/", json=payload).status_code == 200
+
+    body = client.get("/api/v1/admin/system/timings").json()
+    assert body["enabled"] is True
+    stages = body["timings"]["create_loan_application"]
+    assert list(stages) == ["application_number", "credit_score", "decision", "insert", "refresh", "total"]
+    assert all(summary["count"] == 3 for summary in stages.values())
+
+
+def test_nothing_is_recorded_when_switched_off(client, timings):
+    client.put("/api/v1/admin/system/timings", params={"enabled": False, "reset": True})
+    client.post("/api/v1/loans/", json=synthetic_loan_applications(1)[0])
+    assert client.get("/api/v1/admin/system/timings").json()["timings"] == {}
@@ -10,6 +10,7 @@ const AdminDashboard: React.FC = () => {
   const [dashboardData, setDashboardData] = useState<AdminDashboardData | null>(null);
   const [users, setUsers] = useState<User[]>([]);
   const [applications, setApplications] = useState<LoanApplication[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState<'overview' | 'users' | 'applications' | 'reports'>('overview');
   
@@ -48,10 +49,12 @@ const AdminDashboard: React.FC = () => {
     }
   };
 
-  const fetchApplications = async () => {
+  const fetchApplications = async (cursor?: string) => {
     try {
-      const response = await loanAPI.getApplications({ limit: 100 });
-      setApplications(response.data);
+      const response = await loanAPI.getApplications({ limit: 100, cursor });
+      const { items, next_cursor } = response.data;
+      setApplications((current) => (cursor ? [...current, ...items] : items));
+      setNextCursor(next_cursor);
     } catch (error) {
       console.error('Error fetching applications:', error);
     }
@@ -477,6 +480,14 @@ const AdminDashboard: React.FC = () => {
                     </tbody>
                   </table>
                 </div>
+
+                {nextCursor && (
+                  <div style={{ textAlign: 'center', padding: '20px' }}>
+                    <button onClick={() => fetchApplications(nextCursor)} className="btn btn-outline">
+                      Load More
+                    </button>
+                  </div>
+                )}
               </div>
             )}
 
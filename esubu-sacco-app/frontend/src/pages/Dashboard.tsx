@@ -10,6 +10,7 @@ const Dashboard: React.FC = () => {
   
   const [stats, setStats] = useState<ApplicationStats | null>(null);
   const [applications, setApplications] = useState<LoanApplication[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
@@ -39,15 +40,17 @@ const Dashboard: React.FC = () => {
     }
   };
 
-  const fetchApplications = async () => {
+  const fetchApplications = async (cursor?: string) => {
     try {
       const response = await loanAPI.getApplications({
-        skip: 0,
         limit: 50,
+        cursor,
         status: statusFilter || undefined,
         decision: decisionFilter || undefined,
       });
-      setApplications(response.data);
+      const { items, next_cursor } = response.data;
+      setApplications((current) => (cursor ? [...current, ...items] : items));
+      setNextCursor(next_cursor);
     } catch (error) {
       console.error('Error fetching applications:', error);
     }
@@ -62,6 +65,7 @@ const Dashboard: React.FC = () => {
     try {
       const response = await loanAPI.searchApplications(searchTerm);
       setApplications(response.data);
+      setNextCursor(null);
     } catch (error) {
       console.error('Error searching applications:', error);
     }
@@ -287,6 +291,14 @@ const Dashboard: React.FC = () => {
                   <p>No applications found.</p>
                 </div>
               )}
+
+              {nextCursor && (
+                <div style={{ textAlign: 'center', padding: '20px' }}>
+                  <button onClick={() => fetchApplications(nextCursor)} className="btn btn-outline">
+                    Load More
+                  </button>
+                </div>
+              )}
             </div>
           </div>
         </div>
@@ -3,6 +3,7 @@ import {
   User,
   LoanApplication,
   LoanApplicationWithRemarks,
+  LoanApplicationPage,
   ApplicationStats,
   DashboardData,
   AdminDashboardData,
@@ -63,11 +64,11 @@ export const loanAPI = {
     api.post('/api/v1/loans/', application),
   
   getApplications: (params?: {
-    skip?: number;
     limit?: number;
+    cursor?: string;
     status?: string;
     decision?: string;
-  }): Promise<AxiosResponse<LoanApplication[]>> =>
+  }): Promise<AxiosResponse<LoanApplicationPage>> =>
     api.get('/api/v1/loans/', { params }),
   
   getApplication: (id: number): Promise<AxiosResponse<LoanApplicationWithRemarks>> =>
@@ -63,6 +63,11 @@ export interface LoanApplicationWithRemarks extends LoanApplication {
   remarks: ApplicationRemark[];
 }
 
+export interface LoanApplicationPage {
+  items: LoanApplication[];
+  next_cursor: string | null;
+}
+
 export interface ApplicationStats {
   total: number;
   pending: number;
@@ -0,0 +1,6 @@
+from scoring.schema import FEATURE_NAMES, FeatureSchema, get_feature_schema
+from scoring.decisions import (
+    APPROVED, DECISION_LABELS, REJECTED, REVIEW, decision_codes, decision_engine_arrays,
+    estimate_loan_amounts, generate_messages, map_probabilities_to_scores
+)
+from scoring.pipeline import InferencePipeline, PipelineError, get_inference_pipeline
@@ -0,0 +1,149 @@
+"""Admission control for bcrypt-heavy login endpoints.
+
+    admission = LoginAdmission(user_rate=5, user_burst=5, ip_rate=30, ip_burst=20, max_concurrent=4)
+    with admission.admit(username, ip):     # raises LoginThrottled
+        ok = verify_password(password, stored_hash)
+
+Every attempt takes a token from its user's and its client address's
+bucket (rates are attempts per minute), and at most max_concurrent
+verifications run at once. Anything over a limit is refused before any
+hashing happens; the counters record how many attempts were shed and
+estimate the CPU time that saved from the measured verification cost.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from scoring.timing import Histogram
+
+USER, IP, BUSY = 'user', 'ip', 'busy'
+
+
+class LoginThrottled(Exception):
+    """Raised when a login attempt is refused before verification"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Login throttled ({reason}); retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """Per-key token buckets, bounded to the max_keys most recently used keys"""
+
+    def __init__(self, rate_per_minute, burst, max_keys=10000):
+        self.rate = float(rate_per_minute) / 60.0
+        self.burst = float(burst)
+        self.max_keys = int(max_keys)
+        # key -> (tokens, last refill time)
+        self._buckets = OrderedDict()
+
+    def _tokens(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.burst
+        tokens, updated = bucket
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def wait_time(self, key, now):
+        """Seconds until key has a whole token (0.0 when one is available now)"""
+        if self.burst <= 0:
+            return 0.0
+        tokens = self._tokens(key, now)
+        if tokens >= 1.0:
+            return 0.0
+        return (1.0 - tokens) / self.rate if self.rate > 0 else math.inf
+
+    def take(self, key, now):
+        if self.burst <= 0:
+            return
+        self._buckets[key] = (self._tokens(key, now) - 1.0, now)
+        self._buckets.move_to_end(key)
+        # Forgetting a key resets it to a full bucket, so evict the least recently used only
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class LoginAdmission:
+    """Per-user and per-address rate limits plus a global cap on concurrent verifications.
+
+    A burst of 0 disables that bucket; max_concurrent of 0 disables the cap.
+    Limits are per process: each worker process enforces its own.
+    """
+
+    def __init__(self, user_rate, user_burst, ip_rate, ip_burst, max_concurrent, max_keys=10000):
+        self.users = TokenBuckets(user_rate, user_burst, max_keys)
+        self.ips = TokenBuckets(ip_rate, ip_burst, max_keys)
+        self.max_concurrent = int(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = {USER: 0, IP: 0, BUSY: 0}
+        self.verify_time = Histogram()
+
+    def _retry_after(self, seconds):
+        return max(1, math.ceil(seconds)) if math.isfinite(seconds) else 60
+
+    def _check(self, username, ip, now):
+        """Reason and wait for refusing this attempt, or None to admit it"""
+        wait = self.users.wait_time(username, now)
+        if wait > 0:
+            return USER, wait
+        if ip is not None:
+            wait = self.ips.wait_time(ip, now)
+            if wait > 0:
+                return IP, wait
+        if self.max_concurrent > 0 and self.in_flight >= self.max_concurrent:
+            # Slots free up at roughly the pace of one verification
+            return BUSY, self.verify_time.total / self.verify_time.count if self.verify_time.count else 1.0
+        return None
+
+    @contextmanager
+    def admit(self, username, ip=None):
+        """Hold a verification slot for one login attempt, or raise LoginThrottled"""
+        username = (username or '').strip().lower()
+        now = time.monotonic()
+        with self._lock:
+            refusal = self._check(username, ip, now)
+            if refusal is not None:
+                reason, wait = refusal
+                self.rejected[reason] += 1
+                raise LoginThrottled(reason, self._retry_after(wait))
+            self.users.take(username, now)
+            if ip is not None:
+                self.ips.take(ip, now)
+            self.in_flight += 1
+            self.admitted += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.verify_time.record(elapsed)
+
+    def stats(self):
+        with self._lock:
+            rejected = sum(self.rejected.values())
+            mean_verify = self.verify_time.total / self.verify_time.count if self.verify_time.count else 0.0
+            return {
+                'admitted': self.admitted,
+                'rejected': rejected,
+                'rejected_user': self.rejected[USER],
+                'rejected_ip': self.rejected[IP],
+                'rejected_busy': self.rejected[BUSY],
+                'in_flight': self.in_flight,
+                'max_concurrent': self.max_concurrent,
+                'tracked_users': len(self.users),
+                'tracked_ips': len(self.ips),
+                'verify_time': self.verify_time.summary(),
+                # Hashing work not done because the attempt was refused up front
+                'shed_cpu_seconds': rejected * mean_verify,
+            }
@@ -0,0 +1,228 @@
+"""Memory-mapped model artifact format.
+
+Layout: 8-byte magic, little-endian uint64 header length, a JSON header,
+then each array's raw bytes at a 64-byte aligned offset. Arrays are
+exposed as read-only views over a shared mmap, so every worker process
+on a host scores from the same page-cached copy of the ensemble. The
+arrays hold the compiled layout from scoring.compiled.
+
+Convert a pickled model with:
+
+    python -m scoring.artifact credit_scoring_stacked_model.pkl credit_scoring_stacked_model.esb [PIPELINE.pkl]
+
+The optional preprocessing pipeline is stored as a spec in the header
+(see scoring.pipeline) so it is validated and applied without sklearn.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from scoring.compiled import build_compiled_ensemble
+from scoring.schema import FEATURE_NAMES
+
+MAGIC = b'ESBMODEL'
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+_LENGTH = struct.Struct('<Q')
+
+
+class ArtifactError(ValueError):
+    """Raised when an artifact is malformed, from another format version, or for another schema"""
+
+
+def file_digest(path):
+    """sha256 of a file, used as the model version in artifact headers"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_artifact(path, arrays, meta, model_version, feature_names=FEATURE_NAMES, preprocessing=None):
+    """Write exported ensemble arrays, meta and optional preprocessing spec to path in the artifact format"""
+    manifest, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        manifest[name] = {
+            'dtype': array.dtype.str, 'shape': list(array.shape),
+            'offset': offset, 'nbytes': array.nbytes,
+        }
+        offset = _aligned(offset + array.nbytes)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'model_version': model_version,
+        'created_at': datetime.now().isoformat(),
+        'feature_schema': {'feature_names': [str(name) for name in feature_names]},
+        'ensemble': meta,
+        'preprocessing': preprocessing,
+        'arrays': manifest,
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + _LENGTH.size + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - len(MAGIC) - _LENGTH.size, b' ')
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + manifest[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+    # Atomic swap so running workers never map a half-written file
+    os.replace(tmp_path, path)
+
+
+class ModelArtifact:
+    """A loaded artifact: validated header plus zero-copy array views over the mapping"""
+
+    def __init__(self, path, expected_features=FEATURE_NAMES, expected_version=None):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ArtifactError(f"{path} is not a model artifact")
+        (header_length,) = _LENGTH.unpack_from(self._mmap, len(MAGIC))
+        data_start = len(MAGIC) + _LENGTH.size + header_length
+        self.header = json.loads(self._mmap[len(MAGIC) + _LENGTH.size:data_start])
+
+        if self.header.get('format_version') != FORMAT_VERSION:
+            raise ArtifactError(
+                f"{path} has format version {self.header.get('format_version')}, expected {FORMAT_VERSION}"
+            )
+        if expected_version is not None and self.header.get('model_version') != expected_version:
+            raise ArtifactError(f"{path} was converted from a different model file")
+        feature_names = self.header['feature_schema']['feature_names']
+        if expected_features is not None and list(feature_names) != [str(name) for name in expected_features]:
+            raise ArtifactError(f"{path} feature schema does not match the application's features")
+
+        self.arrays = {
+            name: np.frombuffer(
+                self._mmap, dtype=np.dtype(spec['dtype']),
+                count=int(np.prod(spec['shape'], dtype=np.int64)), offset=data_start + spec['offset']
+            ).reshape(spec['shape'])
+            for name, spec in self.header['arrays'].items()
+        }
+        self.model = build_compiled_ensemble(self.arrays, self.header['ensemble'])
+
+    @property
+    def model_version(self):
+        return self.header['model_version']
+
+    @property
+    def preprocessing(self):
+        """Preprocessing spec stored by the converter, or None"""
+        return self.header.get('preprocessing')
+
+    def warm(self):
+        """Ask the kernel to read the whole file into the shared page cache"""
+        if hasattr(self._mmap, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+            self._mmap.madvise(mmap.MADV_WILLNEED)
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_artifact(path, expected_features=FEATURE_NAMES, expected_version=None):
+    """Load an artifact, reusing this process's mapping while the file is unchanged"""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    key = (stat.st_mtime_ns, stat.st_size, expected_version)
+    with _cache_lock:
+        cached = _cache.get(real_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        artifact = ModelArtifact(real_path, expected_features, expected_version)
+        artifact.warm()
+        _cache[real_path] = (key, artifact)
+        return artifact
+
+
+# ------------------ CONVERTER ------------------
+def convert(model_path, artifact_path, pipeline_path=None):
+    """Export a pickled stacked model to an artifact; returns the source model and the loaded artifact"""
+    import joblib
+    from scoring.compiled import compile_ensemble
+    from scoring.ensemble import build_ensemble, export_stacked_model
+    from scoring.pipeline import InferencePipeline, load_preprocessing_spec
+
+    model = joblib.load(model_path)
+    preprocessing = None
+    if pipeline_path is not None:
+        preprocessing = load_preprocessing_spec(pipeline_path)
+        # Refuse to ship a pipeline whose outputs do not line up with the model
+        InferencePipeline(model, preprocessing)
+    arrays, meta = compile_ensemble(build_ensemble(*export_stacked_model(model)))
+    save_artifact(artifact_path, arrays, meta, file_digest(model_path), meta['feature_names'], preprocessing)
+    return model, ModelArtifact(artifact_path, expected_features=meta['feature_names'])
+
+
+_PROBE = r"""
+import json, sys, time, warnings
+warnings.simplefilter('ignore')
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+with open('/proc/self/status') as f:
+    rss = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+print(json.dumps({{'seconds': elapsed, 'rss_mb': rss / 1024}}))
+"""
+
+
+def _measure(load_source):
+    """Cold load time and resident memory of a fresh interpreter running load_source"""
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(load=load_source)],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (2, 3):
+        print("usage: python -m scoring.artifact MODEL.pkl ARTIFACT.esb [PIPELINE.pkl]", file=sys.stderr)
+        return 2
+    model_path, artifact_path = argv[:2]
+    pipeline_path = argv[2] if len(argv) == 3 else None
+
+    model, artifact = convert(model_path, artifact_path, pipeline_path)
+
+    # Agreement check on a seeded sample before anyone deploys the artifact
+    rng = np.random.default_rng(0)
+    sample = rng.random((1000, artifact.model.n_features_in_)) * 1000
+    max_diff = float(np.abs(model.predict_proba(sample) - artifact.model.predict_proba(sample)).max())
+
+    before = _measure(f"import joblib; joblib.load({model_path!r})")
+    after = _measure(f"from scoring.artifact import load_artifact; load_artifact({artifact_path!r}, None)")
+
+    print(f"Converted {model_path} -> {artifact_path}")
+    print(f"  model version      {artifact.model_version[:16]}")
+    print(f"  preprocessing      {'embedded' if artifact.preprocessing else 'none'}")
+    print(f"  max |prob diff|    {max_diff:.2e}")
+    print(f"  {'':18} {'pickle':>10} {'artifact':>10}")
+    print(f"  {'file size (MB)':18} {os.path.getsize(model_path) / 2**20:10.2f} {os.path.getsize(artifact_path) / 2**20:10.2f}")
+    print(f"  {'cold load (s)':18} {before['seconds']:10.3f} {after['seconds']:10.3f}")
+    print(f"  {'process RSS (MB)':18} {before['rss_mb']:10.1f} {after['rss_mb']:10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Cache of model outputs for repeated applicant rows.
+
+    cache = PredictionCache(max_entries=10000, max_bytes=16 * 2**20, ttl_seconds=3600)
+    probability = cache.get(model, cache.key(row))     # None on a miss
+    cache.put(model, cache.key(row), probability)
+
+Entries are keyed by a 16-byte digest of the finished float64 feature row
+and evicted least-recently-used first once the entry or byte budget is
+reached; each also expires ttl_seconds after it was stored. The cache
+holds only a weak reference to the model its entries were computed with,
+so it never keeps a replaced model alive, and a lookup with any other
+model object clears it before answering.
+"""
+import hashlib
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# Dict slot, OrderedDict links and the (expiry, value) tuple per entry
+_ENTRY_OVERHEAD = 200
+
+
+class PredictionCache:
+    """LRU + TTL cache of model outputs keyed by a hash of the finished feature row.
+
+    Bounded by entry count and approximate memory. Entries belong to one
+    model object; looking up with a different model (e.g. after the
+    artifact is regenerated and reloaded) clears the cache first.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=16 * 2**20, ttl_seconds=3600.0):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._model_ref = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    @staticmethod
+    def key(row):
+        """Stable digest of a float64 feature row; identical inputs give identical keys"""
+        row = row if row.dtype == 'float64' else row.astype('float64')
+        return hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+
+    @staticmethod
+    def _entry_size(key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+
+    def _bind(self, model):
+        """Drop every entry if model is not the one they were computed with"""
+        if self._model_ref is not None and self._model_ref() is model:
+            return
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._nbytes = 0
+        self._model_ref = weakref.ref(model)
+
+    def get(self, model, key):
+        """Cached value for key under model, or None"""
+        with self._lock:
+            self._bind(model)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, model, key, value):
+        size = self._entry_size(key, value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._bind(model)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._nbytes += size
+            while len(self._entries) > self.max_entries or self._nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self._nbytes -= self._entry_size(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
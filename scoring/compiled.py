@@ -0,0 +1,315 @@
+"""Compiled evaluators for the exported stacked ensemble.
+
+Every base learner becomes a table of its distinct (feature, threshold)
+splits plus per-tree split ids in a perfect binary layout (children of
+position p are 2p+1 and 2p+2) and a dense leaf table. Scoring a chunk
+of rows evaluates each distinct split once for all rows, then walks all
+trees together with integer gathers only.
+"""
+import threading
+
+import numpy as np
+
+from scoring.ensemble import (
+    ArrayEnsemble, ObliviousTable, TreeTable, _sigmoid, build_ensemble, build_learner, export_learner,
+    export_stacked_model
+)
+from scoring.schema import get_feature_schema
+
+# Rows per evaluation chunk; keeps the split-decision matrix cache resident
+CHUNK_ROWS = 256
+# Deeper trees would blow up the perfect layout; they keep the reference evaluator
+MAX_COMPILED_DEPTH = 12
+# Oblivious leaf ids are accumulated in uint8
+MAX_OBLIVIOUS_DEPTH = 8
+# Largest probability gap accepted when compiling a model in memory
+TOLERANCE = 1e-6
+# Batches above this go to the native model, which overtakes the compiled
+# evaluator at ~170 rows on the shipped stack (2.5x faster at 10k rows)
+COMPILED_MAX_ROWS = 128
+
+
+class _SplitTable:
+    """Distinct splits shared by all trees of a learner, evaluated once per row"""
+
+    def __init__(self, split_feature, split_threshold, split_missing_right, strict, float32):
+        self.split_feature = split_feature
+        self.split_threshold = split_threshold
+        self.split_missing_right = split_missing_right
+        self.strict = bool(strict)
+        self.float32 = bool(float32)
+        self._any_missing_right = bool(split_missing_right.any())
+
+    def go_right(self, X):
+        """(n_rows, n_splits) uint8 matrix, 1 where the row takes the right branch"""
+        X = X.astype(np.float32) if self.float32 else X
+        x = X[:, self.split_feature]
+        right = x >= self.split_threshold if self.strict else x > self.split_threshold
+        if self._any_missing_right:
+            right |= np.isnan(x) & self.split_missing_right
+        return right.view(np.uint8)
+
+
+class CompiledTrees(_SplitTable):
+    """Binary trees (LightGBM, XGBoost) in a perfect layout over a shared split table"""
+
+    def __init__(self, arrays, depth, strict=False, float32=False, base_margin=0.0, sigmoid=1.0):
+        super().__init__(arrays['split_feature'], arrays['split_threshold'], arrays['split_missing_right'],
+                         strict, float32)
+        self.node_split = arrays['node_split']
+        self.leaf_value = arrays['leaf_value']
+        self.depth = int(depth)
+        self.base_margin = float(base_margin)
+        self.sigmoid = float(sigmoid)
+
+        n_trees, n_internal = self.node_split.shape
+        self._node_split_flat = self.node_split.ravel()
+        self._leaf_value_flat = self.leaf_value.ravel()
+        self._tree_node_base = (np.arange(n_trees, dtype=np.intp) * n_internal)[np.newaxis, :]
+        self._tree_leaf_base = (np.arange(n_trees, dtype=np.intp) * (n_internal + 1) - n_internal)[np.newaxis, :]
+
+    def raw_score(self, X):
+        right = self.go_right(X).ravel()
+        row_base = (np.arange(len(X), dtype=np.intp) * len(self.split_feature))[:, np.newaxis]
+
+        # Indices are in range by construction, so skip take()'s bounds checks
+        position = np.zeros((len(X), self.node_split.shape[0]), dtype=np.intp)
+        for _ in range(self.depth):
+            split = self._node_split_flat.take(self._tree_node_base + position, mode='clip')
+            position = 2 * position + 1 + right.take(row_base + split, mode='clip')
+
+        leaves = self._leaf_value_flat.take(self._tree_leaf_base + position, mode='clip')
+        return leaves.sum(axis=1) + self.base_margin
+
+    def predict(self, X):
+        return _sigmoid(self.sigmoid * self.raw_score(X))
+
+
+class CompiledObliviousTrees(_SplitTable):
+    """CatBoost symmetric trees: one split per level, so leaf bits need no traversal"""
+
+    def __init__(self, arrays, scale=1.0, bias=0.0):
+        super().__init__(arrays['split_feature'], arrays['split_threshold'], arrays['split_missing_right'],
+                         strict=False, float32=True)
+        self.level_split = arrays['level_split']
+        self.leaf_value = arrays['leaf_value']
+        self.scale = float(scale)
+        self.bias = float(bias)
+
+        n_trees, depth = self.level_split.shape
+        self._leaf_value_flat = self.leaf_value.ravel()
+        self._tree_leaf_base = (np.arange(n_trees, dtype=np.intp) << depth)[np.newaxis, :]
+
+    def raw_score(self, X):
+        right = self.go_right(X).ravel()
+        row_base = (np.arange(len(X), dtype=np.intp) * len(self.split_feature))[:, np.newaxis]
+
+        # Depth is at most MAX_OBLIVIOUS_DEPTH, so leaf ids fit in uint8
+        leaves = np.zeros((len(X), self.level_split.shape[0]), dtype=np.uint8)
+        for level in range(self.level_split.shape[1]):
+            leaves |= right.take(row_base + self.level_split[:, level], mode='clip') << level
+
+        values = self._leaf_value_flat.take(self._tree_leaf_base + leaves, mode='clip')
+        return self.scale * values.sum(axis=1) + self.bias
+
+    def predict(self, X):
+        return _sigmoid(self.raw_score(X))
+
+
+class CompiledEnsemble(ArrayEnsemble):
+    """ArrayEnsemble over compiled learners, scoring large inputs in cache-sized chunks"""
+
+    chunk_rows = CHUNK_ROWS
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if len(X) <= self.chunk_rows:
+            return super().predict_proba(X)
+
+        proba = np.empty((len(X), 2), dtype=np.float64)
+        for start in range(0, len(X), self.chunk_rows):
+            proba[start:start + self.chunk_rows] = super().predict_proba(X[start:start + self.chunk_rows])
+        return proba
+
+
+# ------------------ COMPILATION ------------------
+def _unique_splits(feature, threshold, missing_right):
+    """Deduplicate (feature, threshold, missing direction) triples; returns table and inverse ids"""
+    keys = np.rec.fromarrays([feature, threshold, missing_right], names='feature,threshold,missing_right')
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return {
+        'split_feature': np.ascontiguousarray(unique['feature'], dtype=np.int32),
+        'split_threshold': np.ascontiguousarray(unique['threshold']),
+        'split_missing_right': np.ascontiguousarray(unique['missing_right'], dtype=bool),
+    }, inverse.reshape(-1).astype(np.int32)
+
+
+def compile_trees(table):
+    """Compile a TreeTable into CompiledTrees arrays and meta"""
+    depth = table.depth
+    if depth > MAX_COMPILED_DEPTH:
+        raise ValueError(f"Tree depth {depth} exceeds MAX_COMPILED_DEPTH={MAX_COMPILED_DEPTH}")
+    n_trees, n_internal = len(table.roots), (1 << depth) - 1
+    feature = np.zeros((n_trees, n_internal), dtype=np.int32)
+    threshold = np.full((n_trees, n_internal), np.inf, dtype=table.threshold.dtype)
+    missing_right = np.zeros((n_trees, n_internal), dtype=bool)
+    leaf_value = np.zeros((n_trees, n_internal + 1), dtype=np.float64)
+
+    for tree, root in enumerate(table.roots):
+        # (node in the flat table, position in the perfect layout, level)
+        stack = [(int(root), 0, 0)]
+        while stack:
+            node, position, level = stack.pop()
+            if level == depth:
+                leaf_value[tree, position - n_internal] = table.value[node]
+                continue
+            if table.left[node] == node:
+                # Leaf above full depth: copy it into both subtrees so either branch lands on it
+                stack.append((node, 2 * position + 1, level + 1))
+                stack.append((node, 2 * position + 2, level + 1))
+                continue
+            feature[tree, position] = table.feature[node]
+            threshold[tree, position] = table.threshold[node]
+            missing_right[tree, position] = not table.default_left[node]
+            stack.append((int(table.left[node]), 2 * position + 1, level + 1))
+            stack.append((int(table.right[node]), 2 * position + 2, level + 1))
+
+    arrays, node_split = _unique_splits(feature.ravel(), threshold.ravel(), missing_right.ravel())
+    arrays['node_split'] = node_split.reshape(n_trees, n_internal)
+    arrays['leaf_value'] = leaf_value
+    meta = {'kind': 'compiled_tree', 'depth': depth, 'strict': table.strict, 'float32': table.float32,
+            'base_margin': table.base_margin, 'sigmoid': table.sigmoid}
+    return arrays, meta
+
+
+def compile_oblivious(table):
+    """Compile an ObliviousTable into CompiledObliviousTrees arrays and meta"""
+    depth = table.split_feature.shape[1]
+    if depth > MAX_OBLIVIOUS_DEPTH:
+        raise ValueError(f"Oblivious depth {depth} exceeds MAX_OBLIVIOUS_DEPTH={MAX_OBLIVIOUS_DEPTH}")
+    missing_right = np.zeros(table.split_feature.size, dtype=bool)
+    arrays, level_split = _unique_splits(table.split_feature.ravel(), table.border.ravel(), missing_right)
+    arrays['level_split'] = level_split.reshape(table.split_feature.shape)
+    arrays['leaf_value'] = np.ascontiguousarray(table.leaf_values, dtype=np.float64)
+    return arrays, {'kind': 'compiled_oblivious', 'scale': table.scale, 'bias': table.bias}
+
+
+def compile_ensemble(ensemble):
+    """Compile an ArrayEnsemble's learners; returns (arrays, meta) for build_compiled_ensemble.
+
+    Learners that cannot be compiled (too deep) are exported as-is and keep
+    the reference evaluator.
+    """
+    arrays, learners = {}, []
+    for i, learner in enumerate(ensemble.learners):
+        try:
+            if isinstance(learner, TreeTable):
+                learner_arrays, learner_meta = compile_trees(learner)
+            elif isinstance(learner, ObliviousTable):
+                learner_arrays, learner_meta = compile_oblivious(learner)
+            else:
+                raise ValueError(f"Cannot compile learner {type(learner).__name__}")
+        except ValueError:
+            learner_arrays, learner_meta = export_learner(learner)
+        prefix = f'base{i}/'
+        arrays.update({prefix + name: array for name, array in learner_arrays.items()})
+        learners.append(dict(learner_meta, prefix=prefix))
+
+    arrays['final/coef'] = np.asarray(ensemble.coef, dtype=np.float64)
+    meta = {
+        'learners': learners,
+        'intercept': ensemble.intercept,
+        'classes': [int(c) for c in ensemble.classes_],
+        'feature_names': [str(name) for name in ensemble.feature_names_in_],
+    }
+    return arrays, meta
+
+
+def build_compiled_ensemble(arrays, meta):
+    """Assemble a CompiledEnsemble from compiled (possibly memory-mapped) arrays"""
+    learners = []
+    for learner in meta['learners']:
+        prefix = learner['prefix']
+        learner_arrays = {
+            name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)
+        }
+        if learner['kind'] == 'compiled_tree':
+            learners.append(CompiledTrees(
+                learner_arrays, learner['depth'], strict=learner['strict'], float32=learner['float32'],
+                base_margin=learner['base_margin'], sigmoid=learner['sigmoid']
+            ))
+        elif learner['kind'] == 'compiled_oblivious':
+            learners.append(CompiledObliviousTrees(learner_arrays, scale=learner['scale'], bias=learner['bias']))
+        else:
+            learners.append(build_learner(learner_arrays, learner))
+    return CompiledEnsemble(learners, arrays['final/coef'], meta['intercept'], meta['feature_names'], meta['classes'])
+
+
+def compile_stacked_model(model):
+    """Export step: fitted StackingClassifier -> CompiledEnsemble (needs the boosting libraries)"""
+    return build_compiled_ensemble(*compile_ensemble(build_ensemble(*export_stacked_model(model))))
+
+
+def max_abs_difference(model, compiled, X):
+    """Largest absolute gap between model and compiled positive-class probabilities on X"""
+    reference = model.predict_proba(X)[:, 1]
+    return float(np.abs(reference - compiled.predict_proba(X)[:, 1]).max())
+
+
+def compile_verified(model, tolerance=TOLERANCE, n_probe=1000, seed=0):
+    """compile_stacked_model, rejecting the result unless it agrees with model on a seeded sample"""
+    compiled = compile_stacked_model(model)
+    probe = np.random.default_rng(seed).random((n_probe, compiled.n_features_in_)) * 1000
+    difference = max_abs_difference(model, compiled, probe)
+    if not difference <= tolerance:
+        raise ValueError(f"Compiled model differs by {difference:.2e} (tolerance {tolerance:.0e})")
+    return compiled
+
+
+class SizeRoutedModel:
+    """Scores small batches with the compiled evaluator and larger ones with the native model.
+
+    Exposes the compiled model's predict_proba/predict/feature_names_in_
+    surface; large array inputs are framed for the native model when it
+    does not score raw arrays identically. Pass load_native instead of
+    native to defer loading the native model (and its boosting libraries)
+    until the first large batch.
+    """
+
+    def __init__(self, compiled, native=None, max_rows=COMPILED_MAX_ROWS, load_native=None):
+        if (native is None) == (load_native is None):
+            raise ValueError("Pass exactly one of native and load_native")
+        self.compiled = compiled
+        self.max_rows = int(max_rows)
+        self.feature_names_in_ = compiled.feature_names_in_
+        self.n_features_in_ = compiled.n_features_in_
+        self.classes_ = compiled.classes_
+        self._load_native = load_native
+        self._native_lock = threading.Lock()
+        self.native = None
+        if native is not None:
+            self._set_native(native)
+
+    def _set_native(self, native):
+        self._native_schema = get_feature_schema(native)
+        self.native = native
+
+    def _get_native(self):
+        if self.native is None:
+            with self._native_lock:
+                if self.native is None:
+                    self._set_native(self._load_native())
+        return self.native
+
+    def predict_proba(self, X):
+        if len(X) <= self.max_rows:
+            return self.compiled.predict_proba(X)
+        native = self._get_native()
+        if not hasattr(X, 'iloc') and not self._native_schema.accepts_arrays:
+            X = self._native_schema.to_frame(np.asarray(X, dtype=np.float64))
+        return native.predict_proba(X)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -0,0 +1,130 @@
+import numpy as np
+
+# Decision codes used by the array engine; index into DECISION_LABELS
+REJECTED, REVIEW, APPROVED = 0, 1, 2
+DECISION_LABELS = np.array(['Rejected', 'Review', 'Approved'], dtype=object)
+
+# Loan multipliers by minimum credit score, highest band first
+LOAN_MULTIPLIER_BANDS = ((750, 3.0), (700, 2.5), (650, 2.0), (600, 1.5))
+BASE_LOAN_MULTIPLIER = 1.0
+
+
+# ------------------ SCALAR ENGINE ------------------
+def map_probability_to_score(prob, min_score=300, max_score=800):
+    return int(min_score + prob * (max_score - min_score))
+
+def decision_logic(prob, income, repayment_history, has_collateral, missing_docs=False):
+    credit_score = map_probability_to_score(prob)
+
+    if credit_score >= 700 and repayment_history == 'good':
+        decision = 'Approved'
+    elif credit_score >= 600 and repayment_history in ['good', 'average'] and has_collateral:
+        decision = 'Approved'
+    elif 500 <= credit_score < 600 or repayment_history == 'average':
+        decision = 'Review'
+    else:
+        decision = 'Rejected'
+
+    if missing_docs:
+        decision = 'Review'
+
+    return credit_score, decision
+
+def estimate_loan_amount(income, credit_score):
+    if credit_score >= 750:
+        multiplier = 3.0
+    elif credit_score >= 700:
+        multiplier = 2.5
+    elif credit_score >= 650:
+        multiplier = 2.0
+    elif credit_score >= 600:
+        multiplier = 1.5
+    else:
+        multiplier = 1.0
+
+    return round(income * multiplier, -3)
+
+def generate_message(decision, credit_score, amount=None):
+    if decision == 'Approved':
+        return f"✅ Congratulations! Your loan has been approved with a credit score of {credit_score}. The approved loan amount is **KES {amount:,.0f}**."
+    elif decision == 'Review':
+        return f"📋 Your loan application is under review. A loan officer will contact you shortly. (Credit score: {credit_score})"
+    else:
+        return f"❌ We're sorry, your loan application was not approved at this time. (Credit score: {credit_score})"
+
+
+# ------------------ ARRAY ENGINE ------------------
+def map_probabilities_to_scores(probs, min_score=300, max_score=800):
+    """Array version of map_probability_to_score; truncates toward zero like int()"""
+    scores = min_score + np.atleast_1d(np.asarray(probs, dtype=np.float64)) * (max_score - min_score)
+    return np.trunc(scores).astype(np.int64)
+
+def decision_codes(credit_scores, repayment_history=None, has_collateral=None, missing_docs=False):
+    """Array version of decision_logic's rules, returning REJECTED/REVIEW/APPROVED codes.
+
+    repayment_history, has_collateral and missing_docs may be scalars or
+    per-row arrays; scalars apply to every row as in the scalar engine.
+    """
+    credit_scores = np.asarray(credit_scores)
+    shape = credit_scores.shape
+
+    repayment = np.broadcast_to(np.asarray(repayment_history, dtype=object), shape)
+    good = repayment == 'good'
+    average = repayment == 'average'
+    # Python truthiness per element, matching `and has_collateral`
+    collateral = np.broadcast_to(np.asarray(has_collateral, dtype=object), shape).astype(bool)
+
+    codes = np.select(
+        [
+            (credit_scores >= 700) & good,
+            (credit_scores >= 600) & (good | average) & collateral,
+            ((credit_scores >= 500) & (credit_scores < 600)) | average,
+        ],
+        [APPROVED, APPROVED, REVIEW],
+        default=REJECTED,
+    ).astype(np.int8)
+
+    missing = np.broadcast_to(np.asarray(missing_docs, dtype=object), shape).astype(bool)
+    codes[missing] = REVIEW
+    return codes
+
+def estimate_loan_amounts(incomes, credit_scores):
+    """Array version of estimate_loan_amount, rounding to the nearest 1,000 like round(x, -3)"""
+    credit_scores = np.atleast_1d(credit_scores)
+    multipliers = np.select(
+        [credit_scores >= minimum for minimum, _ in LOAN_MULTIPLIER_BANDS],
+        [multiplier for _, multiplier in LOAN_MULTIPLIER_BANDS],
+        default=BASE_LOAN_MULTIPLIER,
+    )
+    raw = np.atleast_1d(np.asarray(incomes, dtype=np.float64)) * multipliers
+    amounts = np.round(raw, -3)
+
+    # np.round scales by 1/1000 first, which can misplace exact halves;
+    # defer those few near-ties to Python's correctly rounded round()
+    thousands = raw / 1000.0
+    near_tie = np.abs(thousands - np.floor(thousands) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        amounts.flat[i] = round(float(raw.flat[i]), -3)
+    return amounts
+
+def generate_messages(codes, credit_scores, amounts=None):
+    """Messages for arrays of decision codes; strings cannot be vectorized further"""
+    labels = DECISION_LABELS[np.asarray(codes)]
+    if amounts is None:
+        amounts = np.full(len(labels), np.nan)
+    return [
+        generate_message(label, int(score), amount)
+        for label, score, amount in zip(labels, credit_scores, amounts)
+    ]
+
+def decision_engine_arrays(probs, incomes, repayment_history=None, has_collateral=None, missing_docs=False):
+    """Score, decision-code and approved-amount arrays for a whole book in one pass.
+
+    Amounts are NaN where the decision is not APPROVED, mirroring the
+    scalar engine's None.
+    """
+    credit_scores = map_probabilities_to_scores(probs)
+    codes = decision_codes(credit_scores, repayment_history, has_collateral, missing_docs)
+    amounts = estimate_loan_amounts(incomes, credit_scores)
+    amounts[codes != APPROVED] = np.nan
+    return credit_scores, codes, amounts
@@ -0,0 +1,333 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class TreeTable:
+    """Flat node arrays for a boosted ensemble of binary trees (LightGBM, XGBoost).
+
+    Every tree shares one node table; leaves loop back to themselves so a
+    fixed number of depth steps walks all trees for all rows at once.
+    """
+
+    def __init__(self, arrays, depth, strict=False, float32=False, base_margin=0.0, sigmoid=1.0):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.default_left = arrays['default_left']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.depth = int(depth)
+        self.strict = bool(strict)
+        self.float32 = bool(float32)
+        self.base_margin = float(base_margin)
+        self.sigmoid = float(sigmoid)
+
+    def raw_score(self, X):
+        X = X.astype(np.float32) if self.float32 else X
+        nodes = np.repeat(self.roots[np.newaxis, :], len(X), axis=0)
+        rows = np.arange(len(X))[:, np.newaxis]
+        has_nan = bool(np.isnan(X).any())
+
+        for _ in range(self.depth):
+            x = X[rows, self.feature[nodes]]
+            threshold = self.threshold[nodes]
+            go_left = x < threshold if self.strict else x <= threshold
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes].sum(axis=1) + self.base_margin
+
+    def predict(self, X):
+        return _sigmoid(self.sigmoid * self.raw_score(X))
+
+
+class ObliviousTable:
+    """Split and leaf arrays for a CatBoost ensemble of symmetric (oblivious) trees"""
+
+    def __init__(self, arrays, scale=1.0, bias=0.0):
+        self.split_feature = arrays['split_feature']
+        self.border = arrays['border']
+        self.leaf_values = arrays['leaf_values']
+        self.scale = float(scale)
+        self.bias = float(bias)
+        self._bit_weights = (1 << np.arange(self.split_feature.shape[1])).astype(np.int64)
+        self._tree_index = np.arange(self.split_feature.shape[0])
+
+    def raw_score(self, X):
+        # CatBoost binarizes float32 features; NaN compares False, i.e. 'Min' treatment
+        bits = X.astype(np.float32)[:, self.split_feature] > self.border
+        leaves = bits @ self._bit_weights
+        return self.scale * self.leaf_values[self._tree_index, leaves].sum(axis=1) + self.bias
+
+    def predict(self, X):
+        return _sigmoid(self.raw_score(X))
+
+
+class ArrayEnsemble:
+    """NumPy evaluator for the stacked model: base learners, then the logistic meta-learner.
+
+    Mirrors StackingClassifier.predict_proba with stack_method='predict_proba'
+    for a binary target, without importing sklearn or the boosting libraries.
+    """
+
+    def __init__(self, learners, coef, intercept, feature_names, classes=(0, 1)):
+        self.learners = learners
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.classes_ = np.asarray(classes)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        meta_features = np.column_stack([learner.predict(X) for learner in self.learners])
+        positive = _sigmoid(meta_features @ self.coef + self.intercept)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+
+# ------------------ EXPORT ------------------
+def _pack_binary_trees(trees):
+    """Flatten [(nodes, depth)] into one node table; each tree's nodes are listed by id, root first"""
+    columns = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'default_left', 'value')}
+    roots, depth = [], 0
+
+    for nodes, tree_depth in trees:
+        if [node['id'] for node in nodes] != list(range(len(nodes))):
+            raise ValueError("Tree node ids must be contiguous from the root")
+        offset = len(columns['feature'])
+        roots.append(offset)
+        depth = max(depth, tree_depth)
+        for node in nodes:
+            if node['leaf']:
+                # Self-loop: compares true forever and never leaves the leaf
+                columns['feature'].append(0)
+                columns['threshold'].append(np.inf)
+                columns['left'].append(offset + node['id'])
+                columns['right'].append(offset + node['id'])
+                columns['default_left'].append(True)
+                columns['value'].append(node['value'])
+            else:
+                columns['feature'].append(node['feature'])
+                columns['threshold'].append(node['threshold'])
+                columns['left'].append(offset + node['left'])
+                columns['right'].append(offset + node['right'])
+                columns['default_left'].append(node['default_left'])
+                columns['value'].append(0.0)
+
+    return {
+        'feature': np.asarray(columns['feature'], dtype=np.int32),
+        'threshold': np.asarray(columns['threshold'], dtype=np.float64),
+        'left': np.asarray(columns['left'], dtype=np.int32),
+        'right': np.asarray(columns['right'], dtype=np.int32),
+        'default_left': np.asarray(columns['default_left'], dtype=bool),
+        'value': np.asarray(columns['value'], dtype=np.float64),
+        'roots': np.asarray(roots, dtype=np.int32),
+    }, depth
+
+
+def _export_lightgbm(estimator):
+    dump = estimator.booster_.dump_model()
+    if dump.get('num_tree_per_iteration', 1) != 1 or dump.get('average_output'):
+        raise ValueError("Only binary, non-averaged LightGBM models can be exported")
+
+    trees = []
+    for info in dump['tree_info']:
+        nodes = []
+
+        def visit(node, depth):
+            node_id = len(nodes)
+            nodes.append(None)
+            if 'leaf_value' in node:
+                nodes[node_id] = {'id': node_id, 'leaf': True, 'value': node['leaf_value']}
+                return node_id, depth
+            if node['decision_type'] != '<=':
+                raise ValueError(f"Unsupported LightGBM split type {node['decision_type']!r}")
+            if node['missing_type'] == 'None':
+                # LightGBM scores NaN as 0.0 on these splits
+                default_left = 0.0 <= node['threshold']
+            elif node['missing_type'] == 'NaN':
+                default_left = node['default_left']
+            else:
+                raise ValueError(f"Unsupported LightGBM missing type {node['missing_type']!r}")
+            left, left_depth = visit(node['left_child'], depth + 1)
+            right, right_depth = visit(node['right_child'], depth + 1)
+            nodes[node_id] = {
+                'id': node_id, 'leaf': False, 'feature': node['split_feature'],
+                'threshold': node['threshold'], 'left': left, 'right': right,
+                'default_left': default_left,
+            }
+            return node_id, max(left_depth, right_depth)
+
+        _, tree_depth = visit(info['tree_structure'], 0)
+        trees.append((nodes, tree_depth))
+
+    arrays, depth = _pack_binary_trees(trees)
+    sigmoid = 1.0
+    for token in dump['objective'].split():
+        if token.startswith('sigmoid:'):
+            sigmoid = float(token.split(':', 1)[1])
+    return arrays, {'kind': 'tree', 'depth': depth, 'strict': False, 'float32': False,
+                    'base_margin': 0.0, 'sigmoid': sigmoid}
+
+
+def _export_xgboost(estimator):
+    booster = estimator.get_booster()
+    learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+    if learner['objective']['name'] != 'binary:logistic':
+        raise ValueError("Only binary:logistic XGBoost models can be exported")
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise ValueError("Only gbtree XGBoost models can be exported")
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        if any(tree['split_type']):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        left_children, right_children = tree['left_children'], tree['right_children']
+        nodes = []
+
+        def visit(node_id, depth):
+            # XGBoost stores leaf values in split_conditions
+            if left_children[node_id] == -1:
+                nodes.append({'id': node_id, 'leaf': True, 'value': tree['split_conditions'][node_id]})
+                return depth
+            nodes.append({
+                'id': node_id, 'leaf': False, 'feature': tree['split_indices'][node_id],
+                'threshold': tree['split_conditions'][node_id],
+                'left': left_children[node_id], 'right': right_children[node_id],
+                'default_left': bool(tree['default_left'][node_id]),
+            })
+            return max(visit(left_children[node_id], depth + 1), visit(right_children[node_id], depth + 1))
+
+        tree_depth = visit(0, 0)
+        nodes.sort(key=lambda node: node['id'])
+        trees.append((nodes, tree_depth))
+
+    arrays, depth = _pack_binary_trees(trees)
+    # Thresholds and leaves are float32 in XGBoost; keep them exact in the table
+    arrays['threshold'] = arrays['threshold'].astype(np.float32)
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+    return arrays, {'kind': 'tree', 'depth': depth, 'strict': True, 'float32': True,
+                    'base_margin': base_margin, 'sigmoid': 1.0}
+
+
+def _export_catboost(estimator):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'catboost.json')
+        estimator.save_model(path, format='json')
+        with open(path) as f:
+            dump = json.load(f)
+
+    float_features = {info['feature_index']: info for info in dump['features_info']['float_features']}
+    if any(info.get('nan_value_treatment', 'AsIs') == 'AsTrue' for info in float_features.values()):
+        raise ValueError("CatBoost 'Max' NaN treatment is not supported")
+
+    trees = dump['oblivious_trees']
+    depth = max(len(tree['splits']) for tree in trees)
+    split_feature = np.zeros((len(trees), depth), dtype=np.int32)
+    # Padding levels never fire, keeping shallower trees' leaf indices intact
+    border = np.full((len(trees), depth), np.inf, dtype=np.float32)
+    leaf_values = np.zeros((len(trees), 1 << depth), dtype=np.float64)
+
+    for t, tree in enumerate(trees):
+        for level, split in enumerate(tree['splits']):
+            if split.get('split_type', 'FloatFeature') != 'FloatFeature':
+                raise ValueError(f"Unsupported CatBoost split type {split['split_type']!r}")
+            split_feature[t, level] = float_features[split['float_feature_index']]['flat_feature_index']
+            border[t, level] = split['border']
+        leaf_values[t, :len(tree['leaf_values'])] = tree['leaf_values']
+
+    scale, bias = dump.get('scale_and_bias', [1.0, [0.0]])
+    bias = bias[0] if isinstance(bias, list) else bias
+    arrays = {'split_feature': split_feature, 'border': border, 'leaf_values': leaf_values}
+    return arrays, {'kind': 'oblivious', 'scale': float(scale), 'bias': float(bias)}
+
+
+def export_stacked_model(model):
+    """Extract a fitted StackingClassifier into (arrays, meta) for ArrayEnsemble.
+
+    Array names are prefixed per learner ('base0/feature', ...); meta is
+    JSON-serializable. Needs the boosting libraries, but only at export.
+    """
+    if list(getattr(model, 'stack_method_', [])) != ['predict_proba'] * len(model.estimators_):
+        raise ValueError("Only stack_method='predict_proba' stacking models can be exported")
+    if getattr(model, 'passthrough', False) or len(model.classes_) != 2:
+        raise ValueError("Only binary stacking models without passthrough can be exported")
+
+    feature_names = [str(name) for name in model.feature_names_in_]
+    arrays, learners = {}, []
+    for i, estimator in enumerate(model.estimators_):
+        kind = type(estimator).__name__
+        if kind == 'LGBMClassifier':
+            learner_arrays, learner_meta = _export_lightgbm(estimator)
+        elif kind == 'XGBClassifier':
+            learner_arrays, learner_meta = _export_xgboost(estimator)
+        elif kind == 'CatBoostClassifier':
+            learner_arrays, learner_meta = _export_catboost(estimator)
+        else:
+            raise ValueError(f"Cannot export base learner {kind}")
+        prefix = f'base{i}/'
+        arrays.update({prefix + name: array for name, array in learner_arrays.items()})
+        learners.append(dict(learner_meta, source=kind, prefix=prefix))
+
+    final = model.final_estimator_
+    arrays['final/coef'] = np.asarray(final.coef_[0], dtype=np.float64)
+    meta = {
+        'learners': learners,
+        'intercept': float(final.intercept_[0]),
+        'classes': [int(c) for c in model.classes_],
+        'feature_names': feature_names,
+    }
+    return arrays, meta
+
+
+def export_learner(learner):
+    """(arrays, meta) for an already-built TreeTable or ObliviousTable"""
+    if isinstance(learner, TreeTable):
+        arrays = {name: getattr(learner, name)
+                  for name in ('feature', 'threshold', 'left', 'right', 'default_left', 'value', 'roots')}
+        return arrays, {'kind': 'tree', 'depth': learner.depth, 'strict': learner.strict,
+                        'float32': learner.float32, 'base_margin': learner.base_margin,
+                        'sigmoid': learner.sigmoid}
+    if isinstance(learner, ObliviousTable):
+        arrays = {name: getattr(learner, name) for name in ('split_feature', 'border', 'leaf_values')}
+        return arrays, {'kind': 'oblivious', 'scale': learner.scale, 'bias': learner.bias}
+    raise ValueError(f"Cannot export learner {type(learner).__name__}")
+
+
+def build_learner(arrays, meta):
+    """Build one reference learner from its (prefix-stripped) arrays and meta"""
+    if meta['kind'] == 'tree':
+        return TreeTable(
+            arrays, meta['depth'], strict=meta['strict'], float32=meta['float32'],
+            base_margin=meta['base_margin'], sigmoid=meta['sigmoid']
+        )
+    if meta['kind'] == 'oblivious':
+        return ObliviousTable(arrays, scale=meta['scale'], bias=meta['bias'])
+    raise ValueError(f"Unknown learner kind {meta['kind']!r}")
+
+
+def build_ensemble(arrays, meta):
+    """Assemble an ArrayEnsemble from exported (possibly memory-mapped) arrays"""
+    learners = []
+    for learner in meta['learners']:
+        prefix = learner['prefix']
+        learner_arrays = {
+            name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)
+        }
+        learners.append(build_learner(learner_arrays, learner))
+    return ArrayEnsemble(learners, arrays['final/coef'], meta['intercept'], meta['feature_names'], meta['classes'])
@@ -0,0 +1,156 @@
+"""Parallel base-learner execution for stacked models.
+
+The base learners of the stack are independent, so a large batch is cut
+into (learner, row chunk) tasks that run concurrently; their outputs are
+reassembled in order and fed to the meta-learner exactly as in serial
+scoring. Learners that release the GIL (the NumPy evaluators and the
+native boosting libraries) share a thread pool; anything else is shipped
+once to a process pool.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from scoring.ensemble import ArrayEnsemble, _sigmoid
+
+# Batches smaller than this are scored serially; pool overhead would dominate
+PARALLEL_MIN_ROWS = 1024
+# Libraries whose predict runs native code with the GIL released
+_GIL_RELEASING_MODULES = ('scoring.', 'lightgbm.', 'xgboost.', 'catboost.')
+
+
+def releases_gil(learner):
+    """True when learner's predict spends its time in native code without the GIL"""
+    return type(learner).__module__.startswith(_GIL_RELEASING_MODULES)
+
+
+def _learner_column(learner, method, X):
+    """One base learner's contribution to the meta-features, as a 2-D block"""
+    if method is None:
+        return np.asarray(learner.predict(X), dtype=np.float64).reshape(len(X), -1)
+    output = np.asarray(getattr(learner, method)(X))
+    if output.ndim == 1:
+        return output.reshape(-1, 1)
+    # StackingClassifier drops the redundant first column for binary targets
+    return output[:, 1:] if method == 'predict_proba' and output.shape[1] == 2 else output
+
+
+# Learners installed in each process-pool worker by _init_worker
+_worker_learners = None
+
+
+def _init_worker(learners):
+    global _worker_learners
+    _worker_learners = learners
+
+
+def _run_in_worker(index, X):
+    learner, method = _worker_learners[index]
+    return _learner_column(learner, method, X)
+
+
+class ParallelStackedModel:
+    """Wraps an ArrayEnsemble or fitted StackingClassifier, running base learners concurrently.
+
+    Exposes the same predict_proba/predict/feature_names_in_ surface as the
+    wrapped model, so FeatureSchema and the decision engine use it unchanged.
+    """
+
+    def __init__(self, model, workers, executor='auto', min_rows=PARALLEL_MIN_ROWS):
+        self.model = model
+        self.workers = int(workers)
+        self.min_rows = int(min_rows)
+        self.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+        self.n_features_in_ = model.n_features_in_
+        self.classes_ = model.classes_
+
+        if isinstance(model, ArrayEnsemble):
+            self._learners = [(learner, None) for learner in model.learners]
+        else:
+            self._learners = list(zip(model.estimators_, model.stack_method_))
+
+        if executor == 'auto':
+            executor = 'thread' if all(releases_gil(learner) for learner, _ in self._learners) else 'process'
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor {executor!r}; expected 'auto', 'thread' or 'process'")
+        self.executor = executor
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                if self.executor == 'thread':
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='base-learner')
+                else:
+                    self._pool = ProcessPoolExecutor(
+                        self.workers, initializer=_init_worker, initargs=(self._learners,)
+                    )
+            return self._pool
+
+    def meta_features(self, X):
+        """Meta-learner input for X, computed by (learner, row chunk) tasks in the pool"""
+        pool = self._get_pool()
+        n_rows = len(X)
+        chunk = -(-n_rows // self.workers)
+        # Compiled ensembles are fastest on cache-sized chunks; keep that inside each task
+        chunk = min(chunk, getattr(self.model, 'chunk_rows', chunk))
+        bounds = [(start, min(start + chunk, n_rows)) for start in range(0, n_rows, chunk)]
+
+        futures = []
+        for index, (learner, method) in enumerate(self._learners):
+            for start, stop in bounds:
+                if self.executor == 'thread':
+                    futures.append(pool.submit(_learner_column, learner, method, X[start:stop]))
+                else:
+                    futures.append(pool.submit(_run_in_worker, index, X[start:stop]))
+
+        # Futures are in learner-major order: stack each learner's row chunks, then the learners
+        blocks = [future.result() for future in futures]
+        columns = [np.vstack(blocks[i:i + len(bounds)]) for i in range(0, len(blocks), len(bounds))]
+        return np.hstack(columns)
+
+    def predict_proba(self, X):
+        if not hasattr(X, 'iloc'):
+            X = np.asarray(X, dtype=np.float64)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+        if self.workers <= 1 or len(X) < self.min_rows:
+            return self.model.predict_proba(X)
+
+        meta_features = self.meta_features(X)
+        if isinstance(self.model, ArrayEnsemble):
+            positive = _sigmoid(meta_features @ self.model.coef + self.model.intercept)
+            return np.column_stack([1.0 - positive, positive])
+        if self.model.passthrough:
+            meta_features = np.hstack([meta_features, np.asarray(X, dtype=np.float64)])
+        return self.model.final_estimator_.predict_proba(meta_features)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+def resolve_workers(workers):
+    """Configured worker count; 0 or less means one per available CPU"""
+    workers = int(workers)
+    if workers > 0:
+        return workers
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def parallelize(model, workers=0, executor='auto', min_rows=PARALLEL_MIN_ROWS):
+    """Wrap model for parallel base-learner execution; returns model unchanged on a single worker"""
+    workers = resolve_workers(workers)
+    if workers <= 1 or not (isinstance(model, ArrayEnsemble) or hasattr(model, 'estimators_')):
+        return model
+    return ParallelStackedModel(model, workers, executor, min_rows)
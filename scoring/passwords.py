@@ -0,0 +1,69 @@
+"""bcrypt cost calibration shared by the Streamlit app and the backend.
+
+bcrypt time doubles with each cost step, so timing a few hashes at a cheap
+probe cost is enough to predict the cost that lands nearest a target
+verify latency on this host. Stored hashes record their cost
+('$2b$12$...'), which is how logins spot hashes made for other hardware.
+"""
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+# bcrypt's own limits are 4..31; outside this range a hash is either weak or unusably slow
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+_PROBE_ROUNDS = 8
+_PROBE_SAMPLES = 3
+
+
+def hash_cost(hashed):
+    """Cost factor of a modular-crypt bcrypt hash, or None if it is not one"""
+    if isinstance(hashed, bytes):
+        hashed = hashed.decode('ascii', 'replace')
+    parts = hashed.split('$') if hashed else []
+    if len(parts) < 4 or not parts[1].startswith('2') or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed, rounds):
+    """True when hashed is a bcrypt hash made at a cost other than rounds"""
+    cost = hash_cost(hashed)
+    return cost is not None and cost != rounds
+
+
+def calibrate_rounds(target_ms, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS):
+    """Cost whose hash time on this host is nearest target_ms, clamped to [min_rounds, max_rounds]"""
+    import bcrypt
+
+    def hash_ms(rounds, samples=1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            bcrypt.hashpw(b'calibration', salt)
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000.0
+
+    # The first hash pays one-off setup; time the fastest of the rest
+    hash_ms(_PROBE_ROUNDS)
+    probe_ms = hash_ms(_PROBE_ROUNDS, _PROBE_SAMPLES)
+    rounds = _PROBE_ROUNDS + round(math.log2(target_ms / probe_ms)) if probe_ms > 0 else max_rounds
+    rounds = max(min_rounds, min(max_rounds, rounds))
+
+    # Extrapolating from a cheap cost can be off by a step; one hash at the chosen cost settles it
+    measured_ms = hash_ms(rounds)
+    if measured_ms > target_ms * math.sqrt(2) and rounds > min_rounds:
+        rounds, measured_ms = rounds - 1, measured_ms / 2
+    elif measured_ms < target_ms / math.sqrt(2) and rounds < max_rounds:
+        rounds, measured_ms = rounds + 1, measured_ms * 2
+    logger.info(f"bcrypt cost {rounds} selected for a {target_ms:.0f} ms target (~{measured_ms:.0f} ms measured)")
+    return rounds
+
+
+def resolve_rounds(configured, target_ms):
+    """configured cost when set (> 0), otherwise one calibrated for target_ms"""
+    configured = int(configured)
+    return configured if configured > 0 else calibrate_rounds(target_ms)
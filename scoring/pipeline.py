@@ -0,0 +1,206 @@
+"""Fused preprocessing + model inference.
+
+The fitted preprocessing pipeline (a ColumnTransformer of StandardScaler
+and OneHotEncoder) is reduced to a JSON spec: per-column mean/scale and
+per-column categories. InferencePipeline matches every model feature to
+what the spec produces, failing loudly on any mismatch, and then encodes
+raw applicant records straight into the model's float64 feature matrix
+in one pass - no intermediate DataFrame, no sklearn on the scoring path.
+"""
+import logging
+import weakref
+
+import numpy as np
+
+from scoring.schema import get_feature_schema
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineError(ValueError):
+    """Raised when the preprocessing pipeline cannot be read or does not line up with the model"""
+
+
+# ------------------ SPEC ------------------
+def preprocessing_spec(preprocessor):
+    """JSON-serialisable spec of a fitted Pipeline/ColumnTransformer (needs sklearn objects, not sklearn imports)"""
+    transformer = preprocessor.steps[-1][1] if hasattr(preprocessor, 'steps') else preprocessor
+    if not hasattr(transformer, 'transformers_'):
+        raise PipelineError(f"Unsupported preprocessor {type(transformer).__name__}")
+    verbose = getattr(transformer, 'verbose_feature_names_out', True)
+
+    def output_name(name, column):
+        return f"{name}__{column}" if verbose else column
+
+    spec = {'input_names': [str(c) for c in transformer.feature_names_in_], 'numeric': {}, 'categorical': {}}
+    for name, step, columns in transformer.transformers_:
+        if isinstance(step, str):
+            if step == 'drop':
+                continue
+            if step != 'passthrough':
+                raise PipelineError(f"Unsupported transformer {step!r} in {name!r}")
+            for column in columns:
+                spec['numeric'][str(column)] = {'output': output_name(name, column), 'mean': 0.0, 'scale': 1.0}
+        elif hasattr(step, 'categories_'):
+            if getattr(step, 'drop_idx_', None) is not None:
+                raise PipelineError(f"OneHotEncoder {name!r} drops categories; not supported")
+            for column, categories in zip(columns, step.categories_):
+                spec['categorical'][str(column)] = {
+                    'categories': [str(c) for c in categories],
+                    'outputs': [output_name(name, f"{column}_{c}") for c in categories],
+                }
+        elif hasattr(step, 'scale_') or hasattr(step, 'mean_'):
+            n = len(columns)
+            mean = step.mean_ if getattr(step, 'with_mean', True) and step.mean_ is not None else np.zeros(n)
+            scale = step.scale_ if getattr(step, 'with_std', True) and step.scale_ is not None else np.ones(n)
+            for column, m, s in zip(columns, mean, scale):
+                spec['numeric'][str(column)] = {'output': output_name(name, column), 'mean': float(m), 'scale': float(s)}
+        else:
+            raise PipelineError(f"Unsupported transformer {type(step).__name__} in {name!r}")
+    return spec
+
+
+def _install_unpickling_shims():
+    """Stand-ins for sklearn internals that old pickles reference but current sklearn no longer has"""
+    from collections import UserList
+
+    from sklearn.compose import _column_transformer
+
+    # ColumnTransformer.transformers_ held its remainder columns in this UserList in sklearn 1.5-1.6
+    if not hasattr(_column_transformer, '_RemainderColsList'):
+        class _RemainderColsList(UserList):
+            pass
+
+        _column_transformer._RemainderColsList = _RemainderColsList
+
+
+def load_preprocessing_spec(path):
+    """Unpickle a fitted preprocessing pipeline and reduce it to a spec"""
+    import joblib
+
+    try:
+        _install_unpickling_shims()
+        preprocessor = joblib.load(path)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise PipelineError(f"Cannot load preprocessing pipeline {path}: {e}") from e
+    return preprocessing_spec(preprocessor)
+
+
+# ------------------ PIPELINE ------------------
+class InferencePipeline:
+    """Raw applicant records -> model features -> positive-class probability, in one batched step.
+
+    Accepts raw numeric columns, raw categorical columns (e.g.
+    Employment_Status='Informal') and already-encoded dummy columns.
+    Without a spec it is the model's FeatureSchema alone.
+    """
+
+    def __init__(self, model, spec=None):
+        self.model = model
+        self.schema = get_feature_schema(model)
+        self.spec = spec
+        # input column -> (feature index, mean, scale)
+        self.numeric = {name: (i, 0.0, 1.0) for i, name in enumerate(self.schema.feature_names)}
+        # raw categorical column -> [(category, feature index)]
+        self.categorical = {}
+        self.scaled_features = 0
+        if spec is not None:
+            self._match_spec(spec)
+        self.input_names = frozenset(self.numeric) | frozenset(self.categorical)
+
+    def _match_spec(self, spec):
+        """Map every model feature to a spec column; the model may see raw or transformed values"""
+        sources = {}
+        for column, entry in spec['numeric'].items():
+            sources[entry['output']] = ('numeric', column, entry['mean'], entry['scale'])
+            sources.setdefault(column, ('numeric', column, 0.0, 1.0))
+        for column, entry in spec['categorical'].items():
+            for category, output in zip(entry['categories'], entry['outputs']):
+                sources[output] = ('dummy', column, category)
+                sources.setdefault(f"{column}_{category}", ('dummy', column, category))
+
+        numeric, unmatched = {}, []
+        for i, feature in enumerate(self.schema.feature_names):
+            source = sources.get(feature)
+            if source is None:
+                unmatched.append(feature)
+            elif source[0] == 'numeric':
+                _, column, mean, scale = source
+                numeric[column] = (i, mean, scale)
+                self.scaled_features += (mean, scale) != (0.0, 1.0)
+            else:
+                _, column, category = source
+                self.categorical.setdefault(column, []).append((category, i))
+                # Pre-encoded dummies are still accepted as-is
+                numeric[feature] = (i, 0.0, 1.0)
+        if unmatched:
+            raise PipelineError(f"Model features not produced by the preprocessing pipeline: {', '.join(unmatched)}")
+        self.numeric = numeric
+
+        if spec['numeric'] and not self.scaled_features:
+            logger.info("Model was fit on unscaled columns; the pipeline's scaler is validated but not applied")
+
+    # -------- transform --------
+    def transform_row(self, values, out=None):
+        """Encode a mapping of raw values into a (1, n_features) row"""
+        if out is None:
+            out = np.empty((1, self.schema.n_features), dtype=np.float64)
+        out[0] = self.schema.defaults
+        for name, value in values.items():
+            target = self.numeric.get(name)
+            if target is not None:
+                i, mean, scale = target
+                out[0, i] = (value - mean) / scale
+            elif name in self.categorical:
+                for category, i in self.categorical[name]:
+                    out[0, i] = str(value) == category
+        return out
+
+    def transform(self, input_df, out=None):
+        """Encode the recognised columns of input_df into an (n_rows, n_features) matrix"""
+        if out is None:
+            out = np.empty((len(input_df), self.schema.n_features), dtype=np.float64)
+        out[:] = self.schema.defaults
+        for name in input_df.columns:
+            target = self.numeric.get(name)
+            if target is not None:
+                i, mean, scale = target
+                column = input_df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                if (mean, scale) != (0.0, 1.0):
+                    column = (column - mean) / scale
+                np.copyto(out[:, i], column, where=~np.isnan(column))
+            elif name in self.categorical:
+                values = input_df[name].astype(str).to_numpy()
+                for category, i in self.categorical[name]:
+                    out[:, i] = values == category
+        return out
+
+    def raw_column(self, X, name):
+        """Untransformed values of input column name from an encoded matrix"""
+        i, mean, scale = self.numeric[name]
+        return X[:, i] * scale + mean
+
+    # -------- predict --------
+    def predict_proba(self, X):
+        """Positive-class probabilities for an encoded feature matrix"""
+        return self.schema.predict_proba(self.model, X)
+
+    def score(self, input_df):
+        """(features, probabilities) for a DataFrame of raw records"""
+        X = self.transform(input_df)
+        return X, self.predict_proba(X)
+
+
+_pipelines = weakref.WeakKeyDictionary()
+
+
+def get_inference_pipeline(model):
+    """model itself if it is already a pipeline, else a spec-less pipeline built on first use"""
+    if isinstance(model, InferencePipeline):
+        return model
+    pipeline = _pipelines.get(model)
+    if pipeline is None:
+        pipeline = _pipelines[model] = InferencePipeline(model)
+    return pipeline
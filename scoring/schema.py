@@ -0,0 +1,115 @@
+import warnings
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Exact feature list and order from model's error message
+FEATURE_NAMES = [
+    'Age', 'Years_In_Current_Job', 'Mobile_Money_Account_Age_Months', 'Savings_to_Income_Ratio',
+    'Sacco_Membership_Years', 'Past_Loan_Default', 'Requested_Loan_Amount_KES', 'Employment_Status_Informal',
+    'Years_With_Bank_Account', 'Debt_to_Income_Ratio', 'Monthly_Income_KES', 'Disposable_Income_KES',
+    'Mobile_Money_Score', 'Monthly_Savings_KES', 'Sacco_Shares_Value_KES', 'Current_Debt_KES',
+    'Active_Loan_Count', 'Monthly_Mobile_Money_Transactions', 'Sacco_Contribution_Rate',
+    'Monthly_Mobile_Money_Volume_KES', 'Credit_History_Length_Years', 'Loan_to_Income_Ratio',
+    'Debt_Service_Ratio', 'Monthly_Sacco_Contribution_KES', 'Household_Size', 'Asset_Ownership_Score',
+    'Dependents', 'Previous_Sacco_Loans', 'Region_Type_Semi-Urban', 'Previous_Loans_Count'
+]
+
+# One-hot columns were boolean in the training frame
+BOOL_PREFIXES = ('Region_Type_', 'Employment_Status_')
+
+# Fitted on a DataFrame, the estimators warn on every ndarray call; the
+# schema guarantees column order so the warning carries no information.
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+
+class FeatureSchema:
+    """Column order, dtypes, defaults and index map for the model's input features.
+
+    Built once per model; writes applicant values straight into float64
+    rows so the hot path never assembles an intermediate dict or DataFrame.
+    """
+
+    def __init__(self, feature_names=FEATURE_NAMES):
+        self.feature_names = tuple(str(name) for name in feature_names)
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.bool_columns = tuple(name for name in self.feature_names if name.startswith(BOOL_PREFIXES))
+        self.dtypes = {
+            name: np.dtype(bool) if name in self.bool_columns else np.dtype(np.float64)
+            for name in self.feature_names
+        }
+        # 0 for numeric, False for bool - both are 0.0 in the float row
+        self.defaults = np.zeros(len(self.feature_names), dtype=np.float64)
+        self.accepts_arrays = False
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    @classmethod
+    def from_model(cls, model):
+        """Build a schema from the model's fitted feature names and probe its array support"""
+        feature_names = getattr(model, 'feature_names_in_', None)
+        schema = cls(FEATURE_NAMES if feature_names is None else feature_names)
+        schema.accepts_arrays = schema._probe_array_input(model)
+        return schema
+
+    def row(self, values, out=None):
+        """Write a mapping of feature values into a (1, n_features) row"""
+        if out is None:
+            out = np.empty((1, self.n_features), dtype=np.float64)
+        out[0] = self.defaults
+        index = self.index
+        for name, value in values.items():
+            i = index.get(name)
+            if i is not None:
+                out[0, i] = value
+        return out
+
+    def matrix(self, input_df, out=None):
+        """Write the matching columns of input_df into an (n_rows, n_features) matrix"""
+        if out is None:
+            out = np.empty((len(input_df), self.n_features), dtype=np.float64)
+        out[:] = self.defaults
+        for name in input_df.columns:
+            i = self.index.get(name)
+            if i is None:
+                continue
+            column = input_df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            np.copyto(out[:, i], column, where=~np.isnan(column))
+        return out
+
+    def to_frame(self, X):
+        """Wrap a feature matrix in a DataFrame with the training column dtypes"""
+        frame = pd.DataFrame(X, columns=list(self.feature_names))
+        if self.bool_columns:
+            frame = frame.astype({name: bool for name in self.bool_columns})
+        return frame
+
+    def predict_proba(self, model, X):
+        """Positive-class probabilities, skipping pandas when the model accepts arrays"""
+        if self.accepts_arrays:
+            return model.predict_proba(X)[:, 1]
+        return model.predict_proba(self.to_frame(X))[:, 1]
+
+    def _probe_array_input(self, model):
+        """True if the model scores a raw ndarray exactly as it scores the DataFrame"""
+        probe = self.defaults.reshape(1, -1)
+        try:
+            from_array = model.predict_proba(probe)
+            from_frame = model.predict_proba(self.to_frame(probe))
+        except Exception:
+            return False
+        return bool(np.allclose(from_array, from_frame))
+
+
+_schemas = weakref.WeakKeyDictionary()
+
+
+def get_feature_schema(model):
+    """Return the schema for model, building it on first use"""
+    schema = _schemas.get(model)
+    if schema is None:
+        schema = _schemas[model] = FeatureSchema.from_model(model)
+    return schema
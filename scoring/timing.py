@@ -0,0 +1,175 @@
+"""Low-overhead per-stage timing for the scoring hot path.
+
+    trace = profiler.trace('run_decision_engine')
+    ...                     # assemble features
+    trace.mark('features')
+    ...                     # predict
+    trace.mark('predict_proba')
+    trace.finish()
+
+Each mark records the time since the previous one into a log-bucketed
+histogram (4 buckets per doubling), so recording is a few arithmetic
+operations and summaries are percentile estimates within ~10%. A
+disabled profiler hands out a shared no-op trace. Optionally a sample of
+finished traces is appended to a Chrome trace-event file that
+chrome://tracing, Perfetto or speedscope can open as a flame chart.
+"""
+import json
+import math
+import os
+import random
+import threading
+import time
+
+_BUCKETS_PER_DOUBLING = 4
+_MIN_SECONDS = 1e-7
+_LOG2_MIN = math.log2(_MIN_SECONDS)
+_N_BUCKETS = 120  # 1e-7 s .. ~100 s
+
+
+class Histogram:
+    """Log-bucketed duration histogram with exact count, sum and max"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds > _MIN_SECONDS:
+            bucket = min(int((math.log2(seconds) - _LOG2_MIN) * _BUCKETS_PER_DOUBLING), _N_BUCKETS - 1)
+        else:
+            bucket = 0
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Estimated q-th percentile in seconds (geometric middle of the bucket holding it)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(2 ** (_LOG2_MIN + (bucket + 0.5) / _BUCKETS_PER_DOUBLING), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+            'total_ms': self.total * 1000,
+        }
+
+
+class _NullTrace:
+    __slots__ = ()
+
+    def mark(self, stage):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Trace:
+    """Timings for one pass through an instrumented function"""
+
+    __slots__ = ('profiler', 'name', 'start', 'last', 'stages')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = self.last = time.perf_counter()
+        self.stages = []
+
+    def mark(self, stage):
+        """Close the stage that started at the previous mark (or at trace start)"""
+        now = time.perf_counter()
+        self.stages.append((stage, self.last, now))
+        self.last = now
+
+    def finish(self):
+        self.profiler._finish(self)
+
+
+class Profiler:
+    """Per-(function, stage) histograms, switchable at runtime"""
+
+    def __init__(self, enabled=False, trace_file=None, sample_rate=0.0):
+        self.enabled = bool(enabled)
+        self.trace_file = trace_file or None
+        self.sample_rate = float(sample_rate)
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._trace_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def trace(self, name):
+        return Trace(self, name) if self.enabled else NULL_TRACE
+
+    def _finish(self, trace):
+        end = trace.last
+        with self._lock:
+            for stage, start, stop in trace.stages:
+                key = (trace.name, stage)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.record(stop - start)
+            total = (trace.name, 'total')
+            if total not in self._histograms:
+                self._histograms[total] = Histogram()
+            self._histograms[total].record(end - trace.start)
+
+        if self.trace_file and self.sample_rate > 0 and random.random() < self.sample_rate:
+            self._write_trace(trace)
+
+    def _write_trace(self, trace):
+        """Append complete ('X') trace events; the open-ended JSON array is valid for trace viewers"""
+        tid = threading.get_ident()
+        events = [{'name': trace.name, 'ph': 'X', 'pid': self._pid, 'tid': tid,
+                   'ts': trace.start * 1e6, 'dur': (trace.last - trace.start) * 1e6}]
+        events.extend(
+            {'name': stage, 'ph': 'X', 'pid': self._pid, 'tid': tid, 'ts': start * 1e6, 'dur': (stop - start) * 1e6}
+            for stage, start, stop in trace.stages
+        )
+        lines = ''.join(json.dumps(event) + ',\n' for event in events)
+        try:
+            with self._trace_lock:
+                new_file = not os.path.exists(self.trace_file) or os.path.getsize(self.trace_file) == 0
+                with open(self.trace_file, 'a') as f:
+                    f.write(('[\n' if new_file else '') + lines)
+        except OSError:
+            # Tracing is best effort; never fail a scoring request over it
+            pass
+
+    def summary(self):
+        """{function: {stage: histogram summary}}, stages in first-recorded order, 'total' last"""
+        with self._lock:
+            items = list(self._histograms.items())
+        result = {}
+        for (name, stage), histogram in items:
+            result.setdefault(name, {})[stage] = histogram.summary()
+        for stages in result.values():
+            if 'total' in stages:
+                stages['total'] = stages.pop('total')
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
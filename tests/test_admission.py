@@ -0,0 +1,98 @@
+import pytest
+
+from scoring import admission as admission_module
+from scoring.admission import BUSY, IP, USER, LoginAdmission, LoginThrottled, TokenBuckets
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission_module.time, 'monotonic', clock)
+    return clock
+
+
+def attempt(admission, username, ip=None):
+    """Reason the attempt was refused, or None if it was admitted"""
+    try:
+        with admission.admit(username, ip):
+            return None
+    except LoginThrottled as e:
+        return e.reason
+
+
+def test_user_bucket_allows_a_burst_then_refills_at_the_rate(clock):
+    admission = LoginAdmission(user_rate=6, user_burst=3, ip_rate=0, ip_burst=0, max_concurrent=0)
+    assert [attempt(admission, 'jane') for _ in range(4)] == [None, None, None, USER]
+
+    with pytest.raises(LoginThrottled) as refused:
+        with admission.admit('jane'):
+            pass
+    # Six a minute is one token every ten seconds
+    assert refused.value.retry_after == 10
+    clock.now += 10
+    assert attempt(admission, 'jane') is None
+    assert attempt(admission, 'jane') == USER
+
+
+def test_usernames_share_a_bucket_whatever_their_case(clock):
+    admission = LoginAdmission(user_rate=1, user_burst=1, ip_rate=0, ip_burst=0, max_concurrent=0)
+    assert attempt(admission, 'Jane@Example.com') is None
+    assert attempt(admission, ' jane@example.com ') == USER
+    assert attempt(admission, 'john@example.com') is None
+
+
+def test_address_bucket_spans_usernames(clock):
+    admission = LoginAdmission(user_rate=60, user_burst=5, ip_rate=60, ip_burst=2, max_concurrent=0)
+    assert [attempt(admission, name, '10.0.0.1') for name in ('a', 'b', 'c')] == [None, None, IP]
+    assert attempt(admission, 'c', '10.0.0.2') is None
+    # Attempts without a known address are limited per user only
+    assert attempt(admission, 'd') is None
+
+
+def test_concurrent_verifications_are_capped(clock):
+    admission = LoginAdmission(user_rate=60, user_burst=10, ip_rate=0, ip_burst=0, max_concurrent=1)
+    with admission.admit('a'):
+        assert attempt(admission, 'b') == BUSY
+    assert attempt(admission, 'b') is None
+
+    # A verification that raises still gives its slot back
+    with pytest.raises(RuntimeError):
+        with admission.admit('a'):
+            raise RuntimeError('verification failed')
+    assert admission.stats()['in_flight'] == 0
+
+
+def test_refused_attempts_are_counted(clock):
+    admission = LoginAdmission(user_rate=1, user_burst=1, ip_rate=0, ip_burst=0, max_concurrent=0)
+    for _ in range(4):
+        attempt(admission, 'jane')
+    stats = admission.stats()
+    assert (stats['admitted'], stats['rejected'], stats['rejected_user']) == (1, 3, 3)
+    assert stats['verify_time']['count'] == 1
+    assert stats['shed_cpu_seconds'] == pytest.approx(3 * stats['verify_time']['total_ms'] / 1000)
+
+
+def test_zero_burst_disables_a_bucket():
+    buckets = TokenBuckets(rate_per_minute=0, burst=0)
+    for _ in range(100):
+        assert buckets.wait_time('key', 0.0) == 0.0
+        buckets.take('key', 0.0)
+    assert len(buckets) == 0
+
+
+def test_buckets_forget_the_least_recently_used_keys():
+    buckets = TokenBuckets(rate_per_minute=60, burst=1, max_keys=2)
+    for key in ('a', 'b', 'c'):
+        buckets.take(key, 0.0)
+    assert len(buckets) == 2
+    # 'a' was forgotten and starts over with a full bucket; 'c' is still empty
+    assert buckets.wait_time('a', 0.0) == 0.0
+    assert buckets.wait_time('c', 0.0) == pytest.approx(1.0)
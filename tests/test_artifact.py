@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+from scoring import artifact as artifact_module
+from scoring.artifact import ArtifactError, ModelArtifact, file_digest, load_artifact, save_artifact
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.pkl')
+ARTIFACT_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.esb')
+
+
+@pytest.fixture(scope='module')
+def shipped():
+    return ModelArtifact(ARTIFACT_PATH)
+
+
+def resave(shipped, path, **overrides):
+    """Copy of the shipped artifact at path, with save_artifact arguments overridden"""
+    arguments = dict(
+        arrays=shipped.arrays, meta=shipped.header['ensemble'], model_version=shipped.model_version,
+        feature_names=shipped.header['feature_schema']['feature_names'], preprocessing=shipped.preprocessing,
+    )
+    arguments.update(overrides)
+    save_artifact(str(path), **arguments)
+    return str(path)
+
+
+def test_shipped_artifact_is_versioned_by_the_pickle_digest(shipped):
+    assert shipped.model_version == file_digest(MODEL_PATH)
+    assert load_artifact(ARTIFACT_PATH, expected_version=file_digest(MODEL_PATH)).model_version == shipped.model_version
+
+
+def test_artifact_from_another_model_file_is_rejected(shipped, tmp_path):
+    path = resave(shipped, tmp_path / 'model.esb', model_version='0' * 64)
+    with pytest.raises(ArtifactError, match='different model file'):
+        load_artifact(path, expected_version=file_digest(MODEL_PATH))
+    # Without a pickle to compare against, any version loads
+    assert load_artifact(path).model_version == '0' * 64
+
+
+def test_other_format_versions_are_rejected(shipped, tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_module, 'FORMAT_VERSION', artifact_module.FORMAT_VERSION - 1)
+    path = resave(shipped, tmp_path / 'old.esb')
+    monkeypatch.undo()
+    with pytest.raises(ArtifactError, match='format version'):
+        load_artifact(path)
+
+
+def test_other_feature_schemas_are_rejected(shipped, tmp_path):
+    names = list(shipped.header['feature_schema']['feature_names'])
+    path = resave(shipped, tmp_path / 'reordered.esb', feature_names=names[1:] + names[:1])
+    with pytest.raises(ArtifactError, match='feature schema'):
+        load_artifact(path)
+
+
+def test_non_artifacts_are_rejected(tmp_path):
+    path = tmp_path / 'model.esb'
+    path.write_bytes(b'PK\x03\x04' + bytes(60))
+    with pytest.raises(ArtifactError, match='not a model artifact'):
+        load_artifact(str(path))
+
+
+def test_round_trip_scores_like_the_shipped_artifact(shipped, tmp_path):
+    loaded = load_artifact(resave(shipped, tmp_path / 'copy.esb'))
+    X = np.random.default_rng(0).random((50, loaded.model.n_features_in_)) * 1000
+    assert np.array_equal(loaded.model.predict_proba(X), shipped.model.predict_proba(X))
+    assert loaded.preprocessing == shipped.preprocessing
+    # Arrays are read-only views over the mapping, not copies
+    assert not loaded.arrays['final/coef'].flags.writeable
+
+
+def test_loader_reuses_the_mapping_until_the_file_changes(shipped, tmp_path):
+    path = resave(shipped, tmp_path / 'model.esb')
+    first = load_artifact(path)
+    assert load_artifact(path) is first
+    assert load_artifact(path, expected_version=shipped.model_version) is not first
+
+    resave(shipped, path, model_version='1' * 64)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert load_artifact(path).model_version == '1' * 64
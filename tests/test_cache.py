@@ -0,0 +1,106 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from scoring import cache as cache_module
+from scoring.cache import PredictionCache
+
+
+class Model:
+    """Any object can own cache entries; only its identity matters"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    return clock
+
+
+def key(n):
+    return PredictionCache.key(np.full(4, float(n)))
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache, model = PredictionCache(ttl_seconds=60), Model()
+    cache.put(model, key(1), 0.25)
+    clock.now += 59
+    assert cache.get(model, key(1)) == 0.25
+    clock.now += 2
+    assert cache.get(model, key(1)) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations'], stats['entries']) == (1, 1, 1, 0)
+
+
+def test_rewriting_an_entry_restarts_its_ttl(clock):
+    cache, model = PredictionCache(ttl_seconds=60), Model()
+    cache.put(model, key(1), 0.25)
+    clock.now += 50
+    cache.put(model, key(1), 0.5)
+    clock.now += 50
+    assert cache.get(model, key(1)) == 0.5
+
+
+def test_another_model_invalidates_the_entries():
+    cache, old, new = PredictionCache(), Model(), Model()
+    cache.put(old, key(1), 0.25)
+    assert cache.get(new, key(1)) is None
+    assert cache.stats()['invalidations'] == 1
+    # Entries now belong to the new model
+    cache.put(new, key(1), 0.75)
+    assert cache.get(new, key(1)) == 0.75
+    assert cache.get(old, key(1)) is None
+
+
+def test_cache_does_not_keep_a_replaced_model_alive():
+    cache, model = PredictionCache(), Model()
+    cache.put(model, key(1), 0.25)
+    ref = weakref.ref(model)
+    del model
+    gc.collect()
+    assert ref() is None
+    # A model allocated where the old one lived is still a different model
+    assert cache.get(Model(), key(1)) is None
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache, model = PredictionCache(max_entries=2), Model()
+    cache.put(model, key(1), 0.1)
+    cache.put(model, key(2), 0.2)
+    cache.get(model, key(1))
+    cache.put(model, key(3), 0.3)
+    assert cache.get(model, key(2)) is None
+    assert (cache.get(model, key(1)), cache.get(model, key(3))) == (0.1, 0.3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget_bounds_the_cache():
+    model = Model()
+    entry = PredictionCache._entry_size(key(0), 0.5)
+    cache = PredictionCache(max_entries=100, max_bytes=3 * entry)
+    for n in range(10):
+        cache.put(model, key(n), 0.5)
+    stats = cache.stats()
+    assert stats['entries'] == 3
+    assert stats['bytes'] <= 3 * entry
+    # An entry larger than the whole budget is not stored at all
+    tiny = PredictionCache(max_bytes=entry - 1)
+    tiny.put(model, key(0), 0.5)
+    assert tiny.stats()['entries'] == 0
+
+
+def test_keys_depend_only_on_the_feature_values():
+    row = np.array([1.0, 2.5, 0.0, 40000.0])
+    assert PredictionCache.key(row) == PredictionCache.key(row.astype(np.float32))
+    assert PredictionCache.key(row) == PredictionCache.key(row.copy())
+    assert PredictionCache.key(row) != PredictionCache.key(row + [0, 0, 0, 1])
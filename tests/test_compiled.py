@@ -0,0 +1,94 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from scoring.artifact import load_artifact
+from scoring.compiled import COMPILED_MAX_ROWS, TOLERANCE, SizeRoutedModel, compile_verified
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.pkl')
+ARTIFACT_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.esb')
+
+
+@pytest.fixture(scope='module')
+def native():
+    pytest.importorskip('lightgbm')
+    pytest.importorskip('xgboost')
+    pytest.importorskip('catboost')
+    return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture(scope='module')
+def rows(native):
+    rng = np.random.default_rng(1)
+    X = rng.random((2 * COMPILED_MAX_ROWS + 7, native.n_features_in_)) * 1000
+    # Binary dummies and exact zeros, as the pipeline produces them
+    X[:, -4:] = rng.integers(0, 2, (len(X), 4))
+    X[::5, :3] = 0
+    return X
+
+
+class Recorder:
+    """Stand-in model recording the batch sizes it scored"""
+
+    def __init__(self, model):
+        self.model = model
+        self.feature_names_in_ = model.feature_names_in_
+        self.n_features_in_ = model.n_features_in_
+        self.classes_ = model.classes_
+        self.sizes = []
+
+    def predict_proba(self, X):
+        self.sizes.append(len(X))
+        return self.model.predict_proba(X)
+
+
+def test_compiled_matches_native_model(native, rows):
+    compiled = compile_verified(native)
+    gap = np.abs(compiled.predict_proba(rows)[:, 1] - native.predict_proba(rows)[:, 1]).max()
+    assert gap <= TOLERANCE
+
+
+def test_shipped_artifact_matches_native_model(native, rows):
+    compiled = load_artifact(ARTIFACT_PATH).model
+    gap = np.abs(compiled.predict_proba(rows)[:, 1] - native.predict_proba(rows)[:, 1]).max()
+    assert gap <= TOLERANCE
+
+
+def test_batches_are_routed_by_size(native, rows):
+    compiled, routed_native = Recorder(compile_verified(native)), Recorder(native)
+    model = SizeRoutedModel(compiled, routed_native)
+    # Building the native model's feature schema probes it with single rows
+    routed_native.sizes.clear()
+    small, large = rows[:COMPILED_MAX_ROWS], rows[:COMPILED_MAX_ROWS + 1]
+
+    assert np.allclose(model.predict_proba(small), native.predict_proba(small), rtol=0, atol=TOLERANCE)
+    assert np.allclose(model.predict_proba(large), native.predict_proba(large), rtol=0, atol=TOLERANCE)
+    assert compiled.sizes == [COMPILED_MAX_ROWS]
+    assert routed_native.sizes == [COMPILED_MAX_ROWS + 1]
+
+
+def test_native_model_is_loaded_on_the_first_large_batch(native, rows):
+    loads = []
+
+    def load_native():
+        loads.append(1)
+        return native
+
+    model = SizeRoutedModel(load_artifact(ARTIFACT_PATH).model, load_native=load_native)
+    model.predict_proba(rows[:COMPILED_MAX_ROWS])
+    assert loads == []
+    model.predict_proba(rows)
+    model.predict_proba(rows)
+    assert loads == [1]
+    assert model.native is native
+
+
+def test_native_or_loader_is_required(native):
+    compiled = compile_verified(native)
+    with pytest.raises(ValueError):
+        SizeRoutedModel(compiled)
+    with pytest.raises(ValueError):
+        SizeRoutedModel(compiled, native, load_native=lambda: native)
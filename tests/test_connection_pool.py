@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+# utils opens its log file on import; keep it out of the working tree
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.mkdtemp(prefix='esubu-tests-'), 'app.log'))
+
+from utils import ConnectionPool, PoolTimeout  # noqa: E402
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'users.db'), max_size=2, wait_timeout=0.2)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE users (username TEXT PRIMARY KEY, role TEXT)")
+    yield pool
+    pool.close()
+
+
+def test_connections_are_reused_and_in_wal_mode(pool):
+    for _ in range(5):
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    stats = pool.stats()
+    assert (stats['opened'], stats['checkouts'], stats['open'], stats['idle']) == (1, 6, 1, 1)
+
+
+def test_transactions_commit_on_success_and_roll_back_on_error(pool):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO users VALUES ('jane', 'admin')")
+    with pytest.raises(sqlite3.IntegrityError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO users VALUES ('john', 'officer')")
+            conn.execute("INSERT INTO users VALUES ('jane', 'officer')")
+    with pool.connection() as conn:
+        assert [row['username'] for row in conn.execute("SELECT username FROM users")] == ['jane']
+    # The rolled-back connection was clean, so it went back to the pool
+    assert pool.stats()['discarded'] == 0
+
+
+def test_an_unusable_connection_is_discarded(pool):
+    # The rollback on the way out fails too, so the connection cannot be reset for reuse
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO users VALUES ('jane', 'admin')")
+            conn.close()
+            raise RuntimeError('request failed')
+    stats = pool.stats()
+    assert (stats['discarded'], stats['open']) == (1, 0)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT count(*) FROM users").fetchone()[0] == 0
+
+
+def test_checkout_waits_for_a_free_connection_then_times_out(pool):
+    held = [pool._acquire() for _ in range(pool.max_size)]
+    with pytest.raises(PoolTimeout):
+        with pool.connection():
+            pass
+
+    released = threading.Timer(0.05, pool._release, args=(held.pop(),))
+    released.start()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    released.join()
+    pool._release(held.pop())
+    stats = pool.stats()
+    assert stats['waits'] == 1
+    assert stats['open'] == pool.max_size
+
+
+def test_threads_share_the_pool_without_exceeding_it(pool):
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(20):
+                with pool.connection() as conn:
+                    conn.execute("INSERT INTO users VALUES (?, 'officer')", (f"user{n}-{i}",))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with pool.connection() as conn:
+        assert conn.execute("SELECT count(*) FROM users").fetchone()[0] == 120
+    assert pool.stats()['opened'] <= pool.max_size
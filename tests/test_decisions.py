@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from scoring.decisions import (
+    APPROVED, BASE_LOAN_MULTIPLIER, DECISION_LABELS, LOAN_MULTIPLIER_BANDS, decision_engine_arrays,
+    decision_logic, estimate_loan_amount, estimate_loan_amounts, map_probability_to_score
+)
+
+REPAYMENT_HISTORIES = ['good', 'average', 'poor']
+
+
+def scalar_engine(prob, income, repayment_history, has_collateral, missing_docs):
+    credit_score, decision = decision_logic(prob, income, repayment_history, has_collateral, missing_docs)
+    amount = estimate_loan_amount(income, credit_score) if decision == 'Approved' else None
+    return credit_score, decision, amount
+
+
+def test_decision_engine_arrays_matches_scalar_engine():
+    rng = np.random.default_rng(0)
+    n = 5000
+    probs = rng.random(n)
+    incomes = np.round(rng.random(n) * 500_000, 2)
+    repayment = rng.choice(REPAYMENT_HISTORIES, n).astype(object)
+    collateral = rng.random(n) < 0.5
+    missing = rng.random(n) < 0.1
+
+    scores, codes, amounts = decision_engine_arrays(probs, incomes, repayment, collateral, missing)
+
+    for i in range(n):
+        score, decision, amount = scalar_engine(
+            float(probs[i]), float(incomes[i]), repayment[i], bool(collateral[i]), bool(missing[i])
+        )
+        assert scores[i] == score
+        assert DECISION_LABELS[codes[i]] == decision
+        if amount is None:
+            assert math.isnan(amounts[i])
+        else:
+            assert amounts[i] == amount
+
+
+def test_decision_engine_arrays_broadcasts_scalar_inputs():
+    probs = np.array([0.05, 0.5, 0.85, 0.95])
+    scores, codes, _ = decision_engine_arrays(probs, 50_000.0, 'good', True)
+    expected = [decision_logic(p, 50_000.0, 'good', True) for p in probs]
+    assert scores.tolist() == [score for score, _ in expected]
+    assert DECISION_LABELS[codes].tolist() == [decision for _, decision in expected]
+
+
+@pytest.mark.parametrize('prob', [0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 0.7999999999999999])
+def test_score_bands_truncate_like_int(prob):
+    scores, _, _ = decision_engine_arrays([prob], [10_000.0])
+    assert scores[0] == map_probability_to_score(prob)
+
+
+def test_estimate_loan_amounts_matches_round_on_near_ties():
+    # Exact halves of a thousand round half to even; their float neighbours must not flip
+    halves = np.arange(0, 200, dtype=np.float64) * 1000 + 500
+    raw = np.concatenate([halves, np.nextafter(halves, np.inf), np.nextafter(halves, -np.inf)])
+    for score, multiplier in LOAN_MULTIPLIER_BANDS + ((550, BASE_LOAN_MULTIPLIER),):
+        incomes = raw / multiplier
+        amounts = estimate_loan_amounts(incomes, np.full(len(incomes), score))
+        assert amounts.tolist() == [estimate_loan_amount(float(income), score) for income in incomes]
+
+
+def test_amounts_are_nan_unless_approved():
+    _, codes, amounts = decision_engine_arrays([0.1, 0.95], [40_000.0, 40_000.0], 'good', True)
+    assert codes[1] == APPROVED and amounts[1] == 120_000.0
+    assert codes[0] != APPROVED and math.isnan(amounts[0])
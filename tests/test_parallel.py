@@ -0,0 +1,86 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from scoring.artifact import load_artifact
+from scoring.parallel import ParallelStackedModel, parallelize, resolve_workers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.pkl')
+ARTIFACT_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.esb')
+
+
+@pytest.fixture(scope='module')
+def compiled():
+    return load_artifact(ARTIFACT_PATH).model
+
+
+@pytest.fixture(scope='module')
+def rows(compiled):
+    return np.random.default_rng(2).random((600, compiled.n_features_in_)) * 1000
+
+
+@pytest.fixture
+def parallel():
+    """parallelize() with pools shut down after the test"""
+    models = []
+
+    def wrap(model, **options):
+        options.setdefault('workers', 3)
+        options.setdefault('min_rows', 100)
+        wrapped = parallelize(model, **options)
+        models.append(wrapped)
+        return wrapped
+
+    yield wrap
+    for model in models:
+        model.close()
+
+
+def test_thread_pool_scores_like_the_serial_model(compiled, rows, parallel):
+    model = parallel(compiled)
+    assert model.executor == 'thread'
+    assert np.array_equal(model.predict_proba(rows), compiled.predict_proba(rows))
+    assert np.array_equal(model.predict(rows), compiled.predict(rows))
+
+
+def test_process_pool_scores_like_the_serial_model(compiled, rows, parallel):
+    model = parallel(compiled, workers=2, executor='process')
+    assert np.array_equal(model.predict_proba(rows), compiled.predict_proba(rows))
+
+
+def test_native_stack_scores_like_the_serial_model(rows, parallel):
+    pytest.importorskip('lightgbm')
+    pytest.importorskip('xgboost')
+    pytest.importorskip('catboost')
+    native = joblib.load(MODEL_PATH)
+    model = parallel(native)
+    assert model.executor == 'thread'
+    assert np.allclose(model.predict_proba(rows), native.predict_proba(rows), rtol=0, atol=1e-12)
+
+
+def test_small_batches_stay_serial(compiled, rows, parallel):
+    model = parallel(compiled, min_rows=len(rows) + 1)
+    assert np.array_equal(model.predict_proba(rows), compiled.predict_proba(rows))
+    assert np.array_equal(model.predict_proba(rows[0]), compiled.predict_proba(rows[:1]))
+    # No pool is started for batches that never reach it
+    assert model._pool is None
+
+
+def test_single_worker_and_other_models_are_left_unwrapped(compiled):
+    assert parallelize(compiled, workers=1) is compiled
+    plain = object()
+    assert parallelize(plain, workers=4) is plain
+    assert isinstance(parallelize(compiled, workers=2), ParallelStackedModel)
+
+
+def test_unknown_executor_is_rejected(compiled):
+    with pytest.raises(ValueError, match='executor'):
+        parallelize(compiled, workers=2, executor='fiber')
+
+
+def test_worker_count_defaults_to_the_cpus_available():
+    assert resolve_workers(3) == 3
+    assert resolve_workers(0) == resolve_workers(-1) >= 1
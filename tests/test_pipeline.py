@@ -0,0 +1,71 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring.artifact import load_artifact
+from scoring.pipeline import InferencePipeline, PipelineError, load_preprocessing_spec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARTIFACT_PATH = os.path.join(ROOT, 'credit_scoring_stacked_model.esb')
+PIPELINE_PATH = os.path.join(ROOT, 'preprocessing_pipeline (3).pkl')
+
+
+@pytest.fixture(scope='module')
+def artifact():
+    return load_artifact(ARTIFACT_PATH)
+
+
+def test_shipped_artifact_embeds_the_preprocessing_pipeline(artifact):
+    pytest.importorskip('sklearn')
+    assert artifact.preprocessing == load_preprocessing_spec(PIPELINE_PATH)
+    pipeline = InferencePipeline(artifact.model, artifact.preprocessing)
+    assert set(pipeline.categorical) == {'Employment_Status', 'Region_Type'}
+
+
+def test_misaligned_pipeline_is_rejected(artifact):
+    spec = copy.deepcopy(artifact.preprocessing)
+    # A pipeline fit without a column the model was trained on
+    del spec['numeric']['Monthly_Income_KES']
+    with pytest.raises(PipelineError, match='Monthly_Income_KES'):
+        InferencePipeline(artifact.model, spec)
+
+
+def test_pipeline_without_a_model_category_is_rejected(artifact):
+    spec = copy.deepcopy(artifact.preprocessing)
+    region = spec['categorical']['Region_Type']
+    position = region['categories'].index('Semi-Urban')
+    del region['categories'][position], region['outputs'][position]
+    with pytest.raises(PipelineError, match='Region_Type_Semi-Urban'):
+        InferencePipeline(artifact.model, spec)
+
+
+def test_unreadable_pipeline_raises_pipeline_error(tmp_path):
+    path = tmp_path / 'pipeline.pkl'
+    path.write_bytes(b'not a pickle')
+    with pytest.raises(PipelineError):
+        load_preprocessing_spec(str(path))
+
+
+def test_raw_categories_encode_like_pre_encoded_dummies(artifact):
+    pipeline = InferencePipeline(artifact.model, artifact.preprocessing)
+    base = {'Age': 35, 'Monthly_Income_KES': 40000, 'Active_Loan_Count': 1}
+    raw = pipeline.transform_row(dict(base, Employment_Status='Informal', Region_Type='Semi-Urban'))
+    encoded = pipeline.transform_row(dict(base, Employment_Status_Informal=1, **{'Region_Type_Semi-Urban': 1}))
+    assert np.array_equal(raw, encoded)
+
+
+def test_batch_and_row_transforms_agree(artifact):
+    pipeline = InferencePipeline(artifact.model, artifact.preprocessing)
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'Age': rng.integers(18, 70, 50).astype(float),
+        'Monthly_Income_KES': rng.random(50) * 100000,
+        'Employment_Status': rng.choice(['Informal', 'Student', 'Formal_Employment'], 50),
+        'Region_Type': rng.choice(['Rural', 'Semi-Urban', 'Urban'], 50),
+    })
+    batch = pipeline.transform(frame)
+    rows = np.vstack([pipeline.transform_row(record) for record in frame.to_dict('records')])
+    assert np.array_equal(batch, rows)
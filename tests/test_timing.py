@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from scoring import timing
+from scoring.timing import NULL_TRACE, Histogram, Profiler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(timing.time, 'perf_counter', clock)
+    return clock
+
+
+def run(profiler, clock, durations, name='score'):
+    """One trace through stages taking the given seconds"""
+    trace = profiler.trace(name)
+    for stage, seconds in durations.items():
+        clock.now += seconds
+        trace.mark(stage)
+    trace.finish()
+
+
+def test_histogram_percentiles_are_within_a_bucket():
+    histogram = Histogram()
+    samples = [n / 1000 for n in range(1, 1001)]
+    for seconds in samples:
+        histogram.record(seconds)
+    assert histogram.count == 1000
+    assert histogram.max == 1.0
+    assert histogram.total == pytest.approx(sum(samples))
+    for q in (50, 90, 99):
+        assert histogram.percentile(q) == pytest.approx(q / 100, rel=0.1)
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    trace = profiler.trace('score')
+    assert trace is NULL_TRACE
+    trace.mark('features')
+    trace.finish()
+    assert profiler.summary() == {}
+
+
+def test_stages_are_timed_from_the_previous_mark(clock):
+    profiler = Profiler(enabled=True)
+    for _ in range(3):
+        run(profiler, clock, {'features': 0.002, 'predict_proba': 0.010, 'decision_logic': 0.001})
+    summary = profiler.summary()['score']
+    assert list(summary) == ['features', 'predict_proba', 'decision_logic', 'total']
+    assert summary['predict_proba']['count'] == 3
+    assert summary['predict_proba']['mean_ms'] == pytest.approx(10.0)
+    assert summary['total']['mean_ms'] == pytest.approx(13.0)
+
+    profiler.reset()
+    assert profiler.summary() == {}
+
+
+def test_profiler_can_be_switched_on_at_runtime(clock):
+    profiler = Profiler(enabled=False)
+    run(profiler, clock, {'features': 0.001})
+    profiler.enabled = True
+    run(profiler, clock, {'features': 0.001})
+    assert profiler.summary()['score']['features']['count'] == 1
+
+
+def test_sampled_traces_are_written_as_trace_events(clock, tmp_path):
+    path = tmp_path / 'trace.json'
+    profiler = Profiler(enabled=True, trace_file=str(path), sample_rate=1.0)
+    run(profiler, clock, {'features': 0.002, 'predict_proba': 0.010})
+    run(profiler, clock, {'features': 0.002, 'predict_proba': 0.010})
+
+    # Viewers accept the open-ended array; closing it makes it strict JSON
+    events = json.loads(path.read_text().rstrip().rstrip(',') + ']')
+    assert [event['name'] for event in events] == ['score', 'features', 'predict_proba'] * 2
+    assert {event['ph'] for event in events} == {'X'}
+    assert events[0]['dur'] == pytest.approx(12000)
+    assert events[2]['ts'] == pytest.approx(events[1]['ts'] + 2000)
+
+
+def test_unwritable_trace_file_does_not_fail_the_trace(clock, tmp_path):
+    profiler = Profiler(enabled=True, trace_file=str(tmp_path), sample_rate=1.0)
+    run(profiler, clock, {'features': 0.001})
+    assert profiler.summary()['score']['features']['count'] == 1
@@ -1,17 +1,33 @@
+import atexit
 import bcrypt
+import functools
 import logging
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from config import *
+from scoring.passwords import needs_rehash, resolve_rounds
+from scoring.timing import Histogram
+
+# Configure logging: request threads only enqueue records, a listener thread does the file and console I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler(LOG_FILE), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue()
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configure logging
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
+    # QueueHandler merges args into the message only; the listener's handlers apply the full format
+    format='%(message)s',
+    handlers=[QueueHandler(_log_queue)]
 )
 
 logger = logging.getLogger(__name__)
@@ -19,11 +35,17 @@ logger = logging.getLogger(__name__)
 class SecurityUtils:
     """Security utilities for password hashing and validation"""
     
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def rounds() -> int:
+        """bcrypt cost for new hashes: BCRYPT_ROUNDS, or calibrated once per process"""
+        return resolve_rounds(BCRYPT_ROUNDS, BCRYPT_TARGET_MS)
+    
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using bcrypt"""
         try:
-            salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+            salt = bcrypt.gensalt(rounds=SecurityUtils.rounds())
             hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
             return hashed.decode('utf-8')
         except Exception as e:
@@ -38,44 +60,193 @@ class SecurityUtils:
         except Exception as e:
             logger.error(f"Error verifying password: {e}")
             return False
+    
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """True when a stored hash was made at a different cost than the current one"""
+        return needs_rehash(hashed, SecurityUtils.rounds())
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the wait timeout"""
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections in WAL mode.
+    
+    Connections are opened lazily up to max_size and reused most recently
+    returned first. Each keeps its own prepared-statement cache, so
+    repeated queries skip re-parsing. WAL lets readers proceed while a
+    writer commits, and busy_timeout makes writers wait for the lock
+    instead of failing with "database is locked".
+    """
+    
+    def __init__(self, db_file: str, max_size: int = 4, busy_timeout_ms: int = 5000,
+                 cached_statements: int = 256, wait_timeout: float = 10.0):
+        self.db_file = db_file
+        self.max_size = max_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.wait_timeout = wait_timeout
+        self._idle = []
+        self._size = 0
+        self._available = threading.Condition(threading.Lock())
+        self.opened = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = Histogram()
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,  # a connection is only ever used by the thread that checked it out
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at each WAL checkpoint; safe with WAL
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")  # 8 MB page cache per connection
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        waited = False
+        with self._available:
+            while not self._idle and self._size >= self.max_size:
+                waited = True
+                remaining = self.wait_timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    raise PoolTimeout(f"No database connection free after {self.wait_timeout:.0f}s")
+                self._available.wait(remaining)
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time.record(time.perf_counter() - started)
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+        try:
+            conn = self._open()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self.opened += 1
+        return conn
+    
+    def _release(self, conn: sqlite3.Connection, broken: bool = False):
+        if broken:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        with self._available:
+            if broken:
+                self._size -= 1
+                self.discarded += 1
+            else:
+                self._idle.append(conn)
+            self._available.notify()
+    
+    @contextmanager
+    def connection(self):
+        """Check out a connection for one transaction: committed on success, rolled back on error"""
+        conn = self._acquire()
+        broken = False
+        try:
+            with conn:
+                yield conn
+        except Exception:
+            # A connection the rollback could not reset (or a closed one) is not pooled again
+            try:
+                broken = conn.in_transaction
+            except sqlite3.Error:
+                broken = True
+            raise
+        finally:
+            self._release(conn, broken)
+    
+    def close(self):
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn in idle:
+            conn.close()
+    
+    def stats(self) -> dict:
+        with self._available:
+            return {
+                'max_size': self.max_size,
+                'open': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'opened': self.opened,
+                'discarded': self.discarded,
+                'checkouts': self.checkouts,
+                'reuse_rate': 1.0 - self.opened / self.checkouts if self.checkouts else 0.0,
+                'waits': self.waits,
+                'wait_time': self.wait_time.summary(),
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Process-wide connection pool for DB_FILE, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_FILE, DB_POOL_SIZE, DB_BUSY_TIMEOUT_MS)
+    return _pool
 
 class DatabaseUtils:
     """Database utilities with enhanced error handling and logging"""
     
     @staticmethod
     def get_connection():
-        """Get database connection with error handling"""
-        try:
-            conn = sqlite3.connect(DB_FILE)
-            conn.row_factory = sqlite3.Row  # Enable column access by name
-            return conn
-        except Exception as e:
-            logger.error(f"Database connection error: {e}")
-            raise
+        """Pooled connection context manager (see ConnectionPool.connection)"""
+        return get_pool().connection()
     
     @staticmethod
     def execute_query(query: str, params: tuple = (), fetch_one: bool = False, fetch_all: bool = False):
         """Execute database query with proper error handling"""
         try:
             with DatabaseUtils.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
+                cursor = conn.execute(query, params)
                 
                 if fetch_one:
                     return cursor.fetchone()
                 elif fetch_all:
                     return cursor.fetchall()
                 
-                conn.commit()
                 return cursor.rowcount
         except Exception as e:
             logger.error(f"Database query error: {e}")
             raise
+    
+    @staticmethod
+    def executemany(query: str, params_seq) -> int:
+        """Run one statement for every parameter tuple in a single transaction; returns rows affected"""
+        try:
+            with DatabaseUtils.get_connection() as conn:
+                return conn.executemany(query, params_seq).rowcount
+        except Exception as e:
+            logger.error(f"Database batch error: {e}")
+            raise
+    
+    @staticmethod
+    def pool_stats() -> dict:
+        return get_pool().stats()
 
 def log_user_action(username: str, action: str, details: str = ""):
-    """Log user actions for audit trail"""
+    """Log user actions for audit trail (queued; written by the logging listener thread)"""
     timestamp = datetime.now().isoformat()
-    logger.info(f"USER_ACTION - {timestamp} - {username} - {action} - {details}")
+    logger.info("USER_ACTION - %s - %s - %s - %s", timestamp, username, action, details)
 
 def validate_input(data: dict, required_fields: list) -> tuple:
     """Validate input data and return (is_valid, missing_fields)"""